@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import Client
+
+from django_joblog import get_config
+from django_joblog.models import JobLogModel, JobLogStates, db_alias
+
+from .utils import benchmark, measure
+from .data import fill_table
+
+
+@benchmark("admin")
+def bench_admin(ctx):
+    user = User.objects.filter(username="bench").first()
+    if not user:
+        user = User.objects.create_superuser("bench", "bench@example.com", "bench")
+    client = Client()
+    client.force_login(user)
+
+    def _get(url):
+        response = client.get(url)
+        assert response.status_code == 200, "%s returned %s" % (url, response.status_code)
+
+    for size in ctx.sizes:
+        fill_table(size)
+
+        timings = measure(lambda: _get("/admin/django_joblog/joblogmodel/"), ctx.repeat)
+        ctx.add_result("admin.changelist", timings, size=size)
+
+        timings = measure(lambda: _get("/admin/django_joblog/joblogmodel/?q=error"), ctx.repeat)
+        ctx.add_result("admin.changelist.search", timings, size=size)
+
+        for hours in (24, 24 * 365):
+            timings = measure(lambda: _get("/admin/django_joblog/joblogmodel/timeline/?hours=%s" % hours), ctx.repeat)
+            ctx.add_result("admin.timeline", timings, size=size, hours=hours)
+
+    num_lines = 10000 if ctx.quick else 500000
+    job = JobLogModel.objects.using(db_alias()).create(
+        name="bench-big-log", state=JobLogStates.finished.name,
+        log_text="\n".join("  line <%s>" % i for i in range(num_lines)),
+    )
+
+    timings = measure(lambda: _get("/admin/django_joblog/joblogmodel/%s/change/" % job.pk), ctx.repeat)
+    ctx.add_result("admin.change", timings, lines=num_lines)
+
+    url = "/admin/django_joblog/joblogmodel/%s/page/log/?page=3" % job.pk
+    caches[get_config().render_cache].clear()
+    timings = measure(lambda: _get(url), 1)
+    ctx.add_result("admin.log_page.uncached", timings, lines=num_lines)
+    timings = measure(lambda: _get(url), ctx.repeat)
+    ctx.add_result("admin.log_page", timings, lines=num_lines)
@@ -0,0 +1,43 @@
+import os
+import sys
+import logging
+
+from django_joblog import DummyJobLogger
+
+from .utils import benchmark, measure
+
+
+@benchmark("dummy")
+def bench_dummy(ctx):
+    num_lines = 1000 if ctx.quick else 10000
+    logger = logging.getLogger("django_joblog")
+    results = []
+
+    # line-buffered file on devnull, so each print is a write syscall as on a pipe
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", buffering=1)
+    try:
+        for output in ("print", "buffered", "silent", "logging"):
+            log = DummyJobLogger("bench", output=output)
+            timings = measure(lambda: log.log("a benchmark log line"), ctx.repeat, number=num_lines)
+            log.flush()
+            results.append((timings, output))
+
+        # logging with the INFO level enabled
+        level = logger.level
+        handler = logging.NullHandler()
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        try:
+            log = DummyJobLogger("bench", output="logging")
+            timings = measure(lambda: log.log("a benchmark log line"), ctx.repeat, number=num_lines)
+            results.append((timings, "logging-enabled"))
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(level)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    for timings, output in results:
+        ctx.add_result("dummy.log", timings, output=output, lines=num_lines)
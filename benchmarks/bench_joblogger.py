@@ -0,0 +1,69 @@
+import time
+
+from django.test import override_settings
+
+from django_joblog import JobLogger
+from django_joblog.models import JobLogModel, db_alias
+
+from .utils import benchmark, measure
+from .data import clear_tables
+
+
+def _config(**kwargs):
+    config = {"db_alias": "joblog"}
+    config.update(kwargs)
+    return override_settings(JOBLOG_CONFIG=config)
+
+
+def _start_finish(repeat, name):
+    enter_timings, exit_timings = [], []
+    for i in range(repeat):
+        job = JobLogger(name)
+        start = time.perf_counter()
+        job.__enter__()
+        enter_timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        job.__exit__(None, None, None)
+        exit_timings.append(time.perf_counter() - start)
+    return enter_timings, exit_timings
+
+
+@benchmark("joblogger")
+def bench_joblogger(ctx):
+    clear_tables()
+    num_lines = 100 if ctx.quick else 1000
+
+    for live_updates in (False, True):
+        with _config(live_updates=live_updates):
+            enter_timings, exit_timings = _start_finish(ctx.repeat, "bench-start-finish")
+            ctx.add_result("job.start", enter_timings, live_updates=live_updates)
+            ctx.add_result("job.finish", exit_timings, live_updates=live_updates)
+
+            timings = []
+            for i in range(max(1, ctx.repeat // 10)):
+                with JobLogger("bench-log") as job:
+                    timings += measure(lambda: job.log("a benchmark log line"), num_lines)
+            ctx.add_result("job.log", timings, live_updates=live_updates, lines=num_lines)
+
+    with _config(ping=True, ping_interval=1):
+        enter_timings, exit_timings = _start_finish(max(1, ctx.repeat // 10), "bench-ping-start-finish")
+        ctx.add_result("job.start", enter_timings, ping=True)
+        ctx.add_result("job.finish", exit_timings, ping=True)
+
+    with _config():
+        for num_lines in (0, 1000, 10000):
+            with JobLogger("bench-ping") as job:
+                for i in range(num_lines):
+                    job.log("a benchmark log line")
+                timings = measure(lambda: job._model.update_model(allow_fail=True), ctx.repeat)
+            ctx.add_result("job.ping", timings, lines=num_lines)
+
+    # progress reports compared to logging the progress as lines
+    num_reports = 100 if ctx.quick else 1000
+    with _config(live_updates=True):
+        with JobLogger("bench-progress") as job:
+            timings = measure(lambda: job.progress(1, 1000), num_reports)
+        ctx.add_result("job.progress", timings, reports=num_reports)
+        with JobLogger("bench-progress-log") as job:
+            timings = measure(lambda: job.log("processed 1/1000"), num_reports)
+        ctx.add_result("job.progress_as_log", timings, reports=num_reports)
@@ -0,0 +1,33 @@
+from django.test import override_settings
+
+from django_joblog import JobLogger, DummyJobLogger
+from django_joblog.models import JobLogModel, JobLogStates, db_alias
+
+from .utils import benchmark, measure
+from .data import fill_table, quiet
+
+
+@benchmark("queries")
+def bench_queries(ctx):
+    with override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "ping_interval": 10}):
+        for size in ctx.sizes:
+            fill_table(size)
+            name = "synthetic-job-0"
+
+            timings = measure(lambda: JobLogModel.is_job_running(name, ping=True), ctx.repeat)
+            ctx.add_result("is_job_running", timings, size=size)
+
+            def _start_finish():
+                with JobLogger(name, parallel=True):
+                    pass
+            timings = measure(_start_finish, ctx.repeat)
+            ctx.add_result("job.start_finish", timings, size=size)
+
+            # leave a few vanished-looking jobs for cleanup to find
+            def _setup_cleanup():
+                JobLogModel.objects.using(db_alias()).filter(
+                    pk__in=list(JobLogModel.objects.using(db_alias()).values_list("pk", flat=True)[:10])
+                ).update(state=JobLogStates.running.name)
+
+            timings = measure(lambda: quiet(JobLogModel.cleanup, DummyJobLogger()), ctx.repeat, setup=_setup_cleanup)
+            ctx.add_result("cleanup", timings, size=size)
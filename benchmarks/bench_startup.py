@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import subprocess
+
+from .utils import benchmark
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(args, repeat):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        subprocess.check_call(
+            [sys.executable] + args, cwd=ROOT, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _import_time(module):
+    """
+    Returns the cumulative import time of `module` in seconds, as reported by `python -X importtime`
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % module],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True,
+    ).stderr.decode("utf-8")
+    for line in output.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000000.
+
+
+@benchmark("startup")
+def bench_startup(ctx):
+    repeat = max(1, ctx.repeat // 5)
+
+    ctx.add_result("startup.python", _run(["-c", "pass"], repeat))
+    ctx.add_result("startup.import_package", _run(["-c", "import django_joblog"], repeat))
+    ctx.add_result(
+        "startup.import_joblogger",
+        _run(["-c", "import django_joblog; django_joblog.JobLogger"], repeat)
+    )
+    ctx.add_result("startup.management_command", _run(["manage.py", "joblog_list", "-s", "none"], repeat))
+
+    ctx.add_result("startup.importtime", [_import_time("django_joblog") for i in range(repeat)])
@@ -0,0 +1,41 @@
+"""
+Compares the medians of two benchmark result files
+
+    python -m benchmarks.compare old.json new.json
+"""
+import sys
+import json
+
+
+def _key(result):
+    return result["name"], tuple(sorted((k, str(v)) for k, v in result["params"].items()))
+
+
+def main(old_filename, new_filename):
+    with open(old_filename) as fp:
+        old = {_key(r): r for r in json.load(fp)["results"]}
+    with open(new_filename) as fp:
+        new = json.load(fp)["results"]
+
+    print("%-30s %-30s %12s %12s %8s" % ("name", "params", "old", "new", "ratio"))
+    for result in new:
+        key = _key(result)
+        params = " ".join("%s=%s" % p for p in key[1])
+        old_median = old[key]["median"] if key in old else None
+        new_median = result["median"]
+        ratio = "-"
+        if old_median and new_median is not None:
+            ratio = "%.2f" % (new_median / old_median)
+        print("%-30s %-30s %12s %12s %8s" % (
+            key[0], params,
+            "-" if old_median is None else "%.6f" % old_median,
+            "-" if new_median is None else "%.6f" % new_median,
+            ratio,
+        ))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        exit(1)
+    main(sys.argv[1], sys.argv[2])
@@ -0,0 +1,29 @@
+import io
+from contextlib import redirect_stdout
+
+from django.core.management import call_command
+
+from django_joblog.models import JobLogModel, JobLogStatsModel, db_alias
+
+
+def quiet(func, *args, **kwargs):
+    """Calls func with stdout discarded"""
+    with redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def clear_tables():
+    JobLogModel.objects.using(db_alias()).all().delete()
+    JobLogStatsModel.objects.using(db_alias()).all().delete()
+
+
+def fill_table(size, num_names=50):
+    """
+    Replaces the job log table with a synthetic history of `size` job runs
+    """
+    clear_tables()
+    if size:
+        quiet(
+            call_command, "joblog_import",
+            generate=size, names=num_names, seed=23, batch_size=5000,
+        )
@@ -0,0 +1,101 @@
+"""
+Runs the django_joblog benchmarks and writes the results as JSON.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --only joblogger queries
+
+Compare two result files with
+
+    python -m benchmarks.compare old.json new.json
+"""
+import os
+import sys
+import json
+import argparse
+import datetime
+import platform
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="django_joblog benchmarks")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="JSON file to write the results to")
+    parser.add_argument("--only", nargs="+", type=str, default=[],
+                        help="Names of benchmarks to run")
+    parser.add_argument("--sizes", type=str, default="1000,10000,100000",
+                        help="Comma-separated table sizes for the query and admin benchmarks")
+    parser.add_argument("-r", "--repeat", type=int, default=50,
+                        help="Number of measurements per benchmark")
+    parser.add_argument("-q", "--quick", action="store_true",
+                        help="Small sizes and few repetitions, for checking that the benchmarks work")
+    return parser.parse_args()
+
+
+def setup_django():
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+
+    database = settings.DATABASES["default"]
+    if database["ENGINE"].endswith("sqlite3") and os.path.exists(database["NAME"]):
+        os.remove(database["NAME"])
+    call_command("migrate", verbosity=0)
+
+
+def main():
+    args = parse_args()
+    setup_django()
+
+    import django
+    from django.db import connection
+
+    from . import bench_joblogger, bench_queries, bench_admin, bench_startup, bench_dummy
+    from .utils import BENCHMARKS, Context
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    repeat = args.repeat
+    if args.quick:
+        sizes = [100, 1000]
+        repeat = 5
+
+    context = Context(sizes=sizes, repeat=repeat, quick=args.quick)
+    for name, func in BENCHMARKS:
+        if not args.only or name in args.only:
+            print("--- %s ---" % name)
+            func(context)
+
+    report = {
+        "date": datetime.datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "git_revision": _git_revision(),
+        "sizes": sizes,
+        "repeat": repeat,
+        "results": context.results,
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+def _git_revision():
+    import subprocess
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL,
+        ).decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    main()
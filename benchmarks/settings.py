@@ -0,0 +1,43 @@
+"""
+Django settings for running the benchmarks.
+
+Uses the repository's project settings with a fresh SQLite database by default.
+To benchmark against PostgreSQL, set JOBLOG_BENCH_DB=postgresql and the usual
+PGDATABASE, PGUSER, PGPASSWORD, PGHOST and PGPORT environment variables.
+"""
+import os
+import tempfile
+
+from django_joblog_project.settings import *
+
+
+ALLOWED_HOSTS = ["*"]
+
+DEBUG = False
+
+JOBLOG_CONFIG = {
+    "db_alias": "joblog",
+}
+
+if os.environ.get("JOBLOG_BENCH_DB") == "postgresql":
+    _database = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("PGDATABASE", "joblog_bench"),
+        "USER": os.environ.get("PGUSER", ""),
+        "PASSWORD": os.environ.get("PGPASSWORD", ""),
+        "HOST": os.environ.get("PGHOST", ""),
+        "PORT": os.environ.get("PGPORT", ""),
+    }
+else:
+    _database = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ.get(
+            "JOBLOG_BENCH_SQLITE",
+            os.path.join(tempfile.gettempdir(), "django_joblog_bench.sqlite3")
+        ),
+    }
+
+DATABASES = {
+    "default": _database,
+    "joblog": dict(_database),
+}
@@ -0,0 +1,86 @@
+import time
+import math
+
+
+# list of (name, function), filled by the @benchmark decorator
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """
+    Registers a benchmark function.
+
+    The function is called with a `Context` and reports it's results via `Context.add_result`.
+    """
+    def _decorator(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return _decorator
+
+
+class Context(object):
+
+    def __init__(self, sizes, repeat, quick=False):
+        self.sizes = sizes
+        self.repeat = repeat
+        self.quick = quick
+        self.results = []
+
+    def add_result(self, name, timings, unit="s", **params):
+        """
+        Stores the summary of a list of timings
+        :param name: str, name of the measurement
+        :param timings: list of float, seconds per operation
+        :param unit: str
+        :param params: additional parameters of the measurement, e.g. table size
+        """
+        result = {
+            "name": name,
+            "params": params,
+            "unit": unit,
+        }
+        result.update(summarize(timings))
+        self.results.append(result)
+
+        print("%-50s %-30s mean %10s  median %10s  p95 %10s  (n=%s)" % (
+            name,
+            " ".join("%s=%s" % i for i in sorted(params.items())),
+            _format_seconds(result["mean"]), _format_seconds(result["median"]), _format_seconds(result["p95"]),
+            result["n"],
+        ))
+        return result
+
+
+def _format_seconds(value):
+    return "-" if value is None else "%.6f" % value
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    n = len(timings)
+    if not n:
+        return {"n": 0, "mean": None, "median": None, "min": None, "max": None, "p95": None}
+    return {
+        "n": n,
+        "mean": sum(timings) / n,
+        "median": timings[n // 2],
+        "min": timings[0],
+        "max": timings[-1],
+        "p95": timings[min(n - 1, int(math.ceil(n * .95)) - 1)],
+    }
+
+
+def measure(func, repeat, number=1, setup=None):
+    """
+    Calls `func` `number` times per round for `repeat` rounds
+    :return: list of float, seconds per call for each round
+    """
+    timings = []
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for j in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
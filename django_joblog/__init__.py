@@ -1,5 +1,39 @@
-from .impl.Config import Config
-from .impl.JobLogger import JobLogger
-from .impl.DummyJobLogger import DummyJobLogger
-from .impl.JobLoggerContext import JobLoggerContext
-from .impl.exceptions import JobIsAlreadyRunningError
+import sys
+import importlib
+
+
+# public names and the modules they live in, imported on first access
+_LAZY_ATTRIBUTES = {
+    "Config": ".impl.Config",
+    "get_config": ".impl.Config",
+    "JobLogger": ".impl.JobLogger",
+    "DummyJobLogger": ".impl.DummyJobLogger",
+    "JobLoggerContext": ".impl.JobLoggerContext",
+    "JobIsAlreadyRunningError": ".impl.exceptions",
+    "JobCoalescedError": ".impl.exceptions",
+    "JobLogHandler": ".impl.JobLogHandler",
+    "JobLoggerProxy": ".impl.JobLoggerProcessBridge",
+    "get_current_joblogger": ".impl.current",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # no module-level __getattr__ (PEP 562), import everything now
+    for _name in __all__:
+        __getattr__(_name)
@@ -1,11 +1,32 @@
 # encoding=utf-8
 from __future__ import unicode_literals
 
+import datetime
+
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.db.models.functions import Length, Substr
+from django.http import JsonResponse, Http404, HttpResponseRedirect, HttpResponseBadRequest
+from django.template.response import TemplateResponse
+from django.urls import reverse, path
+from django.utils import timezone
+from django.utils.http import urlencode
 from django.utils.html import mark_safe, escape
 from django.utils.translation import ugettext_lazy as _
 
-from .models import JobLogModel, JobLogStates
+from .models import JobLogModel, JobLogArchiveModel, JobLogStates, JobLogStatsModel, JobLogLockModel
+from .impl.rendering import render_lines, get_page
+from .impl.progress import format_progress, get_percent
+from .impl.serialization import parse_export_datetime
+from .impl.timeline import get_timeline
+
+
+# Number of characters and lines of log and error texts shown in the changelist
+LIST_TEXT_LENGTH = 2000
+LIST_TEXT_LINES = 10
+
+# Selectable time windows of the timeline in hours, the first is the default
+TIMELINE_HOURS = (24, 1, 6, 3 * 24, 7 * 24, 30 * 24)
 
 
 class JobLogModelAdmin(admin.ModelAdmin):
@@ -13,10 +34,128 @@ class JobLogModelAdmin(admin.ModelAdmin):
     list_display = (
         "id_decorator", "name", "count",
         "date_started_decorator", "date_ended_decorator", "duration",
-        "state_decorator", "log_decorator", "error_log_decorator"
+        "state_decorator", "progress_decorator", "is_slow", "log_decorator", "error_log_decorator"
     )
     search_fields = ("name", "log_text", "error_text")
-    list_filter = ("name",)
+    list_filter = ("name", "is_slow")
+    readonly_fields = (
+        "parent_decorator", "run_tree_decorator", "progress_decorator", "log_viewer", "error_log_viewer",
+    )
+    change_list_template = "admin/django_joblog/change_list.html"
+
+    class Media:
+        js = ("django_joblog/log_viewer.js", )
+
+    def get_queryset(self, request):
+        # the texts can be huge, only their beginning is loaded, the viewer fetches the rest in pages
+        return super(JobLogModelAdmin, self).get_queryset(request).defer("log_text", "error_text").annotate(
+            log_head=Substr("log_text", 1, LIST_TEXT_LENGTH),
+            log_length=Length("log_text"),
+            error_head=Substr("error_text", 1, LIST_TEXT_LENGTH),
+            error_length=Length("error_text"),
+        )
+
+    def get_urls(self):
+        return [
+            path(
+                "timeline/",
+                self.admin_site.admin_view(self.timeline_view),
+                name="%s_%s_timeline" % (self.model._meta.app_label, self.model._meta.model_name),
+            ),
+            path(
+                "overdue/",
+                self.admin_site.admin_view(self.overdue_view),
+                name="%s_%s_overdue" % (self.model._meta.app_label, self.model._meta.model_name),
+            ),
+            path(
+                "<int:pk>/page/<str:field>/",
+                self.admin_site.admin_view(self.page_view),
+                name="%s_%s_page" % (self.model._meta.app_label, self.model._meta.model_name),
+            ),
+        ] + super(JobLogModelAdmin, self).get_urls()
+
+    def change_view(self, request, object_id, form_url="", extra_context=None):
+        # links to jobs that have been archived in the meantime lead to the archive
+        if self.model is JobLogModel and object_id and object_id.isdigit() \
+                and not JobLogModel.objects.filter(pk=object_id).exists() \
+                and JobLogArchiveModel.objects.filter(pk=object_id).exists():
+            return HttpResponseRedirect(
+                reverse("admin:django_joblog_joblogarchivemodel_change", args=(object_id, ))
+            )
+        return super(JobLogModelAdmin, self).change_view(
+            request, object_id, form_url=form_url, extra_context=extra_context
+        )
+
+    def page_view(self, request, pk, field):
+        """
+        One page of rendered log or error lines as JSON, for the log viewer
+        """
+        if not self.has_view_or_change_permission(request):
+            raise Http404()
+        field = {"log": "log_text", "error": "error_text"}.get(field)
+        try:
+            page = max(0, int(request.GET.get("page", 0)))
+        except ValueError:
+            page = 0
+        data = get_page(pk, field, page, model=self.model) if field else None
+        if data is None:
+            raise Http404()
+        return JsonResponse(data)
+
+    def timeline_view(self, request):
+        """
+        The runs of a time window as bars on a timeline.
+
+        GET parameters:
+            hours: float, length of the window, defaults to TIMELINE_HOURS[0]
+            end: ISO datetime, end of the window, defaults to now
+            name: job name, can be repeated
+        """
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        try:
+            hours = min(24. * 366, max(1. / 60., float(request.GET.get("hours") or TIMELINE_HOURS[0])))
+            end = parse_export_datetime(request.GET.get("end")) or timezone.now()
+        except ValueError:
+            return HttpResponseBadRequest("Invalid hours or end parameter")
+        names = [name for name in request.GET.getlist("name") if name]
+
+        window = datetime.timedelta(hours=hours)
+        end = end.replace(microsecond=0)
+
+        def _url(end):
+            return "?" + urlencode(
+                [("hours", "%g" % hours), ("end", timezone.localtime(end).isoformat())]
+                + [("name", name) for name in names]
+            )
+
+        context = dict(
+            self.admin_site.each_context(request),
+            opts=self.model._meta,
+            title=_("Timeline"),
+            timeline=get_timeline(end - window, end, names=names, model=self.model),
+            hours="%g" % hours,
+            hour_choices=["%g" % h for h in sorted(TIMELINE_HOURS)],
+            end=timezone.localtime(end),
+            names=names,
+            previous_url=_url(end - window),
+            next_url=_url(end + window),
+        )
+        return TemplateResponse(request, "admin/django_joblog/timeline.html", context)
+
+    def overdue_view(self, request):
+        """
+        The jobs that missed their schedule or run longer than usual, see `JobLogModel.get_overdue`
+        """
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        context = dict(
+            self.admin_site.each_context(request),
+            opts=self.model._meta,
+            title=_("Overdue jobs"),
+            overdue=JobLogModel.get_overdue(),
+        )
+        return TemplateResponse(request, "admin/django_joblog/overdue.html", context)
 
     def id_decorator(self, model):
         return "#%s" % model.id
@@ -41,31 +180,106 @@ class JobLogModelAdmin(admin.ModelAdmin):
         return mark_safe('<span style="white-space: nowrap">%s</span>' % state)
     state_decorator.short_description = _("state")
 
+    def progress_decorator(self, model):
+        if model.progress_done is None:
+            return "-"
+        percent = get_percent(model.progress_done, model.progress_total)
+        text = format_progress(model.progress_done, model.progress_total, model.progress_rate, model.progress_eta)
+        if percent is None:
+            return text
+        return mark_safe('<progress value="%.1f" max="100" title="%s"></progress> %.0f%%' % (
+            percent, escape(text), percent
+        ))
+    progress_decorator.short_description = _("progress")
+
+    def parent_decorator(self, model):
+        if model.parent_id is None:
+            return "-"
+        return mark_safe('<a href="%s">#%s</a>' % (_change_url(model.parent_id), model.parent_id))
+    parent_decorator.short_description = _("parent")
+
+    def run_tree_decorator(self, model):
+        tree = model.get_run_tree()
+        if len(tree) < 2:
+            return "-"
+        rows = []
+        for depth, node in tree:
+            rows.append(
+                '<tr><td style="padding-left: %sem"><a href="%s">#%s</a> %s</td><td>%s</td><td>%s</td></tr>' % (
+                    depth * 1.5, _change_url(node.pk), node.pk, escape(node.name),
+                    node.duration if node.duration is not None else "-",
+                    self.state_decorator(node),
+                )
+            )
+        return mark_safe("<table>%s</table>" % "".join(rows))
+    run_tree_decorator.short_description = _("run tree")
+
     def log_decorator(self, model):
-        return _linebreaks(model.log_text, False)
+        return render_lines(_head(model.log_head, model.log_length), False)
     log_decorator.short_description = _("log")
 
     def error_log_decorator(self, model):
-        return _linebreaks(model.error_text)
+        return render_lines(_head(model.error_head, model.error_length))
     error_log_decorator.short_description = _("error log")
 
+    def log_viewer(self, model):
+        return _viewer(model, "log")
+    log_viewer.short_description = _("log")
+
+    def error_log_viewer(self, model):
+        return _viewer(model, "error")
+    error_log_viewer.short_description = _("error log")
+
+
+class JobLogArchiveModelAdmin(JobLogModelAdmin):
+
+    def has_add_permission(self, request):
+        return False
+
+
+class JobLogStatsModelAdmin(admin.ModelAdmin):
+    list_display = (
+        "name", "num_samples", "duration_mean", "duration_p50", "duration_p95", "duration_p99",
+        "last_duration", "date_updated",
+    )
+    search_fields = ("name",)
+
+    def has_add_permission(self, request):
+        return False
+
+
+class JobLogLockModelAdmin(admin.ModelAdmin):
+    list_display = ("name", "slot", "owner", "job", "date_acquired", "date_expires")
+    search_fields = ("name", "owner")
+
+    def has_add_permission(self, request):
+        return False
+
 
 admin.site.register(JobLogModel, JobLogModelAdmin)
+admin.site.register(JobLogArchiveModel, JobLogArchiveModelAdmin)
+admin.site.register(JobLogStatsModel, JobLogStatsModelAdmin)
+admin.site.register(JobLogLockModel, JobLogLockModelAdmin)
 
 
-def _linebreaks(text, wrap_lines=True):
+def _change_url(pk):
+    # archived jobs are redirected by JobLogModelAdmin.change_view
+    return reverse("admin:django_joblog_joblogmodel_change", args=(pk, ))
+
+
+def _head(text, length):
+    """
+    Returns the first LIST_TEXT_LINES lines of text, which is the beginning of a text of `length` characters
+    """
     if not text:
-        return "-"
-    lines = []
-    for line in text.split("\n"):
-        # make html-compatible
-        line = escape(line)
-        # keep leading whitespace
-        for i, c in enumerate(line):
-            if not c.isspace() and i:
-                line = line[:i].replace(" ", "&nbsp;").replace("\t", "&nbsp;&nbsp;") + line[i:]
-                break
-        if not wrap_lines:
-            line = '<span style="white-space: nowrap">%s</span>' % line
-        lines.append(line)
-    return mark_safe("<br>".join(lines))
+        return text
+    lines = text.split("\n", LIST_TEXT_LINES)
+    if len(lines) > LIST_TEXT_LINES or length > len(text):
+        lines = lines[:LIST_TEXT_LINES] + ["..."]
+    return "\n".join(lines)
+
+
+def _viewer(model, field):
+    return mark_safe('<div class="joblog-viewer" data-url="%s"></div>' % (
+        reverse("admin:%s_%s_page" % (model._meta.app_label, model._meta.model_name), args=(model.pk, field))
+    ))
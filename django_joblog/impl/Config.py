@@ -1,10 +1,52 @@
+import warnings
+
 from django.conf import settings
+from django.core.signals import setting_changed
 
+try:
+    from types import MappingProxyType
+except ImportError:  # python 2
+    MappingProxyType = dict
+
+
+# the process-wide Config instance returned by get_config()
+_config = None
+
+# appended to the db alias for the connection of `"isolated_writes": True`
+ISOLATED_ALIAS_SUFFIX = "_isolated"
+
+
+def get_config():
+    """
+    Returns the cached Config of this process.
+    The cache is invalidated when JOBLOG_CONFIG or DATABASES are changed via django's `setting_changed` signal.
+    :return: Config
+    """
+    global _config
+    config = _config
+    if config is None:
+        config = _config = Config()
+    return config
+
+
+def _on_setting_changed(setting, **kwargs):
+    global _config
+    if setting in ("JOBLOG_CONFIG", "DATABASES"):
+        _config = None
 
-class Config:
 
+setting_changed.connect(_on_setting_changed)
+
+
+class Config:
+    """
+    Read-only snapshot of the JOBLOG_CONFIG setting.
+    Use `get_config()` to get the cached instance.
+    """
     def __init__(self):
-        self._config = getattr(settings, "JOBLOG_CONFIG", {})
+        self._config = MappingProxyType(dict(getattr(settings, "JOBLOG_CONFIG", {})))
+        self._resolved_db_alias = None
+        self._resolved_read_db_alias = None
 
     @property
     def print_to_console(self):
@@ -15,6 +57,58 @@ class Config:
         from django.db import DEFAULT_DB_ALIAS
         return self._config.get("db_alias", DEFAULT_DB_ALIAS)
 
+    @property
+    def resolved_db_alias(self):
+        """
+        The `db_alias`, or django.db.DEFAULT_DB_ALIAS if it's not in settings.DATABASES.
+        With `isolated_writes`, the alias of the autocommit copy of that database,
+        which must be in settings.DATABASES as well.
+        Warns once per snapshot about an unknown alias.
+        """
+        if self._resolved_db_alias is None:
+            from django.db import DEFAULT_DB_ALIAS
+            alias = self.db_alias
+            if alias not in settings.DATABASES:
+                warnings.warn("Configured job-logger db alias '%s' is not in settings.DATABASES" % alias)
+                alias = DEFAULT_DB_ALIAS
+            if self.isolated_writes:
+                isolated_alias = self.isolated_writes
+                if not isinstance(isolated_alias, str):
+                    isolated_alias = alias + ISOLATED_ALIAS_SUFFIX
+                if isolated_alias in settings.DATABASES:
+                    alias = isolated_alias
+                else:
+                    warnings.warn(
+                        "Configured job-logger isolated db alias '%s' is not in settings.DATABASES, "
+                        "job log writes are not isolated" % isolated_alias
+                    )
+            self._resolved_db_alias = alias
+        return self._resolved_db_alias
+
+    @property
+    def isolated_writes(self):
+        return self._config.get("isolated_writes", False)
+
+    @property
+    def read_db_alias(self):
+        return self._config.get("read_db_alias")
+
+    @property
+    def resolved_read_db_alias(self):
+        """
+        The `read_db_alias`, or the `resolved_db_alias` if it's not set or not in settings.DATABASES.
+        Warns once per snapshot about an unknown alias.
+        """
+        if self._resolved_read_db_alias is None:
+            alias = self.read_db_alias
+            if alias is None:
+                alias = self.resolved_db_alias
+            elif alias not in settings.DATABASES:
+                warnings.warn("Configured job-logger read db alias '%s' is not in settings.DATABASES" % alias)
+                alias = self.resolved_db_alias
+            self._resolved_read_db_alias = alias
+        return self._resolved_read_db_alias
+
     @property
     def live_updates(self):
         return self._config.get("live_updates", False)
@@ -27,3 +121,97 @@ class Config:
     def ping_interval(self):
         return self._config.get("ping_interval", 10)
 
+    @property
+    def locking(self):
+        return self._config.get("locking", "running")
+
+    @property
+    def lease_duration(self):
+        return self._config.get("lease_duration", 3 * self.ping_interval)
+
+    @property
+    def wait_poll_interval(self):
+        return self._config.get("wait_poll_interval", 2.)
+
+    @property
+    def schedules(self):
+        return self._config.get("schedules") or {}
+
+    @property
+    def schedule_grace(self):
+        return self._config.get("schedule_grace", 60)
+
+    @property
+    def slow_detection(self):
+        return self._config.get("slow_detection", True)
+
+    @property
+    def slow_factor(self):
+        return self._config.get("slow_factor", 3.)
+
+    @property
+    def slow_zscore(self):
+        return self._config.get("slow_zscore", 4.)
+
+    @property
+    def slow_min_samples(self):
+        return self._config.get("slow_min_samples", 10)
+
+    @property
+    def baseline_alpha(self):
+        return self._config.get("baseline_alpha", .1)
+
+    @property
+    def instrumentation(self):
+        sinks = self._config.get("instrumentation") or []
+        if isinstance(sinks, str):
+            sinks = [sinks]
+        return list(sinks)
+
+    @property
+    def statsd_host(self):
+        return self._config.get("statsd_host", "localhost")
+
+    @property
+    def statsd_port(self):
+        return self._config.get("statsd_port", 8125)
+
+    @property
+    def statsd_prefix(self):
+        return self._config.get("statsd_prefix", "joblog")
+
+    @property
+    def metrics_cache(self):
+        return self._config.get("metrics_cache", "default")
+
+    @property
+    def metrics_cache_seconds(self):
+        return self._config.get("metrics_cache_seconds", 10)
+
+    @property
+    def metrics_token(self):
+        return self._config.get("metrics_token", None)
+
+    @property
+    def render_cache(self):
+        return self._config.get("render_cache", "default")
+
+    @property
+    def render_cache_seconds(self):
+        return self._config.get("render_cache_seconds", 24 * 60 * 60)
+
+    @property
+    def dummy_output(self):
+        return self._config.get("dummy_output", "print")
+
+    @property
+    def dummy_buffer_lines(self):
+        return self._config.get("dummy_buffer_lines", 100)
+
+    @property
+    def dummy_flush_interval(self):
+        return self._config.get("dummy_flush_interval", 1.)
+
+    @property
+    def thread_safe(self):
+        return self._config.get("thread_safe", False)
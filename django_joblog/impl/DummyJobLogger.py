@@ -1,9 +1,18 @@
 # encoding=utf-8
 from __future__ import unicode_literals
 
+import sys
+import time
+import atexit
+import logging
+import threading
+
 from .JobLoggerBase import JobLoggerBase
 
 
+OUTPUT_MODES = ("print", "buffered", "silent", "logging")
+
+
 class DummyJobLogger(JobLoggerBase):
     """
     A class that mimics a JobLogger,
@@ -24,8 +33,36 @@ class DummyJobLogger(JobLoggerBase):
             log.error("some error")
 
     """
-    def __init__(self, name="", parallel=False):
+    def __init__(self, name="", parallel=False, output=None):
+        """
+        :param name: str, optional name that prefixes each line
+        :param parallel: bool, unused
+        :param output: str, one of
+            "print": print each line immediately (the default)
+            "buffered": collect lines and write them in blocks, see `flush`
+            "silent": discard everything without formatting
+            "logging": pass lines to the python logger "django_joblog"
+            Defaults to JOBLOG_CONFIG["dummy_output"]
+        """
         super(DummyJobLogger, self).__init__(name, parallel=parallel, print_to_console=True)
+        self._output = output or self.config.dummy_output
+        if self._output not in OUTPUT_MODES:
+            raise ValueError("Invalid DummyJobLogger output '%s', expected one of %s" % (
+                self._output, ", ".join(OUTPUT_MODES)
+            ))
+
+        self._progress_written = None
+        if self._output == "silent":
+            self.log = self.error = _noop
+        elif self._output == "logging":
+            self._logger = logging.getLogger("django_joblog")
+        elif self._output == "buffered":
+            self._buffer_lines = self.config.dummy_buffer_lines
+            self._flush_interval = self.config.dummy_flush_interval
+
+    @property
+    def output(self):
+        return self._output
 
     def log(self, line):
         """
@@ -33,13 +70,11 @@ class DummyJobLogger(JobLoggerBase):
         :param line: anything
         :return: None
         """
-        line = self.context + "%s" % line
-        if self.name:
-            line = self.name + ": " + line
-        try:
-            print("LOG: %s" % line)
-        except (UnicodeDecodeError, UnicodeEncodeError):
-            pass
+        if self._output == "logging":
+            if self._logger.isEnabledFor(logging.INFO):
+                self._logger.info("%s", self._format(line))
+        else:
+            self._write("LOG: %s" % self._format(line))
 
     def error(self, line):
         """
@@ -47,10 +82,109 @@ class DummyJobLogger(JobLoggerBase):
         :param line: anything
         :return: None
         """
+        if self._output == "logging":
+            if self._logger.isEnabledFor(logging.ERROR):
+                self._logger.error("%s", self._format(line))
+        else:
+            self._write("ERR: %s" % self._format(line))
+
+    def progress(self, done, total=None):
+        """
+        Print the progress as log line, at most once per JOBLOG_CONFIG["ping_interval"] seconds
+        and when `done` reaches `total`
+        :param done: int, number of processed items
+        :param total: int, optional number of all items
+        :return: None
+        """
+        self._set_progress(done, total)
+        if self._output == "silent":
+            return
+        now = time.time()
+        if self._progress_written is None or now - self._progress_written >= self.config.ping_interval \
+                or (total is not None and done >= total):
+            self._progress_written = now
+            from .progress import format_progress
+            p = self._progress
+            self.log("progress %s" % format_progress(p.done, p.total, p.rate, p.eta))
+
+    def flush(self):
+        """
+        Write all buffered lines to the console
+        """
+        _buffer.flush()
+
+    def _format(self, line):
         line = self.context + "%s" % line
         if self.name:
             line = self.name + ": " + line
+        return line
+
+    def _write(self, line):
+        if self._output == "buffered":
+            _buffer.write(line, self._buffer_lines, self._flush_interval)
+        else:
+            try:
+                print(line)
+            except (UnicodeDecodeError, UnicodeEncodeError):
+                pass
+
+
+def _noop(line):
+    pass
+
+
+class _ConsoleBuffer(object):
+    """
+    Collects lines of all buffered DummyJobLoggers of the process and writes them to
+    stdout when the buffer is full, at the latest `flush_interval` seconds after the last write
+    to stdout or when the process exits.
+    A pending line is flushed by a daemon timer, so it is also written when no further line follows.
+    Not part of public API.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lines = []
+        self._last_flush = time.time()
+        self._timer = None
+
+    def write(self, line, max_lines, flush_interval):
+        with self._lock:
+            self._lines.append(line)
+            remaining = flush_interval - (time.time() - self._last_flush)
+            if len(self._lines) < max_lines and remaining > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(remaining, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            lines = self._take_lines()
+        self._write_lines(lines)
+
+    def flush(self):
+        with self._lock:
+            lines = self._take_lines()
+        self._write_lines(lines)
+
+    def _take_lines(self):
+        lines, self._lines = self._lines, []
+        self._last_flush = time.time()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return lines
+
+    def _write_lines(self, lines):
+        if not lines:
+            return
         try:
-            print("ERR: %s" % line)
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
         except (UnicodeDecodeError, UnicodeEncodeError):
             pass
+        except (IOError, ValueError):
+            # stdout closed, e.g. at interpreter shutdown
+            pass
+
+
+_buffer = _ConsoleBuffer()
+atexit.register(_buffer.flush)
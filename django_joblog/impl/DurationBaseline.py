@@ -0,0 +1,97 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import math
+
+
+class DurationBaseline(object):
+    """
+    Incrementally updated duration statistics of one job name.
+    Not part of public API.
+
+    Keeps an exponentially weighted moving average and variance
+    and streaming estimates of a few percentiles, so a new duration can
+    be judged without looking at the job's history.
+
+    All durations are in seconds.
+    """
+
+    QUANTILES = (.5, .95, .99)
+
+    # step size of the percentile estimates relative to the current spread of durations
+    QUANTILE_STEP = .5
+
+    def __init__(self, num_samples=0, mean=None, variance=0., quantiles=None):
+        self.num_samples = num_samples
+        self.mean = mean
+        self.variance = variance or 0.
+        self.quantiles = list(quantiles or [None] * len(self.QUANTILES))
+
+    @property
+    def stddev(self):
+        return math.sqrt(max(0., self.variance))
+
+    def zscore(self, duration):
+        """
+        Returns the number of standard deviations that `duration` lies above the mean
+        :param duration: float
+        :return: float or None if there is no spread yet
+        """
+        if self.mean is None:
+            return None
+        stddev = self.stddev
+        if not stddev:
+            return None
+        return (duration - self.mean) / stddev
+
+    def is_slow(self, duration, factor=None, zscore=None, min_samples=0):
+        """
+        Returns True if `duration` exceeds `factor` times the mean
+        or lies more than `zscore` standard deviations above the mean.
+        :param duration: float
+        :param factor: float or None to disable
+        :param zscore: float or None to disable
+        :param min_samples: int, no run is considered slow before this many samples have been added
+        :return: bool
+        """
+        if self.mean is None or self.num_samples < max(1, min_samples):
+            return False
+        if factor and self.mean > 0. and duration > self.mean * factor:
+            return True
+        if zscore:
+            z = self.zscore(duration)
+            if z is not None and z > zscore:
+                return True
+        return False
+
+    def add(self, duration, alpha=.1):
+        """
+        Adds a duration to the baseline
+        :param duration: float
+        :param alpha: float, weight of the new sample in the moving average
+        """
+        self.num_samples += 1
+        if self.mean is None:
+            self.mean = duration
+            self.variance = 0.
+            self.quantiles = [duration] * len(self.QUANTILES)
+            return
+
+        # scale of the percentile steps, taken before the new sample moves the baseline
+        scale = self.stddev or abs(self.mean) * .1 or 1.
+
+        diff = duration - self.mean
+        increment = alpha * diff
+        self.mean += increment
+        self.variance = (1. - alpha) * (self.variance + diff * increment)
+
+        step = alpha * self.QUANTILE_STEP * scale
+        for i, q in enumerate(self.QUANTILES):
+            estimate = self.quantiles[i]
+            if estimate is None:
+                estimate = duration
+            elif duration > estimate:
+                estimate += step * q
+            else:
+                estimate -= step * (1. - q)
+            self.quantiles[i] = max(0., estimate)
@@ -0,0 +1,50 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import logging
+
+from .current import get_current_joblogger
+
+
+class JobLogHandler(logging.Handler):
+    """
+    A logging.Handler that passes records to the JobLogger which is active
+    in the current thread or asyncio task.
+
+    Records of `error_level` and above go to `JobLogger.error`, all others to `JobLogger.log`.
+    Outside of a `with JobLogger(...)` block, records are dropped before any formatting.
+
+    logging.getLogger("myapp").addHandler(JobLogHandler(level=logging.INFO))
+
+    with JobLogger("my_task"):
+        logging.getLogger("myapp").info("stored in the job log")
+    """
+    def __init__(self, level=logging.NOTSET, error_level=logging.ERROR):
+        """
+        :param level: int, minimum level of records to pass on
+        :param error_level: int, minimum level of records that are passed to `JobLogger.error`
+        """
+        super(JobLogHandler, self).__init__(level=level)
+        self.error_level = error_level
+
+    def handle(self, record):
+        # Logger.callHandlers has already compared the record against self.level,
+        # so this is the first point where work is done for a passing record.
+        if get_current_joblogger() is None:
+            return False
+        return super(JobLogHandler, self).handle(record)
+
+    def emit(self, record):
+        joblog = get_current_joblogger()
+        if joblog is None:
+            return
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        if record.levelno >= self.error_level:
+            joblog.error(message)
+        else:
+            joblog.log(message)
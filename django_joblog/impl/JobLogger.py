@@ -1,12 +1,16 @@
 # encoding=utf-8
 from __future__ import unicode_literals
 
+import time
 import traceback
+import threading
 
 from django.utils.translation import ugettext_lazy as _
 
+from ..instrumentation import instrumented
 from .JobLoggerBase import JobLoggerBase
 from .JobModelAbstraction import JobModelAbstraction
+from .current import set_current_joblogger, reset_current_joblogger
 
 
 class JobLogger(JobLoggerBase):
@@ -18,35 +22,89 @@ class JobLogger(JobLoggerBase):
         the_task()
         job.log("some_info")
     """
-    def __init__(self, name, parallel=False, print_to_console=False):
+    def __init__(self, name, parallel=False, print_to_console=False, thread_safe=None, parent=None,
+                 wait=None, coalesce=False, max_parallel=None):
         """
         Constructs a JobLogger object. Always use with `with` statement.
         :param name: str, The name of the job
         :param parallel: bool, Allow parallel execution of jobs. If False, a JobIsAlreadyRunningError will be
                          thrown, if a job with the same name is actually running
         :param print_to_console: bool, if True, all log, error and exception texts are also printed to the console
+        :param thread_safe: bool, if True, the logger can be shared between threads.
+                            Each thread has it's own context stack. Defaults to JOBLOG_CONFIG["thread_safe"]
+        :param parent: JobLogger, optional parent job, see `child()`
+        :param wait: float, optional number of seconds to wait for a running instance to finish,
+                     before a JobIsAlreadyRunningError is thrown. Only used if `parallel` is False
+        :param coalesce: bool, if True and another instance is already waiting, a JobCoalescedError
+                         is thrown immediately. Only used with `wait`
+        :param max_parallel: int, optional number of jobs with this name that may run at the same time,
+                             across all processes and hosts. Overrides `parallel`. Uses lease locking
         """
-        super(JobLogger, self).__init__(name, parallel=parallel, print_to_console=print_to_console)
+        from .Config import get_config
+        if thread_safe is None:
+            thread_safe = get_config().thread_safe
+        super(JobLogger, self).__init__(
+            name, parallel=parallel, print_to_console=print_to_console, thread_safe=thread_safe,
+        )
         self._model = None
         self._thread = None
+        self._current_token = None
+        self._parent = parent
+        self._wait = wait
+        self._coalesce = coalesce
+        if max_parallel is not None and max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1, got %s" % max_parallel)
+        self._max_parallel = max_parallel
+        self._children = []
+        # children of `children()` that have not been entered yet
+        self._reserved = []
+        # (pk, date_started) of the entry created by the parent's `children()`
+        self._reserved_entry = None
+        self._ping_owner = None
+        self._progress_written = None
+        if thread_safe:
+            self._update_lock = threading.Lock()
+            self._update_pending = False
 
     def __enter__(self):
         if self._model is None:
-            self._model = JobModelAbstraction(self)
+            reserved_entry = self._reserved_entry
+            if reserved_entry is not None:
+                self._parent._reserved.remove(self)
+            self._model = JobModelAbstraction(self, reserved_pk=reserved_entry[0] if reserved_entry else None)
             self._model.create_model()
-            if self.config.ping:
+            self._ping_owner = self._get_ping_owner()
+            if self._ping_owner is not None:
+                # the ping thread of a parent updates this job as well
+                self._ping_owner._children.append(self)
+            elif self.config.ping or self._model.has_lease:
                 from .JobLoggerPingThread import JobLoggerPingThread
                 self._thread = JobLoggerPingThread(self)
                 self._thread.start()
+            self._current_token = set_current_joblogger(self)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.exception = exc_val
         self.traceback = exc_tb
 
+        if self._current_token is not None:
+            reset_current_joblogger(self._current_token)
+            self._current_token = None
+
+        if self._ping_owner is not None:
+            self._ping_owner._children.remove(self)
+            self._ping_owner = None
+
         if self._model is None:
             return True
 
+        if self._reserved:
+            self._model.block_reserved([child._reserved_entry for child in self._reserved])
+            for child in self._reserved:
+                child._reserved_entry = None
+            self._reserved = []
+
         try:
             self._model.update_model()
             if exc_tb:
@@ -76,6 +134,69 @@ class JobLogger(JobLoggerBase):
 
             raise e
 
+    @property
+    def parent(self):
+        return self._parent
+
+    @property
+    def wait(self):
+        return self._wait
+
+    @property
+    def coalesce(self):
+        return self._coalesce
+
+    @property
+    def max_parallel(self):
+        return self._max_parallel
+
+    def child(self, name, **kwargs):
+        """
+        Returns a JobLogger for a step of this job. It's database entry links to this job's entry
+        and is updated by this job's ping thread. Use with `with` statement inside this job's `with` block.
+
+        with JobLogger("pipeline") as job:
+            with job.child("download") as step:
+                step.log("...")
+
+        :param name: str, The name of the step's job
+        :param kwargs: other JobLogger arguments, `parallel` defaults to True,
+                       `print_to_console` and `thread_safe` default to this job's settings
+        :return: JobLogger
+        """
+        kwargs.setdefault("parallel", True)
+        kwargs.setdefault("print_to_console", self.print_to_console)
+        kwargs.setdefault("thread_safe", self.thread_safe)
+        return self.__class__(name, parent=self, **kwargs)
+
+    def children(self, names, **kwargs):
+        """
+        Returns a JobLogger for each of several steps of this job, see `child()`.
+
+        Called inside this job's `with` block, the entries of all parallel steps are created
+        together with one insert, in 'waiting' state. Each step turns it's entry to 'running'
+        when it's `with` block starts. Entries of steps that have not started are ended
+        as 'blocked' when this job ends.
+
+        with JobLogger("pipeline") as job:
+            for step, chunk in zip(job.children(["chunk"] * len(chunks)), chunks):
+                with step:
+                    process(chunk)
+
+        :param names: list of str, The names of the steps' jobs
+        :param kwargs: other JobLogger arguments, see `child()`
+        :return: list of JobLogger
+        """
+        children = [self.child(name, **kwargs) for name in names]
+        if self._model is not None:
+            reservable = [child for child in children if child.allow_parallel and child.max_parallel is None]
+            if reservable:
+                for child, entry in zip(reservable, self._model.reserve_children(reservable)):
+                    child._reserved_entry = entry
+                self._reserved.extend(reservable)
+        return children
+
+    @instrumented("log")
     def log(self, line):
         """
         Add a line to the log output
@@ -86,7 +207,7 @@ class JobLogger(JobLoggerBase):
         self._log_lines.append(line)
 
         if self._model and self.config.live_updates:
-            self._model.update_model()
+            self._live_update()
 
         if self.print_to_console:
             try:
@@ -94,6 +215,7 @@ class JobLogger(JobLoggerBase):
             except (UnicodeDecodeError, UnicodeEncodeError):
                 pass
 
+    @instrumented("error")
     def error(self, line):
         """
         Add a line to the error-output
@@ -104,7 +226,7 @@ class JobLogger(JobLoggerBase):
         self._error_lines.append(line)
 
         if self._model and self.config.live_updates:
-            self._model.update_model()
+            self._live_update()
 
         if self.print_to_console:
             try:
@@ -112,3 +234,86 @@ class JobLogger(JobLoggerBase):
             except (UnicodeDecodeError, UnicodeEncodeError):
                 pass
 
+    @instrumented("progress")
+    def progress(self, done, total=None):
+        """
+        Reports the progress of the job. It's stored with the rate and the estimated end
+        in the job's progress fields, not in the log.
+
+        The fields are written together with the next ping in "ping" mode or the next live update.
+        Otherwise they are written at most once per JOBLOG_CONFIG["ping_interval"] seconds
+        and when the job ends.
+
+        :param done: int, number of processed items
+        :param total: int, optional number of all items
+        :return: None
+        """
+        self._set_progress(done, total)
+
+        if self._model is None or self._thread is not None or self._ping_owner is not None:
+            return
+
+        now = time.time()
+        if self._progress_written is None or now - self._progress_written >= self.config.ping_interval:
+            self._progress_written = now
+            self._model.update_progress()
+
+    def process_bridge(self, **kwargs):
+        """
+        Returns a JobLoggerProcessBridge that merges the output of other processes into this job.
+        See JobLoggerProcessBridge for the arguments.
+        :return: JobLoggerProcessBridge
+        """
+        from .JobLoggerProcessBridge import JobLoggerProcessBridge
+        return JobLoggerProcessBridge(self, **kwargs)
+
+    def _ping_reserved(self):
+        entries = []
+        for child in list(self._reserved):
+            entry = child._reserved_entry
+            if entry is not None:
+                entries.append(entry)
+        if entries:
+            self._model.ping_reserved(entries)
+
+    def _get_ping_owner(self):
+        parent = self._parent
+        while parent is not None and parent._thread is None:
+            parent = parent._parent
+        return parent
+
+    def _add_lines(self, lines):
+        """
+        Adds a batch of already formatted lines, with a single live update
+        :param lines: list of (bool, str) tuples, True for error lines
+        """
+        for is_error, line in lines:
+            if is_error:
+                self._error_lines.append(line)
+            else:
+                self._log_lines.append(line)
+
+            if self.print_to_console:
+                try:
+                    print("%s: %s" % ("ERR" if is_error else "LOG", line))
+                except (UnicodeDecodeError, UnicodeEncodeError):
+                    pass
+
+        if lines and self._model and self.config.live_updates:
+            self._live_update()
+
+    def _live_update(self):
+        if not self._thread_safe:
+            self._model.update_model()
+            return
+
+        # Only one thread writes at a time. Threads that find the lock taken leave
+        # their update to the writing thread, which repeats while updates are pending.
+        self._update_pending = True
+        while self._update_pending and self._update_lock.acquire(False):
+            try:
+                while self._update_pending:
+                    self._update_pending = False
+                    self._model.update_model()
+            finally:
+                self._update_lock.release()
@@ -1,23 +1,34 @@
 # encoding=utf-8
 from __future__ import unicode_literals
 
+import itertools
+
 
 class JobLoggerBase(object):
     """
     Base-class for JobLogger and DummyJobLogger.
     Not part of public API.
     """
-    def __init__(self, name, parallel=False, print_to_console=False):
-        from .Config import Config
-        self.config = Config()
+    def __init__(self, name, parallel=False, print_to_console=False, thread_safe=False):
+        from .Config import get_config
+        self.config = get_config()
         self._name = name
-        self._log_lines = []
-        self._error_lines = []
-        self._context = []
+        self._thread_safe = thread_safe
+        if thread_safe:
+            from .threadsafe import ThreadSafeLines, ThreadLocalList
+            counter = itertools.count()
+            self._log_lines = ThreadSafeLines(counter)
+            self._error_lines = ThreadSafeLines(counter)
+            self._context = ThreadLocalList()
+        else:
+            self._log_lines = []
+            self._error_lines = []
+            self._context = []
         self._allow_parallel = parallel
         self._print_to_console = print_to_console or self.config.print_to_console
         self.exception = None
         self.traceback = None
+        self._progress = None
 
     @property
     def name(self):
@@ -27,6 +38,10 @@ class JobLoggerBase(object):
     def allow_parallel(self):
         return self._allow_parallel
 
+    @property
+    def thread_safe(self):
+        return self._thread_safe
+
     @property
     def print_to_console(self):
         return self._print_to_console
@@ -55,7 +70,37 @@ class JobLoggerBase(object):
         """
         Pops the last context name from the stack
         """
-        self._context = self._context[:-1]
+        if len(self._context):
+            self._context.pop()
+
+    def progress(self, done, total=None):
+        """
+        Reports the progress of the job.
+        :param done: int, number of processed items
+        :param total: int, optional number of all items
+        :return: None
+        """
+        self._set_progress(done, total)
+
+    def get_progress(self):
+        """
+        Returns the last reported progress or None
+        :return: dict with "done", "total", "rate" (items per second) and "eta" (datetime of the estimated end)
+        """
+        if self._progress is None or self._progress.done is None:
+            return None
+        return {
+            "done": self._progress.done,
+            "total": self._progress.total,
+            "rate": self._progress.rate,
+            "eta": self._progress.eta,
+        }
+
+    def _set_progress(self, done, total):
+        if self._progress is None:
+            from .progress import ProgressMeter
+            self._progress = ProgressMeter()
+        self._progress.set(done, total)
 
     def get_log_text(self):
         """
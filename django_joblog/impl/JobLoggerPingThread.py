@@ -5,12 +5,15 @@ import time
 import threading
 import datetime
 
+from ..instrumentation import instrumented
+
 
 class JobLoggerPingThread(object):
 
     """
     Not part of public API
-    Helper class to house a thread that regularly calls JobModelAbstraction.update_model()
+    Helper class to house a thread that regularly calls JobModelAbstraction.ping()
+    for the job and all of it's active and waiting child jobs
     """
 
     def __init__(self, joblog):
@@ -33,10 +36,25 @@ class JobLoggerPingThread(object):
             self._thread = None
 
     def _mainloop(self):
-        while not self._stop:
-            time.sleep(.5)
-            if datetime.datetime.now() >= self._next_ping_time:
-                self._next_ping_time = datetime.datetime.now() + datetime.timedelta(seconds=self._ping_interval)
-                # print("PING")
-                if not self._stop:
-                    self._p._model.update_model(allow_fail=True)
+        from django.db import connections
+        try:
+            while not self._stop:
+                time.sleep(.5)
+                if datetime.datetime.now() >= self._next_ping_time:
+                    self._next_ping_time = datetime.datetime.now() + datetime.timedelta(seconds=self._ping_interval)
+                    # print("PING")
+                    if not self._stop:
+                        self._ping()
+        finally:
+            # the pings opened connections in this thread
+            connections.close_all()
+
+    @instrumented("ping")
+    def _ping(self):
+        self._p._model.ping()
+        self._p._ping_reserved()
+        for child in list(self._p._children):
+            model = child._model
+            if model is not None:
+                model.ping()
+                child._ping_reserved()
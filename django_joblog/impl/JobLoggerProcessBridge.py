@@ -0,0 +1,210 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import os
+import time
+import atexit
+import weakref
+import threading
+import multiprocessing
+import multiprocessing.util
+
+from .JobLoggerBase import JobLoggerBase
+
+
+class JobLoggerProcessBridge(object):
+    """
+    Collects the output of JobLoggerProxy objects in other processes
+    and merges it into the parent's JobLogger.
+    Create it with `JobLogger.process_bridge()`.
+
+    with JobLogger("my_task") as job:
+        with job.process_bridge() as bridge:
+            with ProcessPoolExecutor() as pool:
+                pool.map(the_task, [(bridge.proxy(), chunk) for chunk in chunks])
+
+    def the_task(args):
+        log, chunk = args
+        with log:
+            log.log("processing %s" % chunk)
+    """
+    def __init__(self, joblog, queue=None, batch_size=100, flush_interval=1.):
+        """
+        :param joblog: JobLogger instance of the parent process
+        :param queue: optional queue object that is shared with the child processes.
+            Defaults to a queue of a multiprocessing.Manager, which can be passed as argument
+            to pools and executors. A multiprocessing.Queue can only be passed to child processes
+            on creation but does not need an extra manager process.
+        :param batch_size: int, number of lines a proxy collects before sending them
+        :param flush_interval: float, seconds after which a proxy sends it's lines anyway
+        """
+        self._p = joblog
+        self._manager = None
+        self._queue = queue
+        self._thread = None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    @property
+    def queue(self):
+        if self._queue is None:
+            self._manager = multiprocessing.Manager()
+            self._queue = self._manager.Queue()
+        return self._queue
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def proxy(self, tag=None):
+        """
+        Returns a picklable logger for a child process
+        :param tag: str, context name that prefixes all lines of the proxy.
+            Defaults to "pid-<process id>" of the child process
+        :return: JobLoggerProxy
+        """
+        return JobLoggerProxy(
+            self.queue, name=self._p.name, tag=tag,
+            batch_size=self.batch_size, flush_interval=self.flush_interval,
+        )
+
+    def start(self):
+        if self._thread is None:
+            queue = self.queue
+            self._thread = threading.Thread(target=self._mainloop, args=(queue, ))
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """
+        Merges all lines that have been sent so far and stops receiving
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self._queue = None
+
+    def _mainloop(self, queue):
+        from django.db import connections
+        try:
+            while True:
+                lines = queue.get()
+                if lines is None:
+                    break
+                self._p._add_lines(lines)
+        finally:
+            # live updates might have opened a connection in this thread
+            connections.close_all()
+
+
+class JobLoggerProxy(JobLoggerBase):
+    """
+    Logger for child processes that sends it's lines in batches to
+    the JobLoggerProcessBridge of the parent process.
+
+    Lines are sent when `batch_size` lines are collected, when the first collected line
+    is older than `flush_interval` seconds, on `flush()`, when leaving a `with` block
+    and at process exit.
+    """
+    def __init__(self, queue, name="", tag=None, batch_size=100, flush_interval=1.):
+        super(JobLoggerProxy, self).__init__(name, parallel=True)
+        self._queue = queue
+        self._tag = tag
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending = []
+        self._pending_since = None
+        self._pid = None
+
+    def __getstate__(self):
+        return {
+            "queue": self._queue,
+            "name": self._name,
+            "tag": self._tag,
+            "batch_size": self._batch_size,
+            "flush_interval": self._flush_interval,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+    @property
+    def tag(self):
+        return self._tag or "pid-%s" % os.getpid()
+
+    def log(self, line):
+        """
+        Add a line to the parent job's log output
+        :param line: anything
+        :return: None
+        """
+        self._add(False, line)
+
+    def error(self, line):
+        """
+        Add a line to the parent job's error output
+        :param line: anything
+        :return: None
+        """
+        self._add(True, line)
+
+    def flush(self):
+        """
+        Sends all collected lines to the parent process
+        """
+        if self._pending:
+            lines, self._pending = self._pending, []
+            self._pending_since = None
+            self._queue.put(lines)
+
+    def _add(self, is_error, line):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            _register_proxy(self)
+
+        context = self.context
+        prefix = self.tag + (":" + context if context else ": ")
+        self._pending.append((is_error, prefix + ("%s" % line).strip()))
+
+        if self._pending_since is None:
+            self._pending_since = time.time()
+        if len(self._pending) >= self._batch_size or time.time() - self._pending_since >= self._flush_interval:
+            self.flush()
+
+
+# proxies that have been used in this process, flushed at exit
+_proxies = weakref.WeakSet()
+_proxies_pid = None
+
+
+def _register_proxy(proxy):
+    global _proxies, _proxies_pid
+    if _proxies_pid != os.getpid():
+        # first proxy in this process
+        _proxies_pid = os.getpid()
+        _proxies = weakref.WeakSet()
+        atexit.register(_flush_proxies)
+        # multiprocessing children do not run atexit handlers
+        multiprocessing.util.Finalize(None, _flush_proxies, exitpriority=100)
+    _proxies.add(proxy)
+
+
+def _flush_proxies():
+    for proxy in list(_proxies):
+        try:
+            proxy.flush()
+        except Exception:
+            pass
@@ -1,11 +1,33 @@
 # encoding=utf-8
 from __future__ import unicode_literals
 
+import os
+import time
+import uuid
+import socket
+
 from django.utils.translation import ugettext_lazy as _
 from django.utils import timezone
-from django.db import transaction
+from django.db import transaction, connections
+from django.db.models import Count
+
+from ..instrumentation import instrumented
+from ..signals import job_slow
+from .exceptions import JobIsAlreadyRunningError, JobCoalescedError
+
+
+# The django_joblog.models module. It can not be imported at module level because
+# the app registry might not be ready when the JobLogger is imported.
+# Resolved once by the first JobModelAbstraction instance.
+models = None
+
 
-from .exceptions import JobIsAlreadyRunningError
+def _import_models():
+    global models
+    if models is None:
+        from .. import models as _models
+        models = _models
+    return models
 
 
 class JobModelAbstraction(object):
@@ -13,14 +35,16 @@ class JobModelAbstraction(object):
     Helper for JobLogger communication with database.
     Not part of public API.
     """
-    def __init__(self, joblog):
+    def __init__(self, joblog, reserved_pk=None):
+        _import_models()
         self._p = joblog
-        self._model_pk = None
+        # the 'waiting' entry created by the parent's `reserve_children()`
+        self._model_pk = reserved_pk
+        self._lease_owner = None
 
     @property
     def manager(self):
-        from django_joblog.models import JobLogModel, db_alias
-        return JobLogModel.objects.using(db_alias())
+        return models.JobLogModel.objects.using(models.db_alias())
 
     def is_job_running(self, time_delta=None):
         """
@@ -29,20 +53,109 @@ class JobModelAbstraction(object):
                            if not None, return True only if the running job is started within now - time_delta
         :return: bool
         """
-        from django_joblog.models import JobLogModel
-        return JobLogModel.is_job_running(self._p.name, time_delta=time_delta)
+        return models.JobLogModel.is_job_running(self._p.name, time_delta=time_delta)
 
+    @property
+    def has_lease(self):
+        return self._lease_owner is not None
+
+    @instrumented("create_model")
     def create_model(self):
-        if not self._p.allow_parallel and self.is_job_running():
-            self._create_blocked_model()
-            raise JobIsAlreadyRunningError(
-                _("The job '%s' is already running and 'parallel' was set to False") % self._p.name
+        if not self._p.allow_parallel or self._p.max_parallel is not None:
+            if not self._acquire() and not self._wait():
+                self._block()
+                if self._p.max_parallel is not None:
+                    raise JobIsAlreadyRunningError(
+                        _("The job '%s' is already running %s times") % (self._p.name, self._p.max_parallel)
+                    )
+                raise JobIsAlreadyRunningError(
+                    _("The job '%s' is already running and 'parallel' was set to False") % self._p.name
+                )
+        else:
+            self._start()
+
+        if self.has_lease:
+            self._renew_lease(self._model_pk)
+
+    def ping(self):
+        """
+        Updates the job's duration and renews it's lease
+        """
+        self.update_model(allow_fail=True)
+        if self.has_lease:
+            self._renew_lease()
+
+    def reserve_children(self, children):
+        """
+        Creates the 'waiting' entries of several child jobs of this job with one insert.
+        The counts of all names are queried together.
+        :param children: list of JobLogger
+        :return: list of (pk, date_started) tuples in the order of `children`
+        """
+        names = set(child.name for child in children)
+        counts = dict(
+            self.manager.filter(name__in=names).values("name").annotate(num=Count("pk")).values_list("name", "num")
+        )
+        for name, num_archived in models.JobLogStatsModel.get_num_archived_by_name(names).items():
+            counts[name] = counts.get(name, 0) + num_archived
+
+        now = timezone.now()
+        rows = []
+        for child in children:
+            counts[child.name] = counts.get(child.name, 0) + 1
+            rows.append(models.JobLogModel(
+                name=child.name, count=counts[child.name], date_started=now, parent_id=self._model_pk,
+                state=models.JobLogStates.waiting.name,
+            ))
+
+        with transaction.atomic(using=models.db_alias()):
+            rows = self.manager.bulk_create(rows)
+            if any(row.pk is None for row in rows):
+                # backends that do not return the primary keys of bulk inserts
+                pks = {
+                    (name, count): pk
+                    for pk, name, count in self.manager.filter(
+                        parent_id=self._model_pk, name__in=names, date_started=now,
+                        state=models.JobLogStates.waiting.name,
+                    ).values_list("pk", "name", "count")
+                }
+                for row in rows:
+                    row.pk = pks[(row.name, row.count)]
+
+        return [(row.pk, now) for row in rows]
+
+    def ping_reserved(self, entries):
+        """
+        Updates the duration of child entries that are still waiting, so the cleanup keeps them
+        :param entries: list of (pk, date_started) tuples
+        """
+        now = timezone.now()
+        by_date = dict()
+        for pk, date_started in entries:
+            by_date.setdefault(date_started, []).append(pk)
+        for date_started, pks in by_date.items():
+            self.manager.filter(pk__in=pks, state=models.JobLogStates.waiting.name).update(
+                duration=now - date_started
+            )
+
+    def block_reserved(self, entries):
+        """
+        Ends the child entries that are still waiting as 'blocked'.
+        They are kept, so their counts are not given out again.
+        :param entries: list of (pk, date_started) tuples
+        """
+        now = timezone.now()
+        by_date = dict()
+        for pk, date_started in entries:
+            by_date.setdefault(date_started, []).append(pk)
+        for date_started, pks in by_date.items():
+            self.manager.filter(pk__in=pks, state=models.JobLogStates.waiting.name).update(
+                state=models.JobLogStates.blocked.name, date_ended=now, duration=now - date_started,
             )
-        self._create_model()
 
+    @instrumented("update_model")
     def update_model(self, allow_fail=False):
-        from django_joblog.models import db_alias
-        with transaction.atomic(using=db_alias()):
+        with transaction.atomic(using=models.db_alias()):
             model = self._get_model(allow_fail=allow_fail)
             if not model and allow_fail:
                 return
@@ -53,35 +166,183 @@ class JobModelAbstraction(object):
             model.log_text = self._p.get_log_text()
             model.error_text = self._p.get_error_text()
             model.duration = duration
-            model.save(using=db_alias())
+            if self._p._progress is not None:
+                for key, value in self._p._progress.as_model_values().items():
+                    setattr(model, key, value)
+            model.save(using=models.db_alias())
+
+    @instrumented("update_progress")
+    def update_progress(self):
+        """
+        Writes only the progress fields
+        """
+        if self._model_pk is not None and self._p._progress is not None:
+            self.manager.filter(pk=self._model_pk).update(**self._p._progress.as_model_values())
 
+    @instrumented("finish")
     def finish(self, error_text=None):
-        from django_joblog.models import db_alias
         if self._model_pk is not None:
-            with transaction.atomic(using=db_alias()):
-                self._finish(error_text)
+            with transaction.atomic(using=models.db_alias()):
+                model = self._finish(error_text)
 
-    def _create_model(self):
+            if self.has_lease:
+                models.JobLogLockModel.release(self._p.name, self._lease_owner)
+                self._lease_owner = None
+
+            if self._p.config.isolated_writes:
+                # the next job in this thread opens a new connection
+                connections[models.db_alias()].close()
+
+            if model.is_slow:
+                job_slow.send(sender=self._p.__class__, joblog=self._p, model=model)
+
+    def _create_model(self, state=None):
         now = timezone.now()
-        count = self.manager.filter(name=self._p.name).count() + 1
-        model = self.manager.create(name=self._p.name, count=count, date_started=now)
+        count = self._next_count()
+        model = self.manager.create(
+            name=self._p.name, count=count, date_started=now, parent_id=self._parent_pk(),
+            state=state or models.JobLogStates.running.name,
+        )
         self._model_pk = model.pk
-        if self._p.print_to_console:
+        if state is None and self._p.print_to_console:
             print("\n%s.%s started @ %s" % (self._p.name, count, now))
         return model
 
+    def _start(self):
+        """
+        Creates the running entry, or turns the waiting entry into it.
+        The waiting entry gets the start time as new date_started, so the duration does not
+        include the waiting. It only moves forward, so readers that hold back at the oldest
+        running or waiting entry, like `joblog_export --watermark`, do not miss it.
+        """
+        if self._model_pk is None:
+            self._create_model()
+            return
+
+        now = timezone.now()
+        self.manager.filter(pk=self._model_pk).update(
+            state=models.JobLogStates.running.name, date_started=now, duration=None,
+        )
+        if self._p.print_to_console:
+            print("\n%s started @ %s" % (self._p.name, now))
+
+    def _block(self):
+        """
+        Creates the blocked entry, or turns the waiting entry into it
+        """
+        if self._model_pk is None:
+            self._create_blocked_model()
+            return
+
+        with transaction.atomic(using=models.db_alias()):
+            model = self.manager.select_for_update().get(pk=self._model_pk)
+            model.state = models.JobLogStates.blocked.name
+            model.date_ended = timezone.now()
+            model.duration = model.date_ended - model.date_started
+            model.save(using=models.db_alias())
+
     def _create_blocked_model(self):
-        from django_joblog.models import JobLogStates
         now = timezone.now()
-        count = self.manager.filter(name=self._p.name).count() + 1
+        count = self._next_count()
         model = self.manager.create(
-            name=self._p.name, count=count, date_started=now,
-            state=JobLogStates.blocked.name,
+            name=self._p.name, count=count, date_started=now, parent_id=self._parent_pk(),
+            state=models.JobLogStates.blocked.name,
         )
         return model
 
+    def _acquire(self):
+        """
+        Starts the job and returns True if no other instance is running or the lease is acquired.
+        With locking="running", the check and the start happen in one transaction
+        on the job's lock row, so of several waiters only one starts.
+        """
+        if self._p.max_parallel is not None or self._p.config.locking == "lease":
+            if not self._acquire_lease():
+                return False
+            self._start()
+            return True
+        elif self._p.config.locking == "running":
+            with transaction.atomic(using=models.db_alias()):
+                models.JobLogLockModel.lock(self._p.name)
+                if self.is_job_running():
+                    return False
+                self._start()
+                return True
+        raise ValueError("Invalid JOBLOG_CONFIG['locking'] '%s', expected 'running' or 'lease'" % (
+            self._p.config.locking
+        ))
+
+    def _wait(self):
+        """
+        Waits up to JobLogger.wait seconds for the running instance to finish,
+        polling with exponential backoff. A 'waiting' entry is created for the time of waiting.
+        Returns True if the job has been started
+        """
+        if self._p.wait is None:
+            return False
+
+        max_delay = self._p.config.wait_poll_interval
+        deadline = time.time() + self._p.wait
+        delay = min(.1, max_delay)
+
+        model = self._create_model(state=models.JobLogStates.waiting.name)
+        if self._p.coalesce:
+            waiting_pk = self._get_older_waiting_pk(2 * max_delay + 1)
+            if waiting_pk is not None:
+                # the entry is kept, so it's count is not given out again
+                self._block()
+                raise JobCoalescedError(
+                    _("The job '%s' is already waiting to run as #%s") % (self._p.name, waiting_pk)
+                )
+
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+            if self._acquire():
+                return True
+            # heartbeat, so other waiters and the cleanup see that we are still here
+            self.manager.filter(pk=self._model_pk).update(duration=timezone.now() - model.date_started)
+
+    def _get_older_waiting_pk(self, leeway):
+        now = timezone.now()
+        qset = self.manager.filter(
+            name=self._p.name, state=models.JobLogStates.waiting.name, pk__lt=self._model_pk,
+        ).order_by("pk")
+        for pk, date_started, duration in qset.values_list("pk", "date_started", "duration"):
+            last_update = date_started + duration if duration else date_started
+            if (now - last_update).total_seconds() <= leeway:
+                return pk
+
+    def _acquire_lease(self):
+        owner = "%s:%s:%s" % (socket.gethostname(), os.getpid(), uuid.uuid4().hex)
+        if not models.JobLogLockModel.acquire(
+                self._p.name, owner, self._p.config.lease_duration, slots=self._p.max_parallel or 1
+        ):
+            return False
+        self._lease_owner = owner
+        return True
+
+    def _renew_lease(self, job_pk=None):
+        if not models.JobLogLockModel.renew(
+                self._p.name, self._lease_owner, self._p.config.lease_duration, job_pk=job_pk
+        ):
+            self._lease_owner = None
+            self._p.error(_("Lease of job '%s' expired and has been taken over") % self._p.name)
+
+    def _next_count(self):
+        name = self._p.name
+        return self.manager.filter(name=name).count() + models.JobLogStatsModel.get_num_archived(name) + 1
+
+    def _parent_pk(self):
+        parent = self._p.parent
+        if parent is not None and parent._model is not None:
+            return parent._model._model_pk
+
     def _get_model(self, allow_fail=False):
-        from django_joblog.models import JobLogModel
         if self._model_pk is None:
             return self._create_model()
         else:
@@ -90,24 +351,26 @@ class JobModelAbstraction(object):
             else:
                 try:
                     return self.manager.get(pk=self._model_pk)
-                except JobLogModel.DoesNotExist:
+                except models.JobLogModel.DoesNotExist:
                     return None
 
     def _finish(self, exception_or_error=None):
-        from django_joblog.models import db_alias, JobLogStates
-        
         model = self._get_model()
         
         model.date_ended = timezone.now()
         model.duration = model.date_ended - model.date_started
-        model.state = JobLogStates.finished.name
+        model.state = models.JobLogStates.finished.name
+        model.progress_eta = None
         if exception_or_error is not None:
             if model.error_text:
                 model.error_text = "%s\n%s" % (model.error_text, exception_or_error)
             else:
                 model.error_text = "%s" % exception_or_error
-            model.state = JobLogStates.error.name
-        model.save(using=db_alias())
+            model.state = models.JobLogStates.error.name
+
+        model.is_slow = models.JobLogStatsModel.add_job(model)
+
+        model.save(using=models.db_alias())
 
         if self._p.print_to_console:
             if model.log_text or model.error_text:
@@ -116,5 +379,9 @@ class JobModelAbstraction(object):
                 print("LOG:\n%s" % model.log_text)
             if model.error_text:
                 print("ERROR:\n%s" % model.error_text)
-            print("%s.%s finished after %s" % (model.name, model.count, model.duration))
+            print("%s.%s finished after %s%s" % (
+                model.name, model.count, model.duration, " (slow)" if model.is_slow else ""
+            ))
+
+        return model
 
@@ -0,0 +1,56 @@
+# encoding=utf-8
+"""
+Tracks the JobLogger that is active in the current thread or asyncio task.
+Not part of public API, use `django_joblog.get_current_joblogger()`.
+"""
+from __future__ import unicode_literals
+
+try:
+    import contextvars
+except ImportError:  # python < 3.7
+    contextvars = None
+
+
+if contextvars is not None:
+
+    _current = contextvars.ContextVar("django_joblog_current", default=None)
+
+    def get_current_joblogger():
+        """
+        Returns the JobLogger of the innermost active `with JobLogger(...)` block
+        in the current thread or asyncio task, or None
+        """
+        return _current.get()
+
+    def set_current_joblogger(joblog):
+        """
+        :return: token for `reset_current_joblogger`
+        """
+        return _current.set(joblog)
+
+    def reset_current_joblogger(token):
+        try:
+            _current.reset(token)
+        except ValueError:
+            # token was created in another context, e.g. the job was entered in a different thread
+            pass
+
+else:
+    import threading
+
+    _local = threading.local()
+
+    def get_current_joblogger():
+        """
+        Returns the JobLogger of the innermost active `with JobLogger(...)` block
+        in the current thread, or None
+        """
+        return getattr(_local, "joblog", None)
+
+    def set_current_joblogger(joblog):
+        token = get_current_joblogger()
+        _local.joblog = joblog
+        return token
+
+    def reset_current_joblogger(token):
+        _local.joblog = token
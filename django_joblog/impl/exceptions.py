@@ -5,3 +5,10 @@ class JobIsAlreadyRunningError(BaseException):
     Error thrown, if a job with the same name is already running
     """
     pass
+
+
+class JobCoalescedError(JobIsAlreadyRunningError):
+    """
+    Error thrown, if a job with `coalesce=True` finds another instance already waiting to run
+    """
+    pass
@@ -0,0 +1,47 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+from django.db.models import Q
+
+
+def iter_keyset(qset, fields, chunk_size=1000, after=None, descending=False):
+    """
+    Iterates a JobLogModel queryset in `(date_started, pk)` order, one bounded query per chunk.
+    Not part of public API.
+
+    Memory usage is constant with respect to the size of the table,
+    and each chunk query can use the `date_started` index instead of an OFFSET scan.
+
+    :param qset: QuerySet, filtered but not sliced
+    :param fields: sequence of str, field names passed to `values_list`
+    :param chunk_size: int, number of rows fetched per query
+    :param after: tuple of (datetime, int), optional keyset position, only rows after it are yielded
+    :param descending: bool, iterate newest first, `after` is then interpreted as "before"
+    :return: generator of tuples, the requested fields followed by date_started and pk
+    """
+    fields = tuple(fields) + ("date_started", "pk")
+    if descending:
+        qset = qset.order_by("-date_started", "-pk")
+    else:
+        qset = qset.order_by("date_started", "pk")
+
+    while True:
+        chunk_qset = qset
+        if after is not None:
+            if descending:
+                chunk_qset = chunk_qset.filter(
+                    Q(date_started__lt=after[0]) | Q(date_started=after[0], pk__lt=after[1])
+                )
+            else:
+                chunk_qset = chunk_qset.filter(
+                    Q(date_started__gt=after[0]) | Q(date_started=after[0], pk__gt=after[1])
+                )
+
+        num_rows = 0
+        for row in chunk_qset.values_list(*fields)[:chunk_size].iterator(chunk_size=chunk_size):
+            num_rows += 1
+            after = row[-2:]
+            yield row
+
+        if num_rows < chunk_size:
+            break
@@ -0,0 +1,100 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import calendar
+
+from django.core.cache import caches
+from django.db.models import Count
+
+from .Config import get_config
+
+
+CACHE_KEY = "django_joblog.metrics"
+
+
+def get_metrics_text():
+    """
+    Returns the job metrics in Prometheus text format, from cache if possible.
+    Not part of public API.
+    :return: str
+    """
+    config = get_config()
+    cache = caches[config.metrics_cache]
+    text = cache.get(CACHE_KEY)
+    if text is None:
+        text = render_metrics()
+        cache.set(CACHE_KEY, text, config.metrics_cache_seconds)
+
+    from ..instrumentation import get_sink, CounterSink
+    sink = get_sink(CounterSink)
+    if sink is not None:
+        text += sink.render_prometheus()
+
+    return text
+
+
+def render_metrics():
+    """
+    Queries the running jobs and the per-name statistics and renders them in Prometheus text format.
+    Both queries are independent of the size of the job history.
+    :return: str
+    """
+    from django_joblog.models import JobLogModel, JobLogStatsModel, JobLogStates, read_db_alias
+
+    running = dict(
+        JobLogModel.objects.using(read_db_alias())
+        .filter(state=JobLogStates.running.name)
+        .values_list("name")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    stats = {
+        s["name"]: s
+        for s in JobLogStatsModel.objects.using(read_db_alias()).values(
+            "name", "date_last_success", "last_duration", "num_finished", "num_errors", "num_vanished",
+        )
+    }
+    names = sorted(set(running) | set(stats))
+
+    lines = []
+
+    def _metric(metric_name, type, help, values):
+        lines.append("# HELP %s %s" % (metric_name, help))
+        lines.append("# TYPE %s %s" % (metric_name, type))
+        for name, value in values:
+            if value is not None:
+                lines.append('%s{name="%s"} %s' % (metric_name, _escape_label(name), value))
+
+    _metric(
+        "joblog_running_jobs", "gauge", "Number of currently running jobs",
+        [(name, running.get(name, 0)) for name in names]
+    )
+    _metric(
+        "joblog_last_success_timestamp_seconds", "gauge", "Time of the last successfully finished job",
+        [(name, _timestamp(stats[name]["date_last_success"])) for name in names if name in stats]
+    )
+    _metric(
+        "joblog_last_duration_seconds", "gauge", "Duration of the last successfully finished job",
+        [(name, stats[name]["last_duration"]) for name in names if name in stats]
+    )
+    for field, metric_name, help in (
+            ("num_finished", "joblog_finished_total", "Number of successfully finished jobs"),
+            ("num_errors", "joblog_errors_total", "Number of jobs that ended with an error"),
+            ("num_vanished", "joblog_vanished_total", "Number of jobs that vanished without notice"),
+    ):
+        _metric(
+            metric_name, "counter", help,
+            [(name, stats[name][field]) for name in names if name in stats]
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _timestamp(date):
+    if date is None:
+        return None
+    return calendar.timegm(date.utctimetuple()) + date.microsecond / 1000000.
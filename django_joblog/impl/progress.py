@@ -0,0 +1,87 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import time
+import datetime
+
+from django.utils import timezone
+
+
+class ProgressMeter(object):
+    """
+    Keeps the current progress of a job and derives the rate and the estimated end.
+    The rate is the average since the first report, or since the last report with
+    a smaller `done` value, e.g. when a job restarts counting.
+    Not part of public API.
+    """
+    def __init__(self):
+        self._start = None
+        self.done = None
+        self.total = None
+        self.rate = None
+        self.eta = None
+
+    def set(self, done, total=None):
+        """
+        :param done: int, number of processed items
+        :param total: int, optional number of all items
+        """
+        now = time.time()
+        if self._start is None or done < self._start[1]:
+            self._start = (now, done)
+        start_time, start_done = self._start
+
+        self.done = done
+        self.total = total
+        if now > start_time:
+            self.rate = float(done - start_done) / (now - start_time)
+        else:
+            self.rate = None
+
+        self.eta = None
+        if self.rate and total is not None:
+            self.eta = timezone.now() + datetime.timedelta(seconds=max(0, total - done) / self.rate)
+
+    def as_model_values(self):
+        """
+        :return: dict of JobLogModel field names and values
+        """
+        return {
+            "progress_done": self.done,
+            "progress_total": self.total,
+            "progress_rate": self.rate,
+            "progress_eta": self.eta,
+        }
+
+
+def get_percent(done, total):
+    """
+    :return: float between 0 and 100 or None if `total` is unknown
+    """
+    if done is None or not total:
+        return None
+    return max(0., min(100., 100. * done / total))
+
+
+def format_progress(done, total=None, rate=None, eta=None, bar_width=0):
+    """
+    Returns the progress as text, e.g. "[#####     ] 500/1000 (50.0%), 12.3/s, eta 2019-11-20 12:10:00"
+    :param bar_width: int, number of characters of the bar, 0 for no bar
+    :return: str
+    """
+    if done is None:
+        return ""
+    percent = get_percent(done, total)
+    text = "%s" % done
+    if total is not None:
+        text += "/%s" % total
+    if percent is not None:
+        text += " (%.1f%%)" % percent
+        if bar_width:
+            filled = int(round(bar_width * percent / 100.))
+            text = "[%s%s] %s" % ("#" * filled, " " * (bar_width - filled), text)
+    if rate is not None:
+        text += ", %.1f/s" % rate
+    if eta is not None:
+        text += ", eta %s" % (timezone.localtime(eta) if timezone.is_aware(eta) else eta).strftime("%Y-%m-%d %H:%M:%S")
+    return text
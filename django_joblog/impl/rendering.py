@@ -0,0 +1,129 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import re
+
+from django.core.cache import caches
+from django.db.models.functions import Length, Substr
+from django.utils.html import mark_safe, escape
+
+from .Config import get_config
+
+
+# Number of lines of one page in the admin log viewer
+PAGE_LINES = 500
+
+# whitespace at the beginning of a line that is followed by text
+_LEADING_WHITESPACE = re.compile(r"^[^\S\n]+(?=\S)", re.M)
+
+_NOWRAP_START = '<span style="white-space: nowrap">'
+_NOWRAP_END = '</span>'
+
+
+def render_lines(text, wrap_lines=True):
+    """
+    Returns the text as html with line breaks, keeping leading whitespace.
+    The whole text is escaped and rewritten in one pass each.
+    Not part of public API.
+    :param text: str or None
+    :param wrap_lines: bool, if False, lines are not wrapped by the browser
+    :return: SafeText
+    """
+    if not text:
+        return "-"
+    if wrap_lines:
+        return mark_safe(_render(text).replace("\n", "<br>"))
+    return mark_safe(
+        _NOWRAP_START + _render(text).replace("\n", _NOWRAP_END + "<br>" + _NOWRAP_START) + _NOWRAP_END
+    )
+
+
+def get_page(pk, field, page, model=None):
+    """
+    Returns one page of rendered lines of a job's log or error text.
+
+    Pages of ended jobs are cached, keyed by pk, end date and the length of the text, which
+    are read without the text. The first page request of an ended job reads the whole text once
+    and caches the character offsets of all pages, further pages only read their range of the text.
+    Running jobs read the whole text on each request.
+
+    Not part of public API.
+    :param pk: int, primary key of the JobLogModel
+    :param field: str, "log_text" or "error_text"
+    :param page: int, zero-based page index
+    :param model: JobLogModel (the default) or JobLogArchiveModel
+    :return: dict or None if the job does not exist
+        {"total": int, "page": int, "page_lines": int, "lines": list of html str}
+    """
+    from django_joblog.models import JobLogModel, JobLogStates, read_db_alias
+
+    model = model or JobLogModel
+    qset = model.objects.using(read_db_alias()).filter(pk=pk)
+    row = qset.annotate(text_length=Length(field)).values_list("state", "date_ended", "text_length").first()
+    if row is None:
+        return None
+    state, date_ended, length = row
+
+    if state in (JobLogStates.running.name, JobLogStates.waiting.name):
+        text = qset.values_list(field, flat=True).first() or ""
+        lines = text.split("\n") if text else []
+        return _page_data(len(lines), page, lines[page * PAGE_LINES:(page + 1) * PAGE_LINES])
+
+    config = get_config()
+    cache = caches[config.render_cache]
+    cache_key = "django_joblog.page.%s.%s.%s.%s.%s" % (
+        model._meta.model_name, pk, field, date_ended.timestamp() if date_ended else "-", length or 0
+    )
+    data = cache.get("%s.%s" % (cache_key, page))
+    if data is not None:
+        return data
+
+    index = cache.get(cache_key + ".index")
+    if index is None:
+        text = qset.values_list(field, flat=True).first() or ""
+        lines = text.split("\n") if text else []
+        index = {"total": len(lines), "offsets": _page_offsets(lines)}
+        cache.set(cache_key + ".index", index, config.render_cache_seconds)
+        chunk = lines[page * PAGE_LINES:(page + 1) * PAGE_LINES]
+    elif 0 <= page < len(index["offsets"]):
+        offsets = index["offsets"]
+        start = offsets[page]
+        # without the line break before the next page
+        end = offsets[page + 1] - 1 if page + 1 < len(offsets) else length
+        text = qset.annotate(
+            text_page=Substr(field, start + 1, max(0, end - start))
+        ).values_list("text_page", flat=True).first() or ""
+        chunk = text.split("\n")
+    else:
+        chunk = []
+
+    data = _page_data(index["total"], page, chunk)
+    cache.set("%s.%s" % (cache_key, page), data, config.render_cache_seconds)
+    return data
+
+
+def _page_data(total, page, chunk):
+    return {
+        "total": total,
+        "page": page,
+        "page_lines": PAGE_LINES,
+        "lines": _render("\n".join(chunk)).split("\n") if chunk else [],
+    }
+
+
+def _page_offsets(lines):
+    """
+    Returns the character offset of the first line of each page
+    """
+    offsets = [0]
+    for start in range(PAGE_LINES, len(lines), PAGE_LINES):
+        offsets.append(offsets[-1] + sum(len(line) + 1 for line in lines[start - PAGE_LINES:start]))
+    return offsets
+
+
+def _render(text):
+    return _LEADING_WHITESPACE.sub(_replace_whitespace, escape(text))
+
+
+def _replace_whitespace(match):
+    return match.group(0).replace(" ", "&nbsp;").replace("\t", "&nbsp;&nbsp;")
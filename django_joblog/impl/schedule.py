@@ -0,0 +1,129 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import re
+import datetime
+
+from django.utils import timezone
+
+
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# (minimum, maximum) of the cron fields minute, hour, day of month, month, day of week
+CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+_RE_INTERVAL = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd])$")
+
+
+class Schedule(object):
+    """
+    The expected cadence of a job, from JOBLOG_CONFIG["schedules"].
+    Not part of public API.
+
+    The spec is either
+        a number of seconds, e.g. 3600
+        an interval string, e.g. "90s", "15m", "1.5h", "1d"
+        a cron-like string with the five fields minute, hour, day of month, month and day of week,
+        each `*`, a number, a range `a-b` or a list `a,b`, optionally with a step `/n`,
+        e.g. "30 2 * * *" or "*/15 8-18 * * 1-5". Cron times are in the current timezone.
+    """
+    def __init__(self, spec):
+        self.spec = spec
+        self.interval = None
+        self.fields = None
+
+        if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+            self.interval = datetime.timedelta(seconds=spec)
+        elif isinstance(spec, str):
+            match = _RE_INTERVAL.match(spec.strip())
+            if match:
+                self.interval = datetime.timedelta(seconds=float(match.group(1)) * INTERVAL_UNITS[match.group(2)])
+            else:
+                self.fields = self._parse_cron(spec)
+
+        if self.interval is None and self.fields is None:
+            raise ValueError("Invalid schedule %r" % (spec, ))
+        if self.interval is not None and self.interval.total_seconds() <= 0:
+            raise ValueError("Invalid schedule %r, the interval must be positive" % (spec, ))
+
+    def __str__(self):
+        return "%s" % self.spec
+
+    def get_deadline(self, now, grace=datetime.timedelta()):
+        """
+        Returns the time since which a job must have started to be on schedule.
+        For intervals that is one interval (and the grace) ago,
+        for cron strings the last scheduled time that is at least `grace` ago.
+        :param now: datetime
+        :param grace: timedelta, allowed delay of a start
+        :return: datetime or None if the cron string never matched in the last years
+        """
+        if self.interval is not None:
+            return now - self.interval - grace
+        return self.get_previous(now - grace)
+
+    def get_previous(self, before):
+        """
+        Returns the last time matching the cron fields at or before `before`
+        :param before: datetime
+        :return: datetime or None
+        """
+        minutes, hours, days, months, weekdays = self.fields
+        day_restricted, weekday_restricted = self._restricted
+        aware = timezone.is_aware(before)
+        local = timezone.localtime(before) if aware else before
+        day = local.date()
+
+        # five years cover every combination of day of month and day of week
+        for i in range(5 * 366):
+            if day.month in months:
+                day_match = day.day in days
+                weekday_match = (day.weekday() + 1) % 7 in weekdays
+                if day_restricted and weekday_restricted:
+                    matches = day_match or weekday_match
+                else:
+                    matches = day_match and weekday_match
+                if matches:
+                    for hour in sorted(hours, reverse=True):
+                        for minute in sorted(minutes, reverse=True):
+                            date = datetime.datetime(day.year, day.month, day.day, hour, minute)
+                            if i == 0 and date > local.replace(tzinfo=None):
+                                continue
+                            if not aware:
+                                return date
+                            try:
+                                return timezone.make_aware(date)
+                            except Exception:
+                                # the local time does not exist or is ambiguous at a daylight saving switch
+                                continue
+            day -= datetime.timedelta(days=1)
+
+    def _parse_cron(self, spec):
+        parts = spec.split()
+        if len(parts) != 5:
+            return None
+        fields = []
+        for part, (minimum, maximum) in zip(parts, CRON_RANGES):
+            values = set()
+            for item in part.split(","):
+                match = re.match(r"^(\*|\d+(?:-\d+)?)(?:/(\d+))?$", item)
+                if not match:
+                    raise ValueError("Invalid schedule %r, can not parse %r" % (spec, item))
+                if match.group(1) == "*":
+                    first, last = minimum, maximum
+                elif "-" in match.group(1):
+                    first, last = (int(v) for v in match.group(1).split("-"))
+                else:
+                    first = last = int(match.group(1))
+                step = int(match.group(2) or 1)
+                if first < minimum or last > maximum or first > last or step < 1:
+                    raise ValueError("Invalid schedule %r, %r is out of range" % (spec, item))
+                values.update(range(first, last + 1, step))
+            fields.append(values)
+
+        # sunday is 0 and 7
+        if 7 in fields[4]:
+            fields[4].add(0)
+        # like cron, if both days are restricted, either one must match
+        self._restricted = (parts[2] != "*", parts[4] != "*")
+        return fields
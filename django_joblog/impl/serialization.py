@@ -0,0 +1,86 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+# field names of JobLogModel in export order
+EXPORT_FIELDS = (
+    "id", "name", "count", "date_started", "date_ended", "duration", "state", "is_slow",
+    "parent_id", "progress_done", "progress_total", "progress_rate", "progress_eta",
+    "log_text", "error_text",
+)
+
+TEXT_FIELDS = ("log_text", "error_text")
+
+
+def to_export_value(value):
+    """
+    Converts a model value to a JSON/CSV compatible value.
+    Datetimes become ISO strings and durations become seconds.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    return value
+
+
+def row_to_dict(fields, row):
+    """
+    :param fields: sequence of str
+    :param row: sequence of values in `fields` order
+    :return: dict
+    """
+    return {
+        field: to_export_value(value)
+        for field, value in zip(fields, row)
+    }
+
+
+def parse_export_datetime(value):
+    """
+    Parses an ISO date or datetime string, returns an aware datetime or None
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime.datetime):
+        date = value
+    else:
+        date = parse_datetime(value)
+        if date is None:
+            date = datetime.datetime.strptime(value, "%Y-%m-%d")
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date)
+    return date
+
+
+def dict_to_model_kwargs(data):
+    """
+    Converts an exported dict back to JobLogModel constructor arguments.
+    Unknown keys are ignored.
+    :param data: dict
+    :return: dict
+    """
+    kwargs = dict()
+    for field in EXPORT_FIELDS:
+        if field not in data:
+            continue
+        value = data[field]
+        if field in ("date_started", "date_ended", "progress_eta"):
+            value = parse_export_datetime(value)
+        elif field == "duration":
+            value = None if value in (None, "") else datetime.timedelta(seconds=float(value))
+        elif field == "is_slow":
+            value = value in (True, 1, "1", "True", "true")
+        elif field in TEXT_FIELDS:
+            value = value or None
+        elif field in ("parent_id", "progress_done", "progress_total"):
+            value = None if value in (None, "") else int(value)
+        elif field == "progress_rate":
+            value = None if value in (None, "") else float(value)
+        kwargs[field] = value
+    return kwargs
@@ -0,0 +1,90 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import time
+
+from django.db.models import Value
+from django.db.models.functions import Length, Substr, Coalesce
+
+
+def get_tail(pk, log_offset=0, error_offset=0):
+    """
+    Returns the log and error text of job `pk` after the given character offsets.
+    Only the new part of the texts is fetched from the database.
+    Not part of public API.
+
+    :param pk: int, primary key of the JobLogModel
+    :param log_offset: int, number of characters of log_text the caller already has
+    :param error_offset: int, number of characters of error_text the caller already has
+    :return: dict or None if the job does not exist
+        {
+            "id": int, "name": str, "state": str, "running": bool, "duration": float or None,
+            "log": {"offset": int, "lines": list of str},
+            "error": {"offset": int, "lines": list of str},
+        }
+        where "offset" is the offset to pass on the next call
+    """
+    from django_joblog.models import JobLogModel, JobLogArchiveModel, JobLogStates, read_db_alias
+
+    for model in (JobLogModel, JobLogArchiveModel):
+        row = model.objects.using(read_db_alias()).filter(pk=pk).annotate(
+            log_length=Coalesce(Length("log_text"), Value(0)),
+            error_length=Coalesce(Length("error_text"), Value(0)),
+            log_tail=Substr("log_text", log_offset + 1),
+            error_tail=Substr("error_text", error_offset + 1),
+        ).values(
+            "pk", "name", "state", "duration", "log_length", "error_length", "log_tail", "error_tail",
+        ).first()
+        if row is not None:
+            break
+
+    if row is None:
+        return None
+
+    if row["log_length"] < log_offset or row["error_length"] < error_offset:
+        # text is shorter than the offset, start from the beginning
+        return get_tail(
+            pk,
+            0 if row["log_length"] < log_offset else log_offset,
+            0 if row["error_length"] < error_offset else error_offset,
+        )
+
+    return {
+        "id": row["pk"],
+        "name": row["name"],
+        "state": row["state"],
+        "running": row["state"] in (JobLogStates.running.name, JobLogStates.waiting.name),
+        "duration": row["duration"].total_seconds() if row["duration"] is not None else None,
+        "log": {"offset": row["log_length"], "lines": _split_lines(row["log_tail"], log_offset)},
+        "error": {"offset": row["error_length"], "lines": _split_lines(row["error_tail"], error_offset)},
+    }
+
+
+def poll_tail(pk, log_offset=0, error_offset=0, timeout=0., max_interval=2.):
+    """
+    Like `get_tail` but waits up to `timeout` seconds for new lines while the job is running.
+    The polling interval starts at a quarter second and doubles up to `max_interval` while nothing happens.
+    Not part of public API.
+    :return: dict or None, see `get_tail`
+    """
+    deadline = time.time() + timeout
+    interval = min(.25, max_interval)
+    while True:
+        tail = get_tail(pk, log_offset, error_offset)
+        if tail is None or not tail["running"] or tail["log"]["lines"] or tail["error"]["lines"]:
+            return tail
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return tail
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+def _split_lines(text, offset):
+    if not text:
+        return []
+    # lines are joined with newlines, so a tail after existing lines starts with one
+    if offset and text.startswith("\n"):
+        text = text[1:]
+    return text.split("\n")
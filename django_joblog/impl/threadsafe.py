@@ -0,0 +1,82 @@
+# encoding=utf-8
+"""
+Containers for JobLoggers that are shared between threads.
+Not part of public API.
+
+Both mimic the part of the list interface that JobLoggerBase uses,
+so the single-threaded logger can keep using plain lists.
+"""
+from __future__ import unicode_literals
+
+import heapq
+import itertools
+import threading
+
+
+class ThreadSafeLines(object):
+    """
+    Append-only list of lines with one buffer per writing thread.
+
+    Appending only touches the current thread's buffer. Each line is tagged with
+    a sequence number from a shared counter, so iterating merges all buffers
+    back into the order of the `append` calls.
+    """
+    def __init__(self, counter=None):
+        """
+        :param counter: optional itertools.count instance, shared between several
+            ThreadSafeLines to get a common ordering
+        """
+        self._counter = counter or itertools.count()
+        self._local = threading.local()
+        self._buffers = []
+        self._buffers_lock = threading.Lock()
+
+    def _get_buffer(self):
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = []
+            with self._buffers_lock:
+                self._buffers.append(buffer)
+            return buffer
+
+    def append(self, line):
+        # next() on itertools.count is atomic in CPython
+        self._get_buffer().append((next(self._counter), line))
+
+    def __iter__(self):
+        with self._buffers_lock:
+            buffers = [list(b) for b in self._buffers]
+        for seq, line in heapq.merge(*buffers):
+            yield line
+
+    def __len__(self):
+        with self._buffers_lock:
+            return sum(len(b) for b in self._buffers)
+
+
+class ThreadLocalList(object):
+    """
+    A list that has separate contents in each thread
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def _get_list(self):
+        try:
+            return self._local.list
+        except AttributeError:
+            lst = self._local.list = []
+            return lst
+
+    def append(self, item):
+        self._get_list().append(item)
+
+    def pop(self):
+        return self._get_list().pop()
+
+    def __iter__(self):
+        return iter(list(self._get_list()))
+
+    def __len__(self):
+        return len(self._get_list())
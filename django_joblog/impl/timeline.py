@@ -0,0 +1,240 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import datetime
+
+from django.db.models import Q, Case, When, Value, Count, Sum, Max, IntegerField
+from django.utils import timezone
+
+
+# A name with more runs than this in the window is drawn as this number of bins
+TIMELINE_BINS = 300
+
+# Possible distances of the time axis ticks in seconds
+TICK_STEPS = (
+    60, 5 * 60, 15 * 60, 30 * 60,
+    3600, 3 * 3600, 6 * 3600, 12 * 3600,
+    86400, 2 * 86400, 7 * 86400, 14 * 86400, 28 * 86400,
+)
+
+# States of a bin with several runs, most important first
+STATE_PRIORITY = ("error", "vanished", "blocked", "running", "waiting", "finished")
+
+
+def get_timeline(start, end, names=None, model=None, max_bars=TIMELINE_BINS):
+    """
+    Returns the job runs that overlap the time window as bars on a timeline.
+
+    The scan is one range on date_started, from the longest duration of the runs that end in the window
+    to the window's end, and only loads scalar columns. Active runs that started earlier are loaded
+    with a query on the state. With JOBLOG_CONFIG["ping"], active runs without a recent update are
+    drawn until their last update as 'vanished'.
+    Runs shorter than a bin are counted per name, bin and state in the database.
+    Names with more than `max_bars` runs in the window are binned, each bin becomes one bar
+    with the number of runs, the fraction of time that a run was active and the most important state.
+    The other runs are loaded one by one.
+
+    Not part of public API.
+
+    :param start: datetime
+    :param end: datetime
+    :param names: optional sequence of str, only include these job names
+    :param model: JobLogModel (the default) or JobLogArchiveModel
+    :param max_bars: int
+    :return: dict with "start", "end", "ticks" and "lanes", where each lane is a dict
+        with "name", "count", "binned" and a list of "bars" as dicts with
+        "left", "width" (percent of the window), "state", "count", "busy" and "pk" (of single runs)
+    """
+    from django_joblog.models import JobLogModel, JobLogStates, read_db_alias
+    from .Config import get_config
+
+    model = model or JobLogModel
+    manager = model.objects.using(read_db_alias())
+    if names:
+        manager = manager.filter(name__in=names)
+    now = timezone.now()
+    window = max(1., (end - start).total_seconds())
+    bin_width = window / max_bars
+    active_states = (JobLogStates.running.name, JobLogStates.waiting.name)
+    config = get_config()
+    stale_after = config.ping_interval + 1 if config.ping else None
+
+    def _run_end(state, date_started, date_ended, duration):
+        if date_ended:
+            return state, date_ended
+        if state not in active_states:
+            return state, date_started
+        last_update = date_started + (duration or datetime.timedelta())
+        if stale_after is not None and (now - last_update).total_seconds() > stale_after:
+            return JobLogStates.vanished.name, last_update
+        return state, now
+
+    # an ended run that overlaps the window started at most the longest duration of those runs before it
+    lower = start - (
+        manager.filter(date_ended__gte=start).aggregate(max_duration=Max("duration"))["max_duration"]
+        or datetime.timedelta()
+    )
+    qset = manager.filter(date_started__gte=lower, date_started__lt=end)
+
+    # ended runs inside the window that are not longer than a bin
+    short_runs = Q(date_started__gte=start, date_ended__isnull=False,
+                   duration__lte=datetime.timedelta(seconds=bin_width))
+
+    bins = dict()
+    for name, index, state, num, busy in qset.filter(short_runs).annotate(
+            bin=_bin_expression(start, bin_width, 0, max_bars - 1)
+    ).order_by().values("name", "bin", "state").annotate(
+            num=Count("pk"), busy=Sum("duration")
+    ).values_list("name", "bin", "state", "num", "busy"):
+        bins.setdefault(name, []).append((index, state, num, busy.total_seconds() if busy else 0.))
+
+    runs = dict()
+    other_runs = qset.exclude(short_runs).values_list("pk", "name", "state", "date_started", "date_ended", "duration")
+    older_active_runs = manager.filter(state__in=active_states, date_started__lt=lower).values_list(
+        "pk", "name", "state", "date_started", "date_ended", "duration")
+    for rows in (other_runs, older_active_runs):
+        for pk, name, state, date_started, date_ended, duration in rows:
+            state, date_ended = _run_end(state, date_started, date_ended, duration)
+            if date_ended >= start:
+                runs.setdefault(name, []).append(_run(pk, state, date_started, date_ended, start, window))
+
+    # names that are not binned get a bar for each short run as well
+    unbinned = [
+        name for name, lane_bins in bins.items()
+        if len(runs.get(name, [])) + sum(num for index, state, num, busy in lane_bins) <= max_bars
+    ]
+    if unbinned:
+        for pk, name, state, date_started, date_ended in qset.filter(short_runs, name__in=unbinned).values_list(
+                "pk", "name", "state", "date_started", "date_ended"):
+            runs.setdefault(name, []).append(_run(pk, state, date_started, date_ended, start, window))
+        for name in unbinned:
+            del bins[name]
+
+    lanes = []
+    for name in sorted(set(runs) | set(bins)):
+        lane_runs = sorted(runs.get(name, []), key=lambda run: (run[2], run[0]))
+        lane_bins = bins.get(name)
+        lanes.append({
+            "name": name,
+            "count": len(lane_runs) + sum(num for index, state, num, busy in lane_bins or ()),
+            "binned": lane_bins is not None,
+            "bars": _binned_bars(lane_runs, lane_bins, window, max_bars) if lane_bins is not None
+            else _run_bars(lane_runs, window),
+        })
+
+    return {
+        "start": start,
+        "end": end,
+        "ticks": _ticks(start, end),
+        "lanes": lanes,
+    }
+
+
+def _run(pk, state, date_started, date_ended, start, window):
+    return (
+        pk, state,
+        max(0., (date_started - start).total_seconds()),
+        min(window, (date_ended - start).total_seconds()),
+    )
+
+
+def _bin_expression(start, bin_width, first, last):
+    """
+    Returns the index of the bin of date_started as CASE expression,
+    nested as a binary search over the bins `first` to `last`
+    """
+    if first == last:
+        return Value(first, output_field=IntegerField())
+    middle = (first + last + 1) // 2
+    return Case(
+        When(
+            date_started__lt=start + datetime.timedelta(seconds=bin_width * middle),
+            then=_bin_expression(start, bin_width, first, middle - 1),
+        ),
+        default=_bin_expression(start, bin_width, middle, last),
+        output_field=IntegerField(),
+    )
+
+
+def _run_bars(runs, window):
+    return [
+        {
+            "left": round(100. * run_start / window, 3),
+            "width": round(100. * max(0., run_end - run_start) / window, 3),
+            "state": state,
+            "count": 1,
+            "busy": 1.,
+            "pk": pk,
+        }
+        for pk, state, run_start, run_end in runs
+    ]
+
+
+def _binned_bars(runs, counted, window, num_bins):
+    """
+    :param runs: list of (pk, state, start, end) tuples, in seconds since the window start
+    :param counted: list of (bin, state, count, busy seconds) tuples of the runs counted by the database
+    """
+    bin_width = window / num_bins
+    counts = [0] * num_bins
+    busy = [0.] * num_bins
+    states = [len(STATE_PRIORITY)] * num_bins
+
+    def _priority(state):
+        return STATE_PRIORITY.index(state) if state in STATE_PRIORITY else len(STATE_PRIORITY)
+
+    for index, state, num, seconds in counted:
+        counts[index] += num
+        busy[index] += seconds
+        states[index] = min(states[index], _priority(state))
+
+    for pk, state, run_start, run_end in runs:
+        priority = _priority(state)
+        first = min(num_bins - 1, int(run_start / bin_width))
+        last = max(first, min(num_bins - 1, int(run_end / bin_width)))
+        counts[first] += 1
+        for i in range(first, last + 1):
+            bin_start = i * bin_width
+            busy[i] += max(0., min(run_end, bin_start + bin_width) - max(run_start, bin_start))
+            states[i] = min(states[i], priority)
+
+    bars = []
+    for i in range(num_bins):
+        if states[i] >= len(STATE_PRIORITY):
+            continue
+        bars.append({
+            "left": round(100. * i / num_bins, 3),
+            "width": round(100. / num_bins, 3),
+            "state": STATE_PRIORITY[states[i]],
+            "count": counts[i],
+            "busy": round(min(1., busy[i] / bin_width), 3),
+            "pk": None,
+        })
+    return bars
+
+
+def _ticks(start, end, max_ticks=12):
+    """
+    Returns a list of (percent, datetime) tuples for the time axis
+    """
+    window = max(1., (end - start).total_seconds())
+    step = TICK_STEPS[-1]
+    for s in TICK_STEPS:
+        if window / s <= max_ticks:
+            step = s
+            break
+
+    # align ticks to multiples of the step in local time
+    if timezone.is_aware(start):
+        epoch = (start - datetime.datetime(1970, 1, 1, tzinfo=timezone.utc)).total_seconds()
+        epoch += timezone.localtime(start).utcoffset().total_seconds()
+    else:
+        epoch = (start - datetime.datetime(1970, 1, 1)).total_seconds()
+    first = (step - epoch % step) % step
+
+    ticks = []
+    seconds = first
+    while seconds < window:
+        ticks.append((round(100. * seconds / window, 3), start + datetime.timedelta(seconds=seconds)))
+        seconds += step
+    return ticks
@@ -0,0 +1,201 @@
+# encoding=utf-8
+"""
+Timing of the library's own hot paths.
+
+Enable by listing sink classes in the settings:
+
+    JOBLOG_CONFIG = {
+        "instrumentation": ["django_joblog.instrumentation.CounterSink"],
+    }
+
+Without configured sinks, an instrumented function costs one extra function call.
+"""
+from __future__ import unicode_literals
+
+import time
+import socket
+import threading
+import functools
+
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+
+_timer = getattr(time, "perf_counter", time.time)
+
+# Upper bounds of the latency histogram buckets in seconds
+HISTOGRAM_BUCKETS = (.0001, .0005, .001, .005, .01, .05, .1, .5, 1., 5., 10.)
+
+# list of sink instances, None if not yet loaded from settings
+_sinks = None
+_sinks_lock = threading.Lock()
+
+
+def get_sinks():
+    """
+    Returns the list of configured sink instances
+    :return: list
+    """
+    global _sinks
+    sinks = _sinks
+    if sinks is None:
+        with _sinks_lock:
+            if _sinks is None:
+                from .impl.Config import get_config
+                _sinks = [import_string(path)() for path in get_config().instrumentation]
+            sinks = _sinks
+    return sinks
+
+
+def get_sink(sink_class):
+    """
+    Returns the first configured sink of the given class or None
+    """
+    for sink in get_sinks():
+        if isinstance(sink, sink_class):
+            return sink
+
+
+def set_sinks(sinks):
+    """
+    Replaces the configured sinks, e.g. for tests.
+    Pass None to reload them from JOBLOG_CONFIG on next use.
+    :param sinks: list of sink instances or None
+    """
+    global _sinks
+    _sinks = sinks
+
+
+def record(operation, seconds):
+    """
+    Reports one timed operation to all sinks
+    :param operation: str
+    :param seconds: float
+    """
+    for sink in get_sinks():
+        sink.record(operation, seconds)
+
+
+def instrumented(operation):
+    """
+    Decorator that reports the call duration of the decorated function as `operation`
+    """
+    def _decorator(func):
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            sinks = _sinks
+            if sinks is None:
+                sinks = get_sinks()
+            if not sinks:
+                return func(*args, **kwargs)
+
+            start = _timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = _timer() - start
+                for sink in sinks:
+                    sink.record(operation, seconds)
+        return _wrapper
+    return _decorator
+
+
+def _on_setting_changed(setting, **kwargs):
+    if setting == "JOBLOG_CONFIG":
+        set_sinks(None)
+
+
+setting_changed.connect(_on_setting_changed)
+
+
+class CounterSink(object):
+    """
+    Keeps call counts and latency histograms in process memory
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = dict()
+
+    def record(self, operation, seconds):
+        with self._lock:
+            entry = self._operations.get(operation)
+            if entry is None:
+                entry = self._operations[operation] = {
+                    "count": 0,
+                    "sum": 0.,
+                    "buckets": [0] * len(HISTOGRAM_BUCKETS),
+                }
+            entry["count"] += 1
+            entry["sum"] += seconds
+            for i, bound in enumerate(HISTOGRAM_BUCKETS):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+                    break
+
+    def reset(self):
+        with self._lock:
+            self._operations = dict()
+
+    def snapshot(self):
+        """
+        Returns a copy of all counters
+        :return: dict of operation -> {"count": int, "sum": float, "buckets": list of int}
+            where buckets are non-cumulative counts per HISTOGRAM_BUCKETS bound
+        """
+        with self._lock:
+            return {
+                operation: {
+                    "count": entry["count"],
+                    "sum": entry["sum"],
+                    "buckets": list(entry["buckets"]),
+                }
+                for operation, entry in self._operations.items()
+            }
+
+    def render_prometheus(self, metric_name="joblog_operation_seconds"):
+        """
+        Returns the counters as histogram in the Prometheus text exposition format
+        :return: str
+        """
+        lines = [
+            "# HELP %s Time spent inside django_joblog operations" % metric_name,
+            "# TYPE %s histogram" % metric_name,
+        ]
+        for operation, entry in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(HISTOGRAM_BUCKETS, entry["buckets"]):
+                cumulative += count
+                lines.append('%s_bucket{operation="%s",le="%s"} %s' % (metric_name, operation, bound, cumulative))
+            lines.append('%s_bucket{operation="%s",le="+Inf"} %s' % (metric_name, operation, entry["count"]))
+            lines.append('%s_sum{operation="%s"} %s' % (metric_name, operation, entry["sum"]))
+            lines.append('%s_count{operation="%s"} %s' % (metric_name, operation, entry["count"]))
+        return "\n".join(lines) + "\n"
+
+
+class SignalSink(object):
+    """
+    Sends the `django_joblog.signals.instrumentation_event` signal for each operation
+    """
+    def record(self, operation, seconds):
+        from .signals import instrumentation_event
+        instrumentation_event.send(sender=self.__class__, operation=operation, seconds=seconds)
+
+
+class StatsdSink(object):
+    """
+    Sends timings to a StatsD server via UDP, configured with
+    JOBLOG_CONFIG["statsd_host"], ["statsd_port"] and ["statsd_prefix"]
+    """
+    def __init__(self, host=None, port=None, prefix=None):
+        from .impl.Config import get_config
+        config = get_config()
+        self.address = (host or config.statsd_host, port or config.statsd_port)
+        self.prefix = config.statsd_prefix if prefix is None else prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def record(self, operation, seconds):
+        name = "%s.%s" % (self.prefix, operation) if self.prefix else operation
+        try:
+            self._socket.sendto(("%s:%.3f|ms" % (name, seconds * 1000.)).encode("ascii"), self.address)
+        except (socket.error, OSError):
+            pass
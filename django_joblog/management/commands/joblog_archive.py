@@ -0,0 +1,26 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from django_joblog.models import JobLogArchiveModel
+
+
+class Command(BaseCommand):
+    help = "Move jobs that ended some time ago into the archive table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-d", "--days", type=float, default=30,
+                            help="Archive jobs that ended more than this number of days ago")
+        parser.add_argument("-b", "--batch-size", type=int, default=500,
+                            help="Number of jobs (with their child jobs) moved per transaction")
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative")
+        before = timezone.now() - datetime.timedelta(days=options["days"])
+        num_archived = JobLogArchiveModel.archive_jobs(before, batch_size=options["batch_size"])
+        print("%s job(s) archived" % num_archived)
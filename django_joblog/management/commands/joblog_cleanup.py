@@ -8,7 +8,8 @@ from django.utils.translation import ugettext_lazy as _
 from django.utils import timezone
 
 from django_joblog.models import JobLogModel
-from django_joblog import Config, JobLogger
+from django_joblog import JobLogger
+from django_joblog.impl.Config import get_config
 
 
 class Command(BaseCommand):
@@ -19,7 +20,7 @@ class Command(BaseCommand):
                             help="Update the database even though the JOBLOG_CONFIG has 'ping' not enabled")
 
     def handle(self, *args, **options):
-        config = Config()
+        config = get_config()
         if not config.ping:
             if not options.get("force"):
                 print("'ping' mode is not enabled in JOBLOG_CONFIG - this may alter the state of running jobs\n"
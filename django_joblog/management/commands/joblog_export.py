@@ -0,0 +1,116 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import io
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_joblog.models import JobLogModel, JobLogArchiveModel, JobLogStates, db_alias
+from django_joblog.impl.keyset import iter_keyset
+from django_joblog.impl.serialization import (
+    EXPORT_FIELDS, TEXT_FIELDS, row_to_dict, parse_export_datetime, to_export_value
+)
+
+
+class Command(BaseCommand):
+    help = "Stream job logs as JSON Lines or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-f", "--format", type=str, default="jsonl", choices=["jsonl", "csv"],
+                            help="Output format")
+        parser.add_argument("-o", "--output", type=str, default=None,
+                            help="Output file, defaults to stdout")
+        parser.add_argument("-n", "--name", nargs="+", type=str, default=[],
+                            help="Only export jobs with these names")
+        parser.add_argument("-s", "--state", nargs="+", type=str, default=[],
+                            help="Only export jobs with these states (running, finished, error, blocked, vanished)")
+        parser.add_argument("--since", type=str, default=None,
+                            help="Only export jobs started at or after this ISO date/datetime")
+        parser.add_argument("--until", type=str, default=None,
+                            help="Only export jobs started before this ISO date/datetime")
+        parser.add_argument("-w", "--watermark", type=str, default=None,
+                            help="File that stores the position of the last export. "
+                                 "Only jobs after that position are exported and the file is updated afterwards")
+        parser.add_argument("--no-text", nargs="?", type=bool, const=True, default=False,
+                            help="Do not export log and error texts")
+        parser.add_argument("--archive", nargs="?", type=bool, const=True, default=False,
+                            help="Export the archived jobs instead of the job log")
+        parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Number of rows fetched per query")
+
+    def handle(self, *args, **options):
+        fields = EXPORT_FIELDS
+        if options["no_text"]:
+            fields = tuple(f for f in fields if f not in TEXT_FIELDS)
+
+        model = JobLogArchiveModel if options["archive"] else JobLogModel
+        qset = model.objects.using(db_alias()).all()
+        if options["name"]:
+            qset = qset.filter(name__in=options["name"])
+
+        after = None
+        if options["watermark"]:
+            after = self._read_watermark(options["watermark"])
+            # Running jobs will still change, so the watermark must not pass the oldest of them,
+            # including those that do not match the state filter yet.
+            # Everything started after it is exported by a later run.
+            oldest_running = qset.filter(state__in=(JobLogStates.running.name, JobLogStates.waiting.name))\
+                .order_by("date_started").values_list("date_started", flat=True).first()
+            if oldest_running is not None:
+                qset = qset.filter(date_started__lt=oldest_running)
+
+        if options["state"]:
+            qset = qset.filter(state__in=options["state"])
+        if options["since"]:
+            qset = qset.filter(date_started__gte=parse_export_datetime(options["since"]))
+        if options["until"]:
+            qset = qset.filter(date_started__lt=parse_export_datetime(options["until"]))
+
+        if options["output"]:
+            fp = io.open(options["output"], "w", encoding="utf-8", newline="")
+        else:
+            fp = self.stdout
+
+        try:
+            writer = self._get_writer(options["format"], fields, fp)
+            position = None
+            for row in iter_keyset(qset, fields, chunk_size=options["chunk_size"], after=after):
+                writer(row[:len(fields)])
+                position = row[-2:]
+        finally:
+            if options["output"]:
+                fp.close()
+
+        if options["watermark"] and position is not None:
+            self._write_watermark(options["watermark"], position)
+
+    def _get_writer(self, format, fields, fp):
+        if format == "jsonl":
+            def _write(row):
+                fp.write(json.dumps(row_to_dict(fields, row), ensure_ascii=False) + "\n")
+        else:
+            csv_writer = csv.writer(fp, lineterminator="\n")
+            csv_writer.writerow(fields)
+
+            def _write(row):
+                csv_writer.writerow([
+                    "" if value is None else to_export_value(value)
+                    for value in row
+                ])
+        return _write
+
+    def _read_watermark(self, filename):
+        try:
+            with io.open(filename, encoding="utf-8") as fp:
+                data = json.load(fp)
+        except IOError:
+            return None
+        except ValueError as e:
+            raise CommandError("Invalid watermark file '%s': %s" % (filename, e))
+        return parse_export_datetime(data["date_started"]), data["pk"]
+
+    def _write_watermark(self, filename, position):
+        with io.open(filename, "w", encoding="utf-8") as fp:
+            fp.write(json.dumps({"date_started": to_export_value(position[0]), "pk": position[1]}))
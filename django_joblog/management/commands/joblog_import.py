@@ -0,0 +1,210 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import io
+import sys
+import json
+import random
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import transaction, connections
+from django.utils import timezone
+
+from django_joblog.models import JobLogModel, JobLogStatsModel, JobLogStates, db_alias
+from django_joblog.impl.serialization import dict_to_model_kwargs
+
+
+class Command(BaseCommand):
+    help = "Import job logs from JSON Lines (as written by joblog_export) or generate synthetic job histories"
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", nargs="?", type=str, default=None,
+                            help="JSON Lines file to import, use '-' for stdin")
+        parser.add_argument("-b", "--batch-size", type=int, default=1000,
+                            help="Number of rows inserted per query")
+        parser.add_argument("--skip-duplicates", nargs="?", type=bool, const=True, default=False,
+                            help="Skip rows whose id (or name and start date with --new-pk) already exists")
+        parser.add_argument("--new-pk", nargs="?", type=bool, const=True, default=False,
+                            help="Ignore the exported ids and let the database assign new ones")
+        parser.add_argument("--renumber", nargs="?", type=bool, const=True, default=False,
+                            help="Rewrite the 'count' of each row to continue the counts already in the database")
+        parser.add_argument("-g", "--generate", type=int, default=0,
+                            help="Instead of importing, generate this number of synthetic job runs")
+        parser.add_argument("--names", type=int, default=10,
+                            help="Number of distinct job names for --generate")
+        parser.add_argument("--days", type=float, default=365,
+                            help="Time span in days of the generated job history, ending now")
+        parser.add_argument("--seed", type=int, default=None,
+                            help="Random seed for --generate")
+
+    def handle(self, *args, **options):
+        if options["generate"]:
+            if options["input"]:
+                raise CommandError("Use either an input file or --generate")
+            rows = generate_job_history(
+                options["generate"], num_names=options["names"], days=options["days"],
+                rnd=random.Random(options["seed"]),
+            )
+            options["new_pk"] = True
+            options["renumber"] = True
+            self._import(rows, options)
+
+        elif options["input"]:
+            if options["input"] == "-":
+                self._import(self._read_jsonl(sys.stdin), options)
+            else:
+                with io.open(options["input"], encoding="utf-8") as fp:
+                    self._import(self._read_jsonl(fp), options)
+
+        else:
+            raise CommandError("Need an input file or --generate")
+
+    def _read_jsonl(self, fp):
+        for line_number, line in enumerate(fp):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield dict_to_model_kwargs(json.loads(line))
+            except ValueError as e:
+                raise CommandError("Invalid JSON in line %s: %s" % (line_number + 1, e))
+
+    def _import(self, rows, options):
+        self._counts = dict()
+        num_imported = 0
+        num_skipped = 0
+        batch = []
+        for kwargs in rows:
+            if options["new_pk"]:
+                # the parents get new ids as well
+                kwargs.pop("id", None)
+                kwargs.pop("parent_id", None)
+            batch.append(kwargs)
+            if len(batch) >= options["batch_size"]:
+                num = self._import_batch(batch, options)
+                num_imported += num
+                num_skipped += len(batch) - num
+                batch = []
+
+        if batch:
+            num = self._import_batch(batch, options)
+            num_imported += num
+            num_skipped += len(batch) - num
+
+        if not options["new_pk"] and num_imported:
+            self._reset_sequence()
+
+        print("%s job(s) imported, %s skipped" % (num_imported, num_skipped))
+
+    def _import_batch(self, batch, options):
+        manager = JobLogModel.objects.using(db_alias())
+
+        if options["skip_duplicates"]:
+            if options["new_pk"]:
+                existing = set(
+                    manager.filter(
+                        name__in=set(kwargs["name"] for kwargs in batch),
+                        date_started__in=set(kwargs["date_started"] for kwargs in batch),
+                    ).values_list("name", "date_started")
+                )
+                batch = [kwargs for kwargs in batch if (kwargs["name"], kwargs["date_started"]) not in existing]
+            else:
+                existing = set(
+                    manager.filter(pk__in=[kwargs["id"] for kwargs in batch if kwargs.get("id")])
+                    .values_list("pk", flat=True)
+                )
+                batch = [kwargs for kwargs in batch if kwargs.get("id") not in existing]
+
+        # parents that are neither imported nor in the database, e.g. when only the children were exported
+        parent_ids = set(kwargs["parent_id"] for kwargs in batch if kwargs.get("parent_id")) \
+            - set(kwargs.get("id") for kwargs in batch)
+        if parent_ids:
+            missing = parent_ids - set(manager.filter(pk__in=parent_ids).values_list("pk", flat=True))
+            for kwargs in batch:
+                if kwargs.get("parent_id") in missing:
+                    kwargs["parent_id"] = None
+
+        if options["renumber"]:
+            for kwargs in batch:
+                kwargs["count"] = self._next_count(kwargs["name"])
+
+        with transaction.atomic(using=db_alias()):
+            manager.bulk_create([JobLogModel(**kwargs) for kwargs in batch], batch_size=options["batch_size"])
+        return len(batch)
+
+    def _next_count(self, name):
+        if name not in self._counts:
+            self._counts[name] = JobLogModel.objects.using(db_alias()).filter(name=name).count() \
+                + JobLogStatsModel.get_num_archived(name)
+        self._counts[name] += 1
+        return self._counts[name]
+
+    def _reset_sequence(self):
+        connection = connections[db_alias()]
+        statements = connection.ops.sequence_reset_sql(no_style(), [JobLogModel])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+
+def generate_job_history(num_jobs, num_names=10, days=365, rnd=None):
+    """
+    Generates JobLogModel constructor arguments of a synthetic job history,
+    in start-date order.
+
+    Each job name gets it's own typical duration and error rate, so the history
+    looks like a set of cronjobs running side by side.
+
+    :param num_jobs: int, number of job runs
+    :param num_names: int, number of distinct job names
+    :param days: float, time span of the history, ending now
+    :param rnd: random.Random instance
+    :return: generator of dict
+    """
+    rnd = rnd or random.Random()
+    now = timezone.now()
+    start = now - datetime.timedelta(days=days)
+    step = datetime.timedelta(days=days) / max(1, num_jobs)
+
+    names = [
+        {
+            "name": "synthetic-job-%s" % i,
+            "duration": rnd.lognormvariate(2., 1.5),
+            "error_rate": rnd.uniform(0., .1),
+            "log_lines": rnd.randrange(0, 20),
+        }
+        for i in range(max(1, num_names))
+    ]
+
+    for i in range(num_jobs):
+        job = rnd.choice(names)
+        date_started = start + step * i
+        duration = datetime.timedelta(seconds=job["duration"] * rnd.lognormvariate(0., .3))
+
+        state = JobLogStates.finished.name
+        error_text = None
+        dice = rnd.random()
+        if dice < job["error_rate"]:
+            state = JobLogStates.error.name
+            error_text = "RuntimeError - synthetic error %s" % i
+        elif dice < job["error_rate"] + .01:
+            state = JobLogStates.blocked.name
+            duration = None
+        elif dice < job["error_rate"] + .015:
+            state = JobLogStates.vanished.name
+
+        yield {
+            "name": job["name"],
+            "date_started": date_started,
+            "date_ended": date_started + (duration or datetime.timedelta()),
+            "duration": duration,
+            "state": state,
+            "log_text": "\n".join(
+                "synthetic log line %s" % j
+                for j in range(job["log_lines"])
+            ) or None,
+            "error_text": error_text,
+        }
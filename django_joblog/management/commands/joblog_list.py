@@ -1,37 +1,205 @@
 # encoding=utf-8
 from __future__ import unicode_literals
 
+import time
+import datetime
+import itertools
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
-from django.utils.translation import ugettext_lazy as _
 
-from django_joblog.models import JobLogModel, JobLogStates, db_alias
+from django_joblog.models import JobLogModel, JobLogStates, read_db_alias
+from django_joblog.impl.keyset import iter_keyset
+from django_joblog.impl.serialization import parse_export_datetime
+from django_joblog.impl.progress import format_progress
+
+
+# scalar columns that are listed, the texts are never loaded
+LIST_FIELDS = ("date_ended", "duration", "name", "state", "is_slow", "progress_done", "progress_total")
+
+ACTIVE_STATES = (JobLogStates.running.name, JobLogStates.waiting.name)
+
+FORMAT_STR = "%6s | %32s | %32s | %15s | %30s | %10s | %4s | %s"
 
 
 class Command(BaseCommand):
-    help = "List jobs"
+    help = "List jobs, newest first"
 
     def add_arguments(self, parser):
         parser.add_argument("-s", "--state", nargs="+", type=str, default=[],
-                            help="Specify states of jobs to list (running, finished, error, vanished)")
+                            help="Specify states of jobs to list (running, finished, error, blocked, vanished, waiting)")
+        parser.add_argument("-n", "--name", nargs="+", type=str, default=[],
+                            help="Only list jobs with these names")
+        parser.add_argument("-p", "--prefix", type=str, default=None,
+                            help="Only list jobs whose name starts with this string")
+        parser.add_argument("--since", type=str, default=None,
+                            help="Only list jobs started at or after this ISO date/datetime")
+        parser.add_argument("--until", type=str, default=None,
+                            help="Only list jobs started before this ISO date/datetime")
+        parser.add_argument("--min-duration", type=float, default=None,
+                            help="Only list jobs that took at least this number of seconds")
+        parser.add_argument("--max-duration", type=float, default=None,
+                            help="Only list jobs that took at most this number of seconds")
+        parser.add_argument("-l", "--limit", type=int, default=20,
+                            help="Maximum number of jobs to list")
+        parser.add_argument("-b", "--before", type=int, default=None,
+                            help="Only list jobs before the job with this pk, to continue a previous listing")
+        parser.add_argument("-w", "--watch", nargs="?", type=bool, const=True, default=False,
+                            help="Keep printing new jobs and the progress and end of running jobs")
+        parser.add_argument("-i", "--interval", type=float, default=2.,
+                            help="Seconds between two polls in watch mode")
 
     def handle(self, *args, **options):
-        if not options["state"]:
-            qset = JobLogModel.objects.using(db_alias()).all()
+        if options["limit"] < 1:
+            raise CommandError("--limit must be at least 1")
+        try:
+            # the watcher applies the state filter itself
+            qset = get_filtered_queryset(options, filter_state=not options["watch"])
+        except ValueError as e:
+            raise CommandError("Invalid date: %s" % e)
+
+        if options["watch"]:
+            self._watch(qset, options)
+            return
+
+        after = None
+        if options["before"] is not None:
+            after = qset.model.objects.using(qset.db).filter(pk=options["before"])\
+                .values_list("date_started", "pk").first()
+            if after is None:
+                raise CommandError("Unknown pk '%s'" % options["before"])
+
+        print_header()
+        num_rows = 0
+        row = None
+        for row in iter_keyset(
+                qset, LIST_FIELDS, chunk_size=min(1000, options["limit"]), after=after, descending=True):
+            print_row(row)
+            num_rows += 1
+            if num_rows >= options["limit"]:
+                break
+
+        if row is not None and num_rows >= options["limit"]:
+            print("more: --before %s" % row[-1])
+
+    def _watch(self, qset, options):
+        watcher = ListWatcher(qset, options["limit"], states=options["state"])
+        print_header()
+        try:
+            while True:
+                for is_new, row in watcher.poll():
+                    print_row(row, "" if is_new else "*")
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+
+class ListWatcher(object):
+    """
+    Polls a filtered job queryset for new rows after the last seen `(date_started, pk)`
+    and for state or progress changes of the rows that are running or waiting.
+
+    The queryset is read without the state filter, which is applied to the returned rows,
+    so a running job that only matches the states when it ends, e.g. with `--state error`,
+    is still followed and returned then.
+    Each poll runs at most two bounded queries, the first poll with states up to three.
+    """
+    def __init__(self, qset, limit=20, states=None):
+        """
+        :param qset: JobLogModel queryset with all filters but the state
+        :param limit: int, number of rows of the first poll
+        :param states: optional sequence of str, only return rows with these states
+        """
+        self.qset = qset
+        self.limit = limit
+        self.states = set(states) if states else None
+        self.position = None
+        self.active = dict()
+        self.returned = set()
+
+    def poll(self):
+        """
+        :return: list of (bool, tuple), whether the row is new and the row in the
+            `LIST_FIELDS` + (date_started, pk) format, oldest first
+        """
+        changed = []
+        if self.active:
+            # not filtered, a job that leaves the filter, e.g. a state, is reported once
+            manager = self.qset.model.objects.using(self.qset.db)
+            for row in manager.filter(pk__in=list(self.active)).values_list(*LIST_FIELDS + ("date_started", "pk")):
+                previous = self.active[row[-1]]
+                # the duration of running jobs changes with each ping, only state and progress are reported
+                if row[3] != previous[3] or row[5] != previous[5] or row[-2] != previous[-2]:
+                    changed.append(row)
+
+        if self.position is None:
+            new = self._poll_first()
         else:
-            qset = None
-            for state in options["state"]:
-                state_qset = JobLogModel.objects.using(db_alias()).filter(state=state)
-                if qset is None:
-                    qset = state_qset
-                else:
-                    qset |= state_qset
-
-        qset = qset.order_by("-date_started")
-        qset = qset[:20]
-
-        format_str = "%4s | %34s | %34s | %30s | %20s"
-        print(format_str % ("pk", "date_started", "date_ended", "name", "state"))
-        for job in qset:
-            print(format_str % (job.pk, job.date_started, job.date_ended, job.name, job.state))
+            new = list(iter_keyset(self.qset, LIST_FIELDS, chunk_size=1000, after=self.position))
+            if new:
+                self.position = new[-1][-2:]
+
+        # a waiting job that starts running gets a new date_started
+        changed_pks = set(row[-1] for row in changed)
+        rows = []
+        for row in changed + [row for row in new if row[-1] not in changed_pks]:
+            pk = row[-1]
+            if pk in self.returned or self.states is None or row[3] in self.states:
+                rows.append((pk not in self.returned, row))
+                self.returned.add(pk)
+            if row[3] in ACTIVE_STATES:
+                self.active[pk] = row
+            else:
+                self.active.pop(pk, None)
+                self.returned.discard(pk)
+        return rows
+
+    def _poll_first(self):
+        qset = self.qset.filter(state__in=self.states) if self.states else self.qset
+        new = list(itertools.islice(
+            iter_keyset(qset, LIST_FIELDS, chunk_size=self.limit, descending=True), self.limit
+        ))
+        new.reverse()
+        if not self.states:
+            if new:
+                self.position = new[-1][-2:]
+            return new
+
+        # the running jobs that do not match the states yet are followed until they end
+        listed = set(row[-1] for row in new)
+        for row in self.qset.filter(state__in=ACTIVE_STATES).values_list(*LIST_FIELDS + ("date_started", "pk")):
+            if row[-1] not in listed:
+                self.active[row[-1]] = row
+        # the rows up to the newest one have either ended or are followed
+        self.position = self.qset.order_by("-date_started", "-pk").values_list("date_started", "pk").first()
+        return new
+
+
+def get_filtered_queryset(options, filter_state=True):
+    qset = JobLogModel.objects.using(read_db_alias()).all()
+    if options["state"] and filter_state:
+        qset = qset.filter(state__in=options["state"])
+    if options["name"]:
+        qset = qset.filter(name__in=options["name"])
+    if options["prefix"]:
+        qset = qset.filter(name__startswith=options["prefix"])
+    if options["since"]:
+        qset = qset.filter(date_started__gte=parse_export_datetime(options["since"]))
+    if options["until"]:
+        qset = qset.filter(date_started__lt=parse_export_datetime(options["until"]))
+    if options["min_duration"] is not None:
+        qset = qset.filter(duration__gte=datetime.timedelta(seconds=options["min_duration"]))
+    if options["max_duration"] is not None:
+        qset = qset.filter(duration__lte=datetime.timedelta(seconds=options["max_duration"]))
+    return qset
+
+
+def print_header():
+    print(FORMAT_STR % ("pk", "date_started", "date_ended", "duration", "name", "state", "slow", "progress"))
+
+
+def print_row(row, marker=""):
+    date_ended, duration, name, state, is_slow, progress_done, progress_total, date_started, pk = row
+    print(FORMAT_STR % (
+        "%s%s" % (marker, pk), date_started, date_ended, duration, name, state, "slow" if is_slow else "",
+        format_progress(progress_done, progress_total, bar_width=10),
+    ))
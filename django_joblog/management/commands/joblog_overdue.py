@@ -0,0 +1,39 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_joblog.models import JobLogModel
+
+
+class Command(BaseCommand):
+    help = "List jobs that missed their schedule in JOBLOG_CONFIG['schedules'] or run longer than usual " \
+           "and send the 'job_overdue' signal for each of them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--no-signals", nargs="?", type=bool, const=True, default=False,
+                            help="Do not send the 'job_overdue' signal")
+        parser.add_argument("--fail", nargs="?", type=bool, const=True, default=False,
+                            help="Exit with status 1 if any job is overdue, e.g. for monitoring")
+
+    def handle(self, *args, **options):
+        try:
+            overdue = JobLogModel.get_overdue(send_signals=not options["no_signals"])
+        except ValueError as e:
+            raise CommandError(e)
+
+        if overdue:
+            format_str = "%30s | %12s | %18s | %32s | %32s | %32s | %10s"
+            print(format_str % ("name", "reason", "schedule", "last_started", "deadline", "running_since", "p99"))
+            for entry in overdue:
+                print(format_str % (
+                    entry["name"], entry["reason"], entry["schedule"] or "-", entry["last_started"],
+                    entry["deadline"] or "-", entry["running_since"] or "-",
+                    "%.1f" % entry["duration_p99"] if entry["duration_p99"] is not None else "-",
+                ))
+        print("%s job(s) overdue" % len(overdue))
+
+        if options["fail"] and overdue:
+            sys.exit(1)
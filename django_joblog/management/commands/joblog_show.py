@@ -6,7 +6,8 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils.translation import ugettext_lazy as _
 
-from django_joblog.models import JobLogModel, JobLogStates, db_alias
+from django_joblog.models import JobLogModel, JobLogStates, read_db_alias
+from django_joblog.impl.progress import format_progress
 
 
 class Command(BaseCommand):
@@ -18,12 +19,26 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         try:
-            job = JobLogModel.objects.using(db_alias()).get(pk=options["pk"])
+            job = JobLogModel.get_job(options["pk"], using=read_db_alias())
 
             for n in (
-                    "name", "count", "date_started", "date_ended", "duration", "state",
+                    "name", "count", "date_started", "date_ended", "duration", "state", "parent_id",
             ):
                 print("%12s: %s" % (n, getattr(job, n)))
+            if not isinstance(job, JobLogModel):
+                print("%12s: %s" % ("archived", True))
+            if job.progress_done is not None:
+                print("%12s: %s" % ("progress", format_progress(
+                    job.progress_done, job.progress_total, job.progress_rate, job.progress_eta, bar_width=20
+                )))
+
+            tree = job.get_run_tree()
+            if len(tree) > 1:
+                print("run tree:")
+                for depth, node in tree:
+                    print("%s#%s %s  %s  %s" % (
+                        "  " * depth, node.pk, node.name, node.duration, node.state
+                    ))
 
             if job.log_text:
                 print("log:")
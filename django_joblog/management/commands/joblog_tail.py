@@ -0,0 +1,40 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_joblog.impl.tail import poll_tail
+
+
+class Command(BaseCommand):
+    help = "Print the log of a job, optionally following it while the job is running"
+
+    def add_arguments(self, parser):
+        parser.add_argument("pk", type=int,
+                            help="Primary key of job to display")
+        parser.add_argument("-f", "--follow", nargs="?", type=bool, const=True, default=False,
+                            help="Wait for new lines until the job ends")
+        parser.add_argument("-i", "--interval", type=float, default=2.,
+                            help="Maximum seconds between two polls while the job is idle")
+
+    def handle(self, *args, **options):
+        log_offset, error_offset = 0, 0
+        while True:
+            tail = poll_tail(
+                options["pk"], log_offset, error_offset,
+                timeout=60. if options["follow"] else 0., max_interval=options["interval"],
+            )
+            if tail is None:
+                raise CommandError("Unknown pk '%s'" % options["pk"])
+
+            for line in tail["log"]["lines"]:
+                print(line)
+            for line in tail["error"]["lines"]:
+                print("ERR: %s" % line)
+            log_offset, error_offset = tail["log"]["offset"], tail["error"]["offset"]
+
+            if not options["follow"] or not tail["running"]:
+                break
+
+        if options["follow"]:
+            print("--- %s.%s %s" % (tail["name"], tail["id"], tail["state"]))
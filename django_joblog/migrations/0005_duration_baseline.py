@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-10-19 12:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0004_alter_state_choices'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobLogStatsModel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(editable=False, max_length=128, unique=True, verbose_name='name')),
+                ('num_samples', models.BigIntegerField(default=0, editable=False, verbose_name='samples')),
+                ('duration_mean', models.FloatField(default=None, editable=False, null=True, verbose_name='mean duration')),
+                ('duration_variance', models.FloatField(default=0.0, editable=False, verbose_name='duration variance')),
+                ('duration_p50', models.FloatField(default=None, editable=False, null=True, verbose_name='duration p50')),
+                ('duration_p95', models.FloatField(default=None, editable=False, null=True, verbose_name='duration p95')),
+                ('duration_p99', models.FloatField(default=None, editable=False, null=True, verbose_name='duration p99')),
+                ('last_duration', models.FloatField(default=None, editable=False, null=True, verbose_name='last duration')),
+                ('date_updated', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='updated')),
+            ],
+            options={
+                'verbose_name': 'Job statistics',
+                'verbose_name_plural': 'Job statistics',
+            },
+        ),
+        migrations.AddField(
+            model_name='joblogmodel',
+            name='is_slow',
+            field=models.BooleanField(default=False, editable=False, verbose_name='slow'),
+        ),
+    ]
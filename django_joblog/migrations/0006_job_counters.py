@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-19 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0005_duration_baseline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblogstatsmodel',
+            name='date_last_success',
+            field=models.DateTimeField(default=None, editable=False, null=True, verbose_name='last success'),
+        ),
+        migrations.AddField(
+            model_name='joblogstatsmodel',
+            name='num_errors',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='errors'),
+        ),
+        migrations.AddField(
+            model_name='joblogstatsmodel',
+            name='num_finished',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='finished'),
+        ),
+        migrations.AddField(
+            model_name='joblogstatsmodel',
+            name='num_vanished',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='vanished'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-19 13:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0006_job_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblogmodel',
+            name='parent',
+            field=models.ForeignKey(blank=True, default=None, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='children', to='django_joblog.joblogmodel', verbose_name='parent'),
+        ),
+    ]
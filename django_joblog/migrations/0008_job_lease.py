@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-19 13:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0007_job_parent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobLogLockModel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(editable=False, max_length=128, unique=True, verbose_name='name')),
+                ('owner', models.CharField(editable=False, max_length=255, verbose_name='owner')),
+                ('date_acquired', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='acquired')),
+                ('date_expires', models.DateTimeField(db_index=True, editable=False, verbose_name='expires')),
+                ('job', models.ForeignKey(blank=True, default=None, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='django_joblog.joblogmodel', verbose_name='job')),
+            ],
+            options={
+                'verbose_name': 'Job lock',
+                'verbose_name_plural': 'Job locks',
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0008_job_lease'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='joblogmodel',
+            name='state',
+            field=models.CharField(choices=[('running', '▶ running'), ('finished', '✔ finished'), ('error', '❌ error'), ('blocked', '🖐 blocked'), ('vanished', '⊙ vanished'), ('waiting', '⏳ waiting')], db_index=True, default='running', editable=False, max_length=64, verbose_name='state'),
+        ),
+        migrations.AddIndex(
+            model_name='joblogmodel',
+            index=models.Index(fields=['name', 'state'], name='joblog_name_state_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-19 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0009_job_waiting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobloglockmodel',
+            name='slot',
+            field=models.IntegerField(default=0, editable=False, verbose_name='slot'),
+        ),
+        migrations.AlterField(
+            model_name='jobloglockmodel',
+            name='name',
+            field=models.CharField(editable=False, max_length=128, verbose_name='name'),
+        ),
+        migrations.AlterField(
+            model_name='jobloglockmodel',
+            name='owner',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='owner'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobloglockmodel',
+            unique_together={('name', 'slot')},
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.25 on 2026-10-19 13:23
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0010_lock_slots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobLogArchiveModel',
+            fields=[
+                ('name', models.CharField(db_index=True, default='', editable=False, max_length=128, verbose_name='name')),
+                ('count', models.BigIntegerField(default=0, editable=False, verbose_name='count')),
+                ('date_started', models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='started')),
+                ('date_ended', models.DateTimeField(blank=True, db_index=True, default=None, editable=False, null=True, verbose_name='ended')),
+                ('duration', models.DurationField(blank=True, db_index=True, default=None, null=True, verbose_name='duration')),
+                ('state', models.CharField(choices=[('running', '▶ running'), ('finished', '✔ finished'), ('error', '❌ error'), ('blocked', '🖐 blocked'), ('vanished', '⊙ vanished'), ('waiting', '⏳ waiting')], db_index=True, default='running', editable=False, max_length=64, verbose_name='state')),
+                ('log_text', models.TextField(blank=True, default=None, editable=False, null=True, verbose_name='log')),
+                ('error_text', models.TextField(blank=True, default=None, editable=False, null=True, verbose_name='error log')),
+                ('is_slow', models.BooleanField(default=False, editable=False, verbose_name='slow')),
+                ('id', models.BigIntegerField(editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('parent_id', models.BigIntegerField(blank=True, db_index=True, default=None, editable=False, null=True, verbose_name='parent')),
+            ],
+            options={
+                'verbose_name': 'Archived job log',
+                'verbose_name_plural': 'Archived job logs',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-19 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0011_job_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joblogmodel',
+            index=models.Index(fields=['name', 'date_started'], name='joblog_name_started_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.25 on 2026-10-19 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0012_job_name_started_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblogarchivemodel',
+            name='progress_done',
+            field=models.BigIntegerField(blank=True, default=None, editable=False, null=True, verbose_name='progress'),
+        ),
+        migrations.AddField(
+            model_name='joblogarchivemodel',
+            name='progress_eta',
+            field=models.DateTimeField(blank=True, default=None, editable=False, null=True, verbose_name='estimated end'),
+        ),
+        migrations.AddField(
+            model_name='joblogarchivemodel',
+            name='progress_rate',
+            field=models.FloatField(blank=True, default=None, editable=False, null=True, verbose_name='progress per second'),
+        ),
+        migrations.AddField(
+            model_name='joblogarchivemodel',
+            name='progress_total',
+            field=models.BigIntegerField(blank=True, default=None, editable=False, null=True, verbose_name='progress total'),
+        ),
+        migrations.AddField(
+            model_name='joblogmodel',
+            name='progress_done',
+            field=models.BigIntegerField(blank=True, default=None, editable=False, null=True, verbose_name='progress'),
+        ),
+        migrations.AddField(
+            model_name='joblogmodel',
+            name='progress_eta',
+            field=models.DateTimeField(blank=True, default=None, editable=False, null=True, verbose_name='estimated end'),
+        ),
+        migrations.AddField(
+            model_name='joblogmodel',
+            name='progress_rate',
+            field=models.FloatField(blank=True, default=None, editable=False, null=True, verbose_name='progress per second'),
+        ),
+        migrations.AddField(
+            model_name='joblogmodel',
+            name='progress_total',
+            field=models.BigIntegerField(blank=True, default=None, editable=False, null=True, verbose_name='progress total'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+def count_archived_jobs(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    JobLogArchiveModel = apps.get_model("django_joblog", "JobLogArchiveModel")
+    JobLogStatsModel = apps.get_model("django_joblog", "JobLogStatsModel")
+    counts = JobLogArchiveModel.objects.using(alias).order_by().values("name").annotate(num=models.Count("id"))
+    for row in counts:
+        stats, created = JobLogStatsModel.objects.using(alias).get_or_create(name=row["name"])
+        stats.num_archived = row["num"]
+        stats.save(using=alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_joblog', '0013_job_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblogstatsmodel',
+            name='num_archived',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='archived'),
+        ),
+        migrations.RunPython(count_archived_jobs, migrations.RunPython.noop),
+    ]
@@ -1,16 +1,15 @@
 # encoding=utf-8
 from __future__ import unicode_literals
 
-import warnings
 import enum
+import random
+import datetime
 
-from django.db import models, transaction
+from django.db import models, transaction, IntegrityError
 from django.utils.translation import ugettext_lazy as _
 from django.utils import timezone
-from django.conf import settings
-from django.db import DEFAULT_DB_ALIAS
 
-from . import Config
+from .impl.Config import get_config
 
 
 class JobLogStates(enum.Enum):
@@ -22,6 +21,7 @@ class JobLogStates(enum.Enum):
     error = _("❌ error")
     blocked = _("🖐 blocked")
     vanished = _("⊙ vanished")
+    waiting = _("⏳ waiting")
 
 
 def db_alias():
@@ -30,17 +30,25 @@ def db_alias():
     Return "joblog" if such a database is configured else defaults to django.db.DEFAULT_DB_ALIAS
     :return: str
     """
-    alias = Config().db_alias
-    if alias not in settings.DATABASES:
-        warnings.warn("Configured job-logger db alias '%s' is not in settings.DATABASES" % alias)
-        return DEFAULT_DB_ALIAS
-    return alias
+    return get_config().resolved_db_alias
 
 
-class JobLogModel(models.Model):
+def read_db_alias():
+    """
+    Returns the db name to use for reading JobLogModel in views, commands and statistics
+    that do not need the latest data, e.g. a read replica.
+    Defaults to `db_alias()`
+    :return: str
+    """
+    return get_config().resolved_read_db_alias
+
+
+class AbstractJobLogModel(models.Model):
+    """
+    Fields and methods shared by JobLogModel and JobLogArchiveModel
+    """
     class Meta:
-        verbose_name = _("Job log")
-        verbose_name_plural = _("Job logs")
+        abstract = True
 
     name = models.CharField(verbose_name=_("name"), max_length=128, editable=False, default="", db_index=True)
     count = models.BigIntegerField(verbose_name=_("count"), editable=False, default=0)
@@ -51,6 +59,69 @@ class JobLogModel(models.Model):
                              choices=[(e.name, e.value) for e in JobLogStates], default=JobLogStates.running.name)
     log_text = models.TextField(verbose_name=_("log"), default=None, null=True, blank=True, editable=False)
     error_text = models.TextField(verbose_name=_("error log"), default=None, null=True, blank=True, editable=False)
+    is_slow = models.BooleanField(verbose_name=_("slow"), default=False, editable=False)
+    progress_done = models.BigIntegerField(verbose_name=_("progress"), default=None, null=True, blank=True, editable=False)
+    progress_total = models.BigIntegerField(verbose_name=_("progress total"), default=None, null=True, blank=True,
+                                            editable=False)
+    progress_rate = models.FloatField(verbose_name=_("progress per second"), default=None, null=True, blank=True,
+                                      editable=False)
+    progress_eta = models.DateTimeField(verbose_name=_("estimated end"), default=None, null=True, blank=True,
+                                        editable=False)
+
+    def get_run_tree(self):
+        """
+        Returns this job and all it's descendants in depth-first order.
+        Runs one query per tree level on the database this job was loaded from,
+        log and error texts are not loaded.
+        :return: list of (int, model) tuples with the depth of the node, starting at 0
+        """
+        manager = self.__class__.objects.using(self._state.db or db_alias()).defer("log_text", "error_text")
+        children = dict()
+        level = [self.pk]
+        while level:
+            nodes = list(manager.filter(parent_id__in=level).order_by("date_started", "pk"))
+            for node in nodes:
+                children.setdefault(node.parent_id, []).append(node)
+            level = [node.pk for node in nodes]
+
+        tree = []
+        stack = [(0, self)]
+        while stack:
+            depth, node = stack.pop()
+            tree.append((depth, node))
+            stack.extend((depth + 1, child) for child in reversed(children.get(node.pk, [])))
+        return tree
+
+
+class JobLogModel(AbstractJobLogModel):
+    class Meta:
+        verbose_name = _("Job log")
+        verbose_name_plural = _("Job logs")
+        indexes = [
+            models.Index(fields=["name", "state"], name="joblog_name_state_idx"),
+            models.Index(fields=["name", "date_started"], name="joblog_name_started_idx"),
+        ]
+
+    parent = models.ForeignKey("self", verbose_name=_("parent"), default=None, null=True, blank=True, editable=False,
+                               related_name="children", on_delete=models.SET_NULL)
+
+    @classmethod
+    def get_job(cls, pk, using=None):
+        """
+        Returns the job with primary key `pk` from the job log or the archive
+        :param pk: int
+        :param using: str, optional database alias, defaults to `db_alias()`
+        :return: JobLogModel or JobLogArchiveModel instance
+        :raises: JobLogModel.DoesNotExist
+        """
+        using = using or db_alias()
+        try:
+            return cls.objects.using(using).get(pk=pk)
+        except cls.DoesNotExist:
+            try:
+                return JobLogArchiveModel.objects.using(using).get(pk=pk)
+            except JobLogArchiveModel.DoesNotExist:
+                raise cls.DoesNotExist("JobLogModel matching query does not exist.")
 
     @classmethod
     def is_job_running(cls, name, time_delta=None, ping=None):
@@ -64,8 +135,12 @@ class JobLogModel(models.Model):
                 smaller than their true duration
         :return: bool
         """
+        # jobs with parallel=True never take a lease, their 'running' entries are checked as well
+        if get_config().locking == "lease" and JobLogLockModel.is_locked(name, time_delta=time_delta):
+            return True
+
         if ping is None:
-            ping = Config().ping
+            ping = get_config().ping
 
         if time_delta is None:
             qset = cls.objects.using(db_alias()).filter(
@@ -86,7 +161,7 @@ class JobLogModel(models.Model):
         if not ping:
             return qset.exists()
 
-        leeway = Config().ping_interval
+        leeway = get_config().ping_interval
         now = timezone.now()
         for date_started, duration in qset.values_list("date_started", "duration"):
             true_duration = now - date_started
@@ -106,17 +181,20 @@ class JobLogModel(models.Model):
     @classmethod
     def cleanup(cls, joblog=None):
         """
-        Set all jobs that are running but who's update is older than JOBLOG_CONFIG["ping_interval"] to 'vanished'.
+        Set all jobs that are running or waiting but who's update is older than JOBLOG_CONFIG["ping_interval"]
+        to 'vanished'.
         Careful! JOBLOG_CONFIG["ping"] must be enabled for this to work reliably.
         :param joblog: optional JobLogger instance to log the result
         """
         from django_joblog import DummyJobLogger
         now = timezone.now()
-        leeway = Config().ping_interval
+        leeway = get_config().ping_interval
         joblog = joblog or DummyJobLogger()
 
-        with transaction.atomic():
-            qset = cls.objects.using(db_alias()).filter(state=JobLogStates.running.name)
+        with transaction.atomic(using=db_alias()):
+            qset = cls.objects.using(db_alias()).filter(
+                state__in=(JobLogStates.running.name, JobLogStates.waiting.name)
+            )
             num_running = qset.count()
             to_delete = []
 
@@ -140,13 +218,440 @@ class JobLogModel(models.Model):
                 joblog.log("%s job(s) running, %s vanished" % (num_running, len(to_delete)))
                 for pk in to_delete:
                     try:
-                        job = cls.objects.using(db_alias()).get(pk=pk)
-                        job.state = JobLogStates.vanished.name
-                        if not job.date_ended:
-                            if job.duration:
-                                job.date_ended = job.date_started + job.duration
-                            else:
-                                job.date_ended = now
-                        job.save(using=db_alias())
+                        cls.objects.using(db_alias()).get(pk=pk).set_vanished(now)
                     except cls.DoesNotExist:
                         pass
+
+    def set_vanished(self, now=None):
+        """
+        Sets the state of this job to 'vanished' and adds it to the job statistics.
+        Must be called inside a transaction.
+        :param now: datetime, used as end date if the job has no duration yet
+        """
+        self.state = JobLogStates.vanished.name
+        if not self.date_ended:
+            if self.duration:
+                self.date_ended = self.date_started + self.duration
+            else:
+                self.date_ended = now or timezone.now()
+        self.save(using=db_alias())
+        JobLogStatsModel.add_job(self)
+
+    @classmethod
+    def get_overdue(cls, now=None, send_signals=False):
+        """
+        Returns the jobs that are behind their expected schedule in JOBLOG_CONFIG["schedules"]
+        and the running jobs that run longer than the 99th percentile of their finished durations,
+        if it is based on at least JOBLOG_CONFIG["slow_min_samples"] jobs.
+        Both are checked independently, a job can be returned once for each reason.
+        Uses one query for the last starts of the scheduled jobs, grouped by name on the
+        (name, date_started) index, and one query for the running jobs.
+        :param now: datetime, optional
+        :param send_signals: bool, send the `job_overdue` signal for each returned entry
+        :return: list of dict with "name", "reason" ("missed" or "long_running"), "schedule",
+            "last_started", "deadline", "running_since" and "duration_p99" (seconds),
+            sorted by name and reason
+        """
+        from .impl.schedule import Schedule
+        from .signals import job_overdue
+
+        config = get_config()
+        now = now or timezone.now()
+        grace = datetime.timedelta(seconds=config.schedule_grace)
+        schedules = dict()
+        for name, spec in config.schedules.items():
+            try:
+                schedules[name] = Schedule(spec)
+            except ValueError as e:
+                raise ValueError("JOBLOG_CONFIG['schedules'] of job '%s': %s" % (name, e))
+
+        manager = cls.objects.using(read_db_alias())
+        last_started = dict()
+        if schedules:
+            last_started = dict(
+                manager.filter(name__in=list(schedules)).order_by().values("name")
+                .annotate(last_started=models.Max("date_started")).values_list("name", "last_started")
+            )
+
+        running = {
+            row["name"]: row
+            for row in manager.filter(state=JobLogStates.running.name).order_by().values("name").annotate(
+                last_started=models.Max("date_started"),
+                running_since=models.Min("date_started"),
+                # like the slow detection, the percentile needs enough samples
+                duration_p99=models.Subquery(
+                    JobLogStatsModel.objects.filter(
+                        name=models.OuterRef("name"), num_samples__gte=config.slow_min_samples,
+                    ).values("duration_p99")[:1],
+                    output_field=models.FloatField(),
+                ),
+            )
+        }
+
+        overdue = []
+        for name in sorted(set(schedules) | set(running)):
+            row = running.get(name) or {"last_started": None, "running_since": None, "duration_p99": None}
+            entry = {
+                "name": name,
+                "reason": None,
+                "schedule": schedules.get(name),
+                "last_started": last_started.get(name, row["last_started"]),
+                "deadline": None,
+                "running_since": row["running_since"],
+                "duration_p99": row["duration_p99"],
+            }
+            reasons = []
+            if name in schedules:
+                entry["deadline"] = schedules[name].get_deadline(now, grace)
+                if entry["deadline"] is not None \
+                        and (entry["last_started"] is None or entry["last_started"] < entry["deadline"]):
+                    reasons.append("missed")
+            if row["running_since"] is not None and row["duration_p99"] is not None \
+                    and (now - row["running_since"]).total_seconds() > row["duration_p99"]:
+                reasons.append("long_running")
+
+            for reason in reasons:
+                entry = dict(entry, reason=reason)
+                overdue.append(entry)
+                if send_signals:
+                    job_overdue.send(sender=cls, **entry)
+
+        return overdue
+
+
+class JobLogArchiveModel(AbstractJobLogModel):
+    """
+    Jobs that ended some time ago, moved out of the JobLogModel table by `joblog_archive`.
+    The primary keys are kept.
+    """
+    class Meta:
+        verbose_name = _("Archived job log")
+        verbose_name_plural = _("Archived job logs")
+
+    id = models.BigIntegerField(verbose_name=_("ID"), primary_key=True, editable=False)
+    parent_id = models.BigIntegerField(verbose_name=_("parent"), default=None, null=True, blank=True,
+                                       editable=False, db_index=True)
+
+    @classmethod
+    def archive_jobs(cls, before, batch_size=500):
+        """
+        Moves jobs that ended before `before` from the JobLogModel table to the archive.
+        Child jobs are moved together with their top-most parent,
+        trees that contain a running or waiting job are skipped.
+        Each batch is moved in a transaction.
+        :param before: datetime
+        :param batch_size: int, number of trees per batch
+        :return: int, number of archived jobs
+        """
+        manager = JobLogModel.objects.using(db_alias())
+        active_states = (JobLogStates.running.name, JobLogStates.waiting.name)
+        field_names = ["id", "parent_id"] + [f.name for f in AbstractJobLogModel._meta.fields]
+        num_archived = 0
+        last_pk = 0
+
+        while True:
+            roots = list(
+                manager.filter(parent__isnull=True, date_ended__lt=before, pk__gt=last_pk)
+                .exclude(state__in=active_states)
+                .order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not roots:
+                break
+            last_pk = roots[-1]
+
+            with transaction.atomic(using=db_alias()):
+                rows = list(manager.filter(pk__in=roots).values(*field_names))
+                root_of = {row["id"]: row["id"] for row in rows}
+                level = roots
+                while level:
+                    children = list(manager.filter(parent_id__in=level).values(*field_names))
+                    for row in children:
+                        root_of[row["id"]] = root_of[row["parent_id"]]
+                    rows += children
+                    level = [row["id"] for row in children]
+
+                skipped_roots = set(root_of[row["id"]] for row in rows if row["state"] in active_states)
+                rows = [row for row in rows if root_of[row["id"]] not in skipped_roots]
+
+                cls.objects.using(db_alias()).bulk_create([cls(**row) for row in rows], batch_size=batch_size)
+                manager.filter(pk__in=[row["id"] for row in rows]).delete()
+                num_archived += len(rows)
+
+                # the counts of new jobs continue after the archived ones
+                num_per_name = dict()
+                for row in rows:
+                    num_per_name[row["name"]] = num_per_name.get(row["name"], 0) + 1
+                for name in sorted(num_per_name):
+                    stats = JobLogStatsModel.get_for_update(name)
+                    stats.num_archived += num_per_name[name]
+                    stats.save(using=db_alias())
+
+        return num_archived
+
+
+class JobLogLockModel(models.Model):
+    """
+    Lease for jobs that must not run in parallel or only N times in parallel,
+    see JOBLOG_CONFIG["locking"] and JobLogger(max_parallel=N).
+    Each job name has one row per slot. A slot is held by one owner until it expires and
+    is renewed by the owner's ping thread. An expired slot can be taken over by another owner.
+    The row with slot `LOCK_SLOT` is no lease, see `lock()`.
+    """
+    class Meta:
+        verbose_name = _("Job lock")
+        verbose_name_plural = _("Job locks")
+        unique_together = (("name", "slot"), )
+
+    name = models.CharField(verbose_name=_("name"), max_length=128, editable=False)
+    slot = models.IntegerField(verbose_name=_("slot"), default=0, editable=False)
+    owner = models.CharField(verbose_name=_("owner"), max_length=255, editable=False, default="", blank=True)
+    job = models.ForeignKey(JobLogModel, verbose_name=_("job"), default=None, null=True, blank=True,
+                            editable=False, related_name="+", on_delete=models.SET_NULL)
+    date_acquired = models.DateTimeField(verbose_name=_("acquired"), default=timezone.now, editable=False)
+    date_expires = models.DateTimeField(verbose_name=_("expires"), editable=False, db_index=True)
+
+    # slot of the row used by `lock()`
+    LOCK_SLOT = -1
+
+    @classmethod
+    def is_locked(cls, name, time_delta=None):
+        """
+        Return True if a slot of job `name` is held and not expired
+        :param name: str
+        :param time_delta: datetime.timedelta, optional,
+                           if not None, return True only if the slot was acquired within now - time_delta
+        :return: bool
+        """
+        now = timezone.now()
+        qset = cls.objects.using(db_alias()).filter(name=name, slot__gte=0, date_expires__gt=now)
+        if time_delta is not None:
+            qset = qset.filter(date_acquired__gte=now - time_delta)
+        return qset.exists()
+
+    @classmethod
+    def acquire(cls, name, owner, duration, slots=1):
+        """
+        Acquires a free or expired slot of job `name`.
+
+        All slots are read with one query, then a random free slot is claimed with
+        a conditional UPDATE, so only one of several competing owners gets it.
+        The running job of a taken-over slot is set to 'vanished'.
+
+        :param name: str
+        :param owner: str, unique id of the acquiring job
+        :param duration: float, seconds until the lease expires
+        :param slots: int, number of jobs with this name that may run at the same time
+        :return: bool, True if acquired
+        """
+        manager = cls.objects.using(db_alias())
+        now = timezone.now()
+        expires = now + datetime.timedelta(seconds=duration)
+
+        rows = list(manager.filter(name=name, slot__gte=0, slot__lt=slots)
+                    .values("pk", "slot", "owner", "job_id", "date_expires"))
+        if len(rows) < slots:
+            # first use of these slots
+            existing = set(row["slot"] for row in rows)
+            for slot in range(slots):
+                if slot not in existing:
+                    try:
+                        with transaction.atomic(using=db_alias()):
+                            manager.create(name=name, slot=slot, date_acquired=now, date_expires=now)
+                    except IntegrityError:
+                        pass
+            rows = list(manager.filter(name=name, slot__gte=0, slot__lt=slots)
+                    .values("pk", "slot", "owner", "job_id", "date_expires"))
+
+        candidates = [row for row in rows if row["date_expires"] <= now]
+        random.shuffle(candidates)
+
+        for row in candidates:
+            with transaction.atomic(using=db_alias()):
+                num_updated = manager.filter(pk=row["pk"], owner=row["owner"], date_expires__lte=now).update(
+                    owner=owner, job=None, date_acquired=now, date_expires=expires,
+                )
+                if not num_updated:
+                    # claimed by someone else in the meantime
+                    continue
+
+                if row["job_id"] is not None:
+                    try:
+                        job = JobLogModel.objects.using(db_alias()).select_for_update().get(pk=row["job_id"])
+                        if job.state == JobLogStates.running.name:
+                            job.set_vanished(now)
+                    except JobLogModel.DoesNotExist:
+                        pass
+            return True
+
+        return False
+
+    @classmethod
+    def lock(cls, name):
+        """
+        Locks the `LOCK_SLOT` row of job `name` until the end of the current transaction,
+        the row is created on first use. It is not a lease slot and never expires into one.
+        Used with locking="running" to check for running jobs and start a job in one step.
+        The row is written to, so concurrent callers also wait for each other on databases
+        without SELECT .. FOR UPDATE, like SQLite.
+        Must be called inside a transaction.
+        :param name: str
+        """
+        manager = cls.objects.using(db_alias())
+        now = timezone.now()
+        if not manager.filter(name=name, slot=cls.LOCK_SLOT).update(date_acquired=now):
+            try:
+                with transaction.atomic(using=db_alias()):
+                    manager.create(name=name, slot=cls.LOCK_SLOT, date_acquired=now, date_expires=now)
+            except IntegrityError:
+                manager.filter(name=name, slot=cls.LOCK_SLOT).update(date_acquired=now)
+
+    @classmethod
+    def renew(cls, name, owner, duration, job_pk=None):
+        """
+        Extends the lease of `owner`
+        :param name: str
+        :param owner: str
+        :param duration: float, seconds from now until the lease expires
+        :param job_pk: int, optional primary key of the owner's JobLogModel to store with the lease
+        :return: bool, False if the lease has been taken over by another owner
+        """
+        values = {"date_expires": timezone.now() + datetime.timedelta(seconds=duration)}
+        if job_pk is not None:
+            values["job_id"] = job_pk
+        return bool(cls.objects.using(db_alias()).filter(name=name, owner=owner).update(**values))
+
+    @classmethod
+    def release(cls, name, owner):
+        """
+        Releases the slot of `owner`
+        :param name: str
+        :param owner: str
+        """
+        cls.objects.using(db_alias()).filter(name=name, owner=owner).update(
+            owner="", job=None, date_expires=timezone.now(),
+        )
+
+
+class JobLogStatsModel(models.Model):
+    """
+    Rolling duration baseline and counters per job name.
+    Updated incrementally whenever a job ends.
+    """
+    class Meta:
+        verbose_name = _("Job statistics")
+        verbose_name_plural = _("Job statistics")
+
+    name = models.CharField(verbose_name=_("name"), max_length=128, editable=False, unique=True)
+    num_samples = models.BigIntegerField(verbose_name=_("samples"), editable=False, default=0)
+    duration_mean = models.FloatField(verbose_name=_("mean duration"), default=None, null=True, editable=False)
+    duration_variance = models.FloatField(verbose_name=_("duration variance"), default=0., editable=False)
+    duration_p50 = models.FloatField(verbose_name=_("duration p50"), default=None, null=True, editable=False)
+    duration_p95 = models.FloatField(verbose_name=_("duration p95"), default=None, null=True, editable=False)
+    duration_p99 = models.FloatField(verbose_name=_("duration p99"), default=None, null=True, editable=False)
+    last_duration = models.FloatField(verbose_name=_("last duration"), default=None, null=True, editable=False)
+    date_last_success = models.DateTimeField(verbose_name=_("last success"), default=None, null=True, editable=False)
+    num_finished = models.BigIntegerField(verbose_name=_("finished"), editable=False, default=0)
+    num_errors = models.BigIntegerField(verbose_name=_("errors"), editable=False, default=0)
+    num_vanished = models.BigIntegerField(verbose_name=_("vanished"), editable=False, default=0)
+    num_archived = models.BigIntegerField(verbose_name=_("archived"), editable=False, default=0)
+    date_updated = models.DateTimeField(verbose_name=_("updated"), default=timezone.now, editable=False)
+
+    def get_baseline(self):
+        """
+        :return: DurationBaseline instance
+        """
+        from .impl.DurationBaseline import DurationBaseline
+        return DurationBaseline(
+            num_samples=self.num_samples,
+            mean=self.duration_mean,
+            variance=self.duration_variance,
+            quantiles=[self.duration_p50, self.duration_p95, self.duration_p99],
+        )
+
+    def set_baseline(self, baseline):
+        """
+        :param baseline: DurationBaseline instance
+        """
+        self.num_samples = baseline.num_samples
+        self.duration_mean = baseline.mean
+        self.duration_variance = baseline.variance
+        self.duration_p50, self.duration_p95, self.duration_p99 = baseline.quantiles
+
+    @classmethod
+    def get_for_update(cls, name):
+        """
+        Returns the locked statistics row of job `name`, creates it if necessary.
+        Must be called inside a transaction.
+        :param name: str
+        :return: JobLogStatsModel
+        """
+        manager = cls.objects.using(db_alias())
+        try:
+            return manager.select_for_update().get(name=name)
+        except cls.DoesNotExist:
+            try:
+                with transaction.atomic(using=db_alias()):
+                    return manager.create(name=name)
+            except IntegrityError:
+                return manager.select_for_update().get(name=name)
+
+    @classmethod
+    def get_num_archived(cls, name):
+        """
+        Returns the number of archived jobs with name `name`
+        :param name: str
+        :return: int
+        """
+        return cls.objects.using(db_alias()).filter(name=name).values_list("num_archived", flat=True).first() or 0
+
+    @classmethod
+    def get_num_archived_by_name(cls, names):
+        """
+        Returns the number of archived jobs for each of the names, with one query
+        :param names: iterable of str
+        :return: dict of name -> int, names without archived jobs are missing
+        """
+        return dict(
+            cls.objects.using(db_alias()).filter(name__in=set(names), num_archived__gt=0)
+            .values_list("name", "num_archived")
+        )
+
+    @classmethod
+    def add_job(cls, job):
+        """
+        Updates the statistics with a job that just ended.
+        Finished jobs are judged against the stored duration baseline and added to it afterwards.
+        Must be called inside a transaction.
+        :param job: JobLogModel
+        :return: bool, True if the job's duration is considered slow
+        """
+        config = get_config()
+        stats = cls.get_for_update(job.name)
+        is_slow = False
+
+        if job.state == JobLogStates.finished.name:
+            seconds = job.duration.total_seconds()
+            stats.num_finished += 1
+            stats.last_duration = seconds
+            stats.date_last_success = job.date_ended
+
+            if config.slow_detection:
+                baseline = stats.get_baseline()
+                is_slow = baseline.is_slow(
+                    seconds,
+                    factor=config.slow_factor,
+                    zscore=config.slow_zscore,
+                    min_samples=config.slow_min_samples,
+                )
+                baseline.add(seconds, alpha=config.baseline_alpha)
+                stats.set_baseline(baseline)
+
+        elif job.state == JobLogStates.error.name:
+            stats.num_errors += 1
+
+        elif job.state == JobLogStates.vanished.name:
+            stats.num_vanished += 1
+
+        stats.date_updated = timezone.now()
+        stats.save(using=db_alias())
+        return is_slow
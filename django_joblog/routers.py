@@ -0,0 +1,32 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+from .impl.Config import get_config
+
+
+class JobLogRouter(object):
+    """
+    Database router for the models of django_joblog.
+
+    Writes go to JOBLOG_CONFIG["db_alias"], reads to JOBLOG_CONFIG["read_db_alias"]
+    (which defaults to "db_alias"). Other apps are left to the next router.
+
+    DATABASE_ROUTERS = ["django_joblog.routers.JobLogRouter"]
+
+    The library's own queries always name their database. Those that need the latest data,
+    like the check for running jobs, the locking and the cleanup, use "db_alias".
+    The router makes the admin and code that uses the models directly follow the same split.
+    """
+    app_label = "django_joblog"
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == self.app_label:
+            return get_config().resolved_read_db_alias
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == self.app_label:
+            return get_config().resolved_db_alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._meta.app_label == self.app_label and obj2._meta.app_label == self.app_label:
+            return True
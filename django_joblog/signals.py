@@ -0,0 +1,19 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+from django.dispatch import Signal
+
+
+# Sent when a job finished considerably slower than it's duration baseline.
+# Arguments: sender (the JobLogger class), joblog (the JobLogger instance), model (the JobLogModel)
+job_slow = Signal()
+
+# Sent for each instrumented operation when the SignalSink is configured in JOBLOG_CONFIG["instrumentation"].
+# Arguments: sender (the SignalSink class), operation (str), seconds (float)
+instrumentation_event = Signal()
+
+# Sent by `JobLogModel.get_overdue(send_signals=True)`, e.g. in the joblog_overdue command,
+# for each job that missed it's schedule or runs longer than usual.
+# Arguments: sender (the JobLogModel class) and the keys of the entries returned by `get_overdue`:
+# name, reason ("missed" or "long_running"), schedule, last_started, deadline, running_since, duration_p99
+job_overdue = Signal()
@@ -0,0 +1,80 @@
+/*
+    Virtual scrolling viewer for the log and error texts in the JobLogModel admin.
+
+    Each <div class="joblog-viewer" data-url="..."> loads the pages of lines
+    that are visible and drops the pages that are far away.
+*/
+(function() {
+    "use strict";
+
+    var LINE_HEIGHT = 16,
+        MAX_HEIGHT = 480,
+        KEEP_PAGES = 2;
+
+    function initViewer(element) {
+        var url = element.getAttribute("data-url"),
+            spacer = document.createElement("div"),
+            pages = {},
+            total = 0,
+            pageLines = 0;
+
+        element.style.position = "relative";
+        element.style.overflow = "auto";
+        element.style.fontFamily = "monospace";
+        element.style.whiteSpace = "pre";
+        element.style.lineHeight = LINE_HEIGHT + "px";
+        element.appendChild(spacer);
+
+        function load(page) {
+            if (pages[page])
+                return;
+            var block = pages[page] = document.createElement("div");
+            block.style.position = "absolute";
+            block.style.left = "0";
+            block.style.right = "0";
+            element.appendChild(block);
+
+            var request = new XMLHttpRequest();
+            request.open("GET", url + "?page=" + page);
+            request.onload = function() {
+                if (request.status !== 200)
+                    return;
+                var data = JSON.parse(request.responseText);
+                total = data.total;
+                pageLines = data.page_lines;
+                spacer.style.height = (total * LINE_HEIGHT) + "px";
+                element.style.height = Math.min(MAX_HEIGHT, total * LINE_HEIGHT + LINE_HEIGHT) + "px";
+                block.style.top = (data.page * pageLines * LINE_HEIGHT) + "px";
+                block.innerHTML = total ? data.lines.join("\n") : "-";
+                update();
+            };
+            request.send();
+        }
+
+        function update() {
+            if (!pageLines)
+                return;
+            var first = Math.floor(element.scrollTop / LINE_HEIGHT / pageLines),
+                last = Math.floor((element.scrollTop + element.clientHeight) / LINE_HEIGHT / pageLines);
+
+            for (var page = first; page <= last && page * pageLines < total; ++page)
+                load(page);
+
+            for (var key in pages) {
+                if (pages.hasOwnProperty(key) && (key < first - KEEP_PAGES || key > last + KEEP_PAGES)) {
+                    element.removeChild(pages[key]);
+                    delete pages[key];
+                }
+            }
+        }
+
+        element.addEventListener("scroll", update);
+        load(0);
+    }
+
+    document.addEventListener("DOMContentLoaded", function() {
+        var elements = document.querySelectorAll(".joblog-viewer");
+        for (var i = 0; i < elements.length; ++i)
+            initViewer(elements[i]);
+    });
+})();
@@ -1,4 +1,27 @@
 from .t010_basic import *
+from .t012_dummy import *
+from .t013_logging_handler import *
+from .t014_thread_safe import *
+from .t015_processes import *
+from .t016_children import *
+from .t017_lease import *
+from .t018_wait import *
+from .t019_max_parallel import *
 from .t020_db_updates import *
+from .t021_isolated_writes import *
+from .t022_progress import *
 from .t030_parallel import *
+from .t040_duration_baseline import *
+from .t050_export import *
+from .t060_import import *
+from .t070_instrumentation import *
+from .t080_metrics import *
+from .t085_tail import *
+from .t086_rendering import *
+from .t087_timeline import *
+from .t088_list import *
+from .t090_config import *
+from .t095_routing import *
+from .t096_overdue import *
+from .t097_archive import *
 from .t100_regression import *
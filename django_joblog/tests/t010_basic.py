@@ -20,6 +20,14 @@ class JobLogBasicTestCase(TestCase):
     def setUp(self):
         pass
 
+    def test_package_api(self):
+        import django_joblog
+        for name in django_joblog.__all__:
+            self.assertIn(name, dir(django_joblog))
+            self.assertIsNotNone(getattr(django_joblog, name))
+        with self.assertRaises(AttributeError):
+            django_joblog.NotThere
+
     def test_db_creation(self):
         with JobLogger("test-db-creation"):
             pass
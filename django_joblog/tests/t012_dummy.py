@@ -0,0 +1,68 @@
+import io
+import time
+from contextlib import redirect_stdout
+
+from django.test import TestCase, override_settings
+
+from django_joblog import *
+
+
+class JobLogDummyTestCase(TestCase):
+
+    def _capture(self, func):
+        fp = io.StringIO()
+        with redirect_stdout(fp):
+            func()
+        return fp.getvalue()
+
+    def test_print(self):
+        log = DummyJobLogger("dummy")
+        with JobLoggerContext(log, "ctx"):
+            self.assertEqual("LOG: dummy: ctx: hello\n", self._capture(lambda: log.log("hello")))
+        self.assertEqual("ERR: dummy: bad\n", self._capture(lambda: log.error("bad")))
+
+    def test_buffered(self):
+        with override_settings(JOBLOG_CONFIG={"dummy_buffer_lines": 3, "dummy_flush_interval": 100}):
+            log = DummyJobLogger(output="buffered")
+
+            def _log():
+                log.log("1")
+                log.error("2")
+            self.assertEqual("", self._capture(_log))
+            self.assertEqual("LOG: 1\nERR: 2\nLOG: 3\n", self._capture(lambda: log.log("3")))
+
+            self.assertEqual("", self._capture(lambda: log.log("4")))
+            self.assertEqual("LOG: 4\n", self._capture(log.flush))
+
+    def test_buffered_interval(self):
+        with override_settings(JOBLOG_CONFIG={"dummy_buffer_lines": 100, "dummy_flush_interval": .2}):
+            log = DummyJobLogger(output="buffered")
+            fp = io.StringIO()
+            with redirect_stdout(fp):
+                log.flush()
+                log.log("quiet")
+                self.assertEqual("", fp.getvalue())
+                # written by the timer, without a further line
+                time.sleep(.5)
+            self.assertEqual("LOG: quiet\n", fp.getvalue())
+
+    def test_silent(self):
+        log = DummyJobLogger(output="silent")
+
+        class _NoStr(object):
+            def __str__(self):
+                raise AssertionError("formatted")
+
+        self.assertEqual("", self._capture(lambda: log.log(_NoStr())))
+        self.assertEqual("", self._capture(lambda: log.error(_NoStr())))
+
+    def test_logging(self):
+        log = DummyJobLogger("dummy", output="logging")
+        with self.assertLogs("django_joblog", level="INFO") as logs:
+            log.log("hello")
+            log.error("bad")
+        self.assertEqual(["INFO:django_joblog:dummy: hello", "ERROR:django_joblog:dummy: bad"], logs.output)
+
+    def test_invalid_output(self):
+        with self.assertRaises(ValueError):
+            DummyJobLogger(output="loud")
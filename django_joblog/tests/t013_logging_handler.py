@@ -0,0 +1,56 @@
+import logging
+
+from django.test import TestCase
+
+from django_joblog.models import JobLogModel, db_alias
+from django_joblog import *
+
+
+class _NoStr(object):
+    def __str__(self):
+        raise AssertionError("formatted")
+
+
+class JobLogHandlerTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def setUp(self):
+        self.logger = logging.getLogger("django_joblog.tests.handler")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.handler = JobLogHandler(level=logging.INFO)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_handler(self):
+        self.assertIsNone(get_current_joblogger())
+        with JobLogger("test-handler") as job:
+            self.assertIs(job, get_current_joblogger())
+            self.logger.info("info %s", 1)
+            self.logger.debug("debug %s", _NoStr())
+            self.logger.error("error %s", 2)
+            with JobLoggerContext(job, "ctx"):
+                self.logger.warning("warning")
+        self.assertIsNone(get_current_joblogger())
+
+        model = JobLogModel.objects.using(db_alias()).get(name="test-handler")
+        self.assertEqual("info 1\nctx: warning", model.log_text)
+        self.assertEqual("error 2", model.error_text)
+
+    def test_nested(self):
+        with JobLogger("test-handler-outer", parallel=True) as outer:
+            with JobLogger("test-handler-inner", parallel=True) as inner:
+                self.assertIs(inner, get_current_joblogger())
+                self.logger.info("inner")
+            self.assertIs(outer, get_current_joblogger())
+            self.logger.info("outer")
+
+        self.assertEqual("outer", JobLogModel.objects.using(db_alias()).get(name="test-handler-outer").log_text)
+        self.assertEqual("inner", JobLogModel.objects.using(db_alias()).get(name="test-handler-inner").log_text)
+
+    def test_no_job(self):
+        # neither formatted nor an error
+        self.logger.info("outside %s", _NoStr())
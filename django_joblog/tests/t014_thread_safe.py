@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import TestCase, override_settings
+
+from django_joblog.models import JobLogModel, db_alias
+from django_joblog.impl.threadsafe import ThreadSafeLines
+from django_joblog import *
+
+
+class JobLogThreadSafeTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def test_lines_order(self):
+        lines = ThreadSafeLines()
+        lines.append("a")
+
+        thread = threading.Thread(target=lambda: lines.append("b"))
+        thread.start()
+        thread.join()
+
+        lines.append("c")
+        self.assertEqual(["a", "b", "c"], list(lines))
+        self.assertEqual(3, len(lines))
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog"})
+    def test_thread_pool(self):
+        NUM_WORKERS = 8
+        NUM_LINES = 200
+
+        def _work(job, index):
+            with JobLoggerContext(job, "worker-%s" % index):
+                for i in range(NUM_LINES):
+                    job.log(i)
+                    if i % 50 == 0:
+                        job.error(i)
+
+        with JobLogger("test-thread-safe", thread_safe=True) as job:
+            job.log("start")
+            with JobLoggerContext(job, "main"):
+                with ThreadPoolExecutor(NUM_WORKERS) as pool:
+                    for f in [pool.submit(_work, job, i) for i in range(NUM_WORKERS)]:
+                        f.result()
+                job.log("end")
+
+        model = JobLogModel.objects.using(db_alias()).get(name="test-thread-safe")
+        lines = model.log_text.split("\n")
+        self.assertEqual(NUM_WORKERS * NUM_LINES + 2, len(lines))
+        self.assertEqual("start", lines[0])
+        self.assertEqual("main: end", lines[-1])
+
+        for index in range(NUM_WORKERS):
+            prefix = "worker-%s: " % index
+            self.assertEqual(
+                ["%s%s" % (prefix, i) for i in range(NUM_LINES)],
+                [line for line in lines if line.startswith(prefix)]
+            )
+        self.assertEqual(NUM_WORKERS * 4, len(model.error_text.split("\n")))
@@ -0,0 +1,65 @@
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.test import TestCase, override_settings
+
+from django_joblog.models import JobLogModel, db_alias
+from django_joblog import *
+
+
+def _process_task(args):
+    log, index = args
+    with log:
+        with JobLoggerContext(log, "task-%s" % index):
+            for i in range(10):
+                log.log(i)
+            log.error("error %s" % index)
+    return index
+
+
+class JobLogProcessesTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog"})
+    def test_proxy_pickle(self):
+        with JobLogger("test-process-pickle") as job:
+            with job.process_bridge(flush_interval=10.) as bridge:
+                log = pickle.loads(pickle.dumps(bridge.proxy(tag="copy")))
+                log.log("a")
+                with JobLoggerContext(log, "ctx"):
+                    log.log("b")
+                log.flush()
+
+        model = JobLogModel.objects.using(db_alias()).get(name="test-process-pickle")
+        self.assertEqual("copy: a\ncopy:ctx: b", model.log_text)
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog"})
+    def test_process_pool(self):
+        NUM_TASKS = 4
+
+        with JobLogger("test-processes") as job:
+            job.log("start")
+            with job.process_bridge(batch_size=5) as bridge:
+                with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("fork")) as pool:
+                    results = list(pool.map(_process_task, [(bridge.proxy(), i) for i in range(NUM_TASKS)]))
+            job.log("end")
+
+        self.assertEqual(list(range(NUM_TASKS)), results)
+
+        model = JobLogModel.objects.using(db_alias()).get(name="test-processes")
+        lines = model.log_text.split("\n")
+        self.assertEqual(NUM_TASKS * 10 + 2, len(lines))
+        self.assertEqual("start", lines[0])
+        self.assertEqual("end", lines[-1])
+        for line in lines[1:-1]:
+            self.assertRegex(line, r"^pid-\d+:task-\d+: \d+$")
+
+        error_lines = model.error_text.split("\n")
+        for line in error_lines:
+            self.assertRegex(line, r"^pid-\d+:task-\d+: error \d+$")
+        self.assertEqual(
+            ["task-%s: error %s" % (i, i) for i in range(NUM_TASKS)],
+            sorted(line.split(":", 1)[1] for line in error_lines)
+        )
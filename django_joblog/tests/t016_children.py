@@ -0,0 +1,166 @@
+import io
+import time
+import contextlib
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connections
+from django.contrib import admin
+from django.core.management import call_command
+
+from django_joblog.models import JobLogModel, JobLogStates, db_alias
+from django_joblog import *
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogChildrenTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def test_child(self):
+        with JobLogger("test-pipeline") as job:
+            with job.child("test-pipeline-download") as step:
+                step.log("downloading")
+                with step.child("test-pipeline-unzip") as sub_step:
+                    sub_step.log("unzipping")
+            with job.child("test-pipeline-parse") as step:
+                raise ValueError("parse error")
+
+        pipeline = manager().get(name="test-pipeline")
+        download = manager().get(name="test-pipeline-download")
+        unzip = manager().get(name="test-pipeline-unzip")
+        parse = manager().get(name="test-pipeline-parse")
+
+        self.assertIsNone(pipeline.parent_id)
+        self.assertEqual(pipeline.pk, download.parent_id)
+        self.assertEqual(download.pk, unzip.parent_id)
+        self.assertEqual(pipeline.pk, parse.parent_id)
+        self.assertEqual("downloading", download.log_text)
+        self.assertIsNone(pipeline.log_text)
+        self.assertEqual(JobLogStates.finished.name, pipeline.state)
+        self.assertEqual(JobLogStates.error.name, parse.state)
+        self.assertIsInstance(step.exception, ValueError)
+
+        self.assertEqual(
+            [(0, pipeline.pk), (1, download.pk), (2, unzip.pk), (1, parse.pk)],
+            [(depth, node.pk) for depth, node in pipeline.get_run_tree()]
+        )
+        self.assertEqual(
+            [(0, download.pk), (1, unzip.pk)],
+            [(depth, node.pk) for depth, node in download.get_run_tree()]
+        )
+
+        with contextlib.redirect_stdout(io.StringIO()) as fp:
+            call_command("joblog_show", pipeline.pk)
+        self.assertIn("    #%s test-pipeline-unzip" % unzip.pk, fp.getvalue())
+
+        html = admin.site._registry[JobLogModel].run_tree_decorator(pipeline)
+        self.assertIn("/admin/django_joblog/joblogmodel/%s/change/" % unzip.pk, html)
+        self.assertIn("test-pipeline-unzip", html)
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "ping": True, "ping_interval": .1})
+    def test_child_ping(self):
+        with JobLogger("test-pipeline-ping") as job:
+            with job.child("test-pipeline-ping-step") as step:
+                with step.child("test-pipeline-ping-sub-step") as sub_step:
+                    self.assertIsNone(step._thread)
+                    self.assertIsNone(sub_step._thread)
+                    self.assertEqual([step, sub_step], job._children)
+                    time.sleep(1.5)
+                    self.assertIsNotNone(manager().get(name="test-pipeline-ping-sub-step").duration)
+            self.assertEqual([], job._children)
+
+    def test_children(self):
+        with JobLogger("test-pipeline-batch") as job:
+            with CaptureQueriesContext(connections[db_alias()]) as queries:
+                steps = job.children(["test-pipeline-batch-chunk"] * 3 + ["test-pipeline-batch-report"])
+            waiting = list(
+                manager().filter(parent_id=job._model._model_pk).order_by("pk").values_list("name", "count", "state")
+            )
+            for step in steps[:2]:
+                with step:
+                    step.log("chunk %s" % step._model._model_pk)
+            reserved = list(job._reserved)
+
+        self.assertIsNone(job.exception)
+        queries = [query["sql"] for query in queries if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        # counts, archived counts and the insert, plus the primary keys on some backends
+        self.assertLessEqual(len(queries), 4)
+        self.assertEqual(1, len([sql for sql in queries if sql.startswith("INSERT")]))
+        self.assertEqual(
+            [
+                ("test-pipeline-batch-chunk", 1, JobLogStates.waiting.name),
+                ("test-pipeline-batch-chunk", 2, JobLogStates.waiting.name),
+                ("test-pipeline-batch-chunk", 3, JobLogStates.waiting.name),
+                ("test-pipeline-batch-report", 1, JobLogStates.waiting.name),
+            ],
+            waiting
+        )
+        self.assertEqual(steps[2:], reserved)
+
+        rows = list(manager().filter(parent_id=job._model._model_pk).order_by("pk"))
+        self.assertEqual([steps[0]._model._model_pk, steps[1]._model._model_pk], [row.pk for row in rows[:2]])
+        # steps that did not start keep their entry and count
+        self.assertEqual(
+            [(1, JobLogStates.finished.name), (2, JobLogStates.finished.name),
+             (3, JobLogStates.blocked.name), (1, JobLogStates.blocked.name)],
+            [(row.count, row.state) for row in rows]
+        )
+        self.assertEqual("chunk %s" % rows[1].pk, rows[1].log_text)
+        self.assertIsNotNone(rows[2].date_ended)
+        self.assertEqual([], job._reserved)
+        self.assertIsNone(steps[2]._reserved_entry)
+
+    def test_children_counts(self):
+        with JobLogger("test-pipeline-batch") as job:
+            steps = job.children(["test-pipeline-batch-step"] * 2)
+            with steps[0]:
+                pass
+            with JobLogger("test-pipeline-batch-step", parallel=True):
+                pass
+        with JobLogger("test-pipeline-batch-step", parallel=True):
+            pass
+
+        counts = list(manager().filter(name="test-pipeline-batch-step").order_by("pk").values_list("count", flat=True))
+        self.assertEqual([1, 2, 3, 4], counts)
+
+    def test_children_outside(self):
+        steps = JobLogger("test-pipeline-batch").children(["test-pipeline-batch-chunk"] * 2)
+        self.assertEqual(0, manager().count())
+        with steps[0]:
+            pass
+        self.assertEqual(
+            [("test-pipeline-batch-chunk", 1, JobLogStates.finished.name)],
+            list(manager().values_list("name", "count", "state"))
+        )
+
+
+class JobLogChildrenPingTestCase(TransactionTestCase):
+    """
+    The ping thread writes through it's own connection
+    """
+
+    databases = ("default", "joblog")
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "ping": True, "ping_interval": 1})
+    def test_children_ping(self):
+        with JobLogger("test-pipeline-batch-ping") as job:
+            step, = job.children(["test-pipeline-batch-ping-step"])
+            time.sleep(2.6)
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                JobLogModel.cleanup()
+            model = manager().get(name="test-pipeline-batch-ping-step")
+            with step:
+                pass
+
+        self.assertIsNone(job.exception)
+        # other tests may leave running entries behind, the state of the step is checked below
+        self.assertIn("job(s) running", out.getvalue())
+        self.assertEqual(JobLogStates.waiting.name, model.state)
+        self.assertIsNotNone(model.duration)
+        self.assertEqual(
+            JobLogStates.finished.name, manager().get(name="test-pipeline-batch-ping-step").state
+        )
@@ -0,0 +1,161 @@
+import os
+import time
+import datetime
+import unittest
+import multiprocessing
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.db import connections
+
+from django_joblog.models import JobLogModel, JobLogLockModel, JobLogStates, db_alias
+from django_joblog import *
+
+
+LEASE_CONFIG = {"db_alias": "joblog", "locking": "lease", "lease_duration": 60}
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+def lock_manager():
+    return JobLogLockModel.objects.using(db_alias())
+
+
+def _run_in_process(name, started, hold, wait=None):
+    # the connections of the parent process must not be used after the fork
+    connections.close_all()
+    try:
+        with JobLogger(name, wait=wait):
+            started.set()
+            time.sleep(hold)
+    except JobIsAlreadyRunningError:
+        os._exit(2)
+    os._exit(0)
+
+
+class JobLogLeaseTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    @override_settings(JOBLOG_CONFIG=LEASE_CONFIG)
+    def test_lease(self):
+        with JobLogger("test-lease") as job:
+            lock = lock_manager().get(name="test-lease")
+            self.assertEqual(job._model._model_pk, lock.job_id)
+            self.assertTrue(JobLogModel.is_job_running("test-lease"))
+
+            with self.assertRaises(JobIsAlreadyRunningError):
+                with JobLogger("test-lease"):
+                    pass
+
+        self.assertEqual("", lock_manager().get(name="test-lease").owner)
+        self.assertFalse(JobLogModel.is_job_running("test-lease"))
+        self.assertEqual(
+            [JobLogStates.finished.name, JobLogStates.blocked.name],
+            list(manager().filter(name="test-lease").order_by("pk").values_list("state", flat=True))
+        )
+
+    @override_settings(JOBLOG_CONFIG=LEASE_CONFIG)
+    def test_take_over(self):
+        # a job on a dead node
+        job = JobLogger("test-lease-take-over")
+        job.__enter__()
+        job._thread.stop()
+        dead_pk = job._model._model_pk
+
+        # a running row does not block, an unexpired lease does
+        self.assertTrue(JobLogModel.is_job_running("test-lease-take-over"))
+        lock_manager().filter(name="test-lease-take-over").update(
+            date_expires=timezone.now() - datetime.timedelta(seconds=1)
+        )
+        self.assertFalse(JobLogLockModel.is_locked("test-lease-take-over"))
+
+        with JobLogger("test-lease-take-over") as job2:
+            self.assertEqual(job2._model._model_pk, lock_manager().get(name="test-lease-take-over").job_id)
+
+        self.assertEqual(JobLogStates.vanished.name, manager().get(pk=dead_pk).state)
+        self.assertEqual(JobLogStates.finished.name, manager().get(pk=job2._model._model_pk).state)
+
+        # the dead job notices the loss on it's next heartbeat
+        self.assertEqual("", lock_manager().get(name="test-lease-take-over").owner)
+        lock_manager().filter(name="test-lease-take-over").update(
+            owner="other", date_expires=timezone.now() + datetime.timedelta(seconds=60),
+        )
+        job._model.ping()
+        self.assertFalse(job._model.has_lease)
+        self.assertIn("taken over", job.get_error_text())
+        self.assertTrue(lock_manager().filter(name="test-lease-take-over", owner="other").exists())
+        job.__exit__(None, None, None)
+
+    @override_settings(JOBLOG_CONFIG=LEASE_CONFIG)
+    def test_heartbeat(self):
+        with JobLogger("test-lease-heartbeat") as job:
+            # the lease is renewed by the ping thread
+            self.assertIsNotNone(job._thread)
+            expires = lock_manager().get(name="test-lease-heartbeat").date_expires
+            time.sleep(.01)
+            job._model.ping()
+            self.assertGreater(lock_manager().get(name="test-lease-heartbeat").date_expires, expires)
+            self.assertTrue(job._model.has_lease)
+
+    @override_settings(JOBLOG_CONFIG=LEASE_CONFIG)
+    def test_parallel_job(self):
+        # jobs with parallel=True take no lease but are running
+        with JobLogger("test-lease-parallel", parallel=True):
+            self.assertFalse(JobLogLockModel.is_locked("test-lease-parallel"))
+            self.assertTrue(JobLogModel.is_job_running("test-lease-parallel"))
+        self.assertFalse(JobLogModel.is_job_running("test-lease-parallel"))
+
+
+@unittest.skipIf(
+    connections["joblog"].vendor == "sqlite" and connections["joblog"].is_in_memory_db(),
+    "processes can not share an in-memory database"
+)
+class JobLogLeaseProcessesTestCase(TransactionTestCase):
+    """
+    Node failover with real processes, the lease holder is killed while it runs
+    """
+    databases = ("default", "joblog")
+
+    @override_settings(JOBLOG_CONFIG={
+        "db_alias": "joblog", "locking": "lease", "lease_duration": 1, "ping_interval": .2,
+        "wait_poll_interval": .2,
+    })
+    def test_take_over(self):
+        NAME = "test-lease-processes"
+        context = multiprocessing.get_context("fork")
+        connections.close_all()
+
+        started = context.Event()
+        holder = context.Process(target=_run_in_process, args=(NAME, started, 60))
+        holder.start()
+        self.assertTrue(started.wait(10))
+        holder_pk = manager().get(name=NAME).pk
+
+        # the holder renews it's lease
+        time.sleep(1.5)
+        self.assertTrue(JobLogLockModel.is_locked(NAME))
+        with self.assertRaises(JobIsAlreadyRunningError):
+            with JobLogger(NAME):
+                pass
+
+        holder.kill()
+        holder.join()
+        killed_at = time.time()
+
+        # the next process waits for the lease to expire and takes over
+        taker = context.Process(target=_run_in_process, args=(NAME, context.Event(), 0, 10))
+        taker.start()
+        taker.join(20)
+        self.assertEqual(0, taker.exitcode)
+        # within one lease duration, plus the start of the process
+        self.assertLess(time.time() - killed_at, 1 + 3)
+
+        self.assertEqual(JobLogStates.vanished.name, manager().get(pk=holder_pk).state)
+        self.assertEqual(
+            [JobLogStates.vanished.name, JobLogStates.blocked.name, JobLogStates.finished.name],
+            list(manager().filter(name=NAME).order_by("pk").values_list("state", flat=True))
+        )
+        self.assertFalse(JobLogLockModel.is_locked(NAME))
@@ -0,0 +1,157 @@
+import time
+import datetime
+import threading
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.db import connections, transaction
+
+from django_joblog.models import JobLogModel, JobLogLockModel, JobLogStates, db_alias
+from django_joblog import *
+
+
+WAIT_CONFIG = {"db_alias": "joblog", "wait_poll_interval": .1}
+LEASE_CONFIG = dict(WAIT_CONFIG, locking="lease", lease_duration=60)
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogWaitTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    @override_settings(JOBLOG_CONFIG=WAIT_CONFIG)
+    def test_wait_timeout(self):
+        manager().create(name="test-wait-timeout")
+
+        start = time.time()
+        with self.assertRaises(JobIsAlreadyRunningError):
+            with JobLogger("test-wait-timeout", wait=.5):
+                pass
+        self.assertGreaterEqual(time.time() - start, .5)
+
+        # the waiting entry is turned into the blocked entry
+        self.assertEqual(
+            [JobLogStates.running.name, JobLogStates.blocked.name],
+            list(manager().filter(name="test-wait-timeout").order_by("pk").values_list("state", flat=True))
+        )
+        blocked = manager().filter(name="test-wait-timeout").order_by("pk").last()
+        self.assertIsNotNone(blocked.date_ended)
+        self.assertGreaterEqual(blocked.duration.total_seconds(), .5)
+
+    @override_settings(JOBLOG_CONFIG=LEASE_CONFIG)
+    def test_wait_lease(self):
+        holder = JobLogger("test-wait-lease")
+        holder.__enter__()
+        holder._thread.stop()
+        JobLogLockModel.objects.using(db_alias()).filter(name="test-wait-lease").update(
+            date_expires=timezone.now() + datetime.timedelta(seconds=.3)
+        )
+
+        with JobLogger("test-wait-lease", wait=5) as job:
+            job.log("ran after waiting")
+
+        self.assertEqual(
+            [JobLogStates.vanished.name, JobLogStates.finished.name],
+            list(manager().filter(name="test-wait-lease").order_by("pk").values_list("state", flat=True))
+        )
+        holder.__exit__(None, None, None)
+
+    @override_settings(JOBLOG_CONFIG=WAIT_CONFIG)
+    def test_lock_row(self):
+        lock_manager = JobLogLockModel.objects.using(db_alias())
+        with JobLogger("test-lock-row"):
+            pass
+        self.assertEqual([JobLogLockModel.LOCK_SLOT], list(
+            lock_manager.filter(name="test-lock-row").values_list("slot", flat=True)
+        ))
+        self.assertFalse(JobLogLockModel.is_locked("test-lock-row", time_delta=datetime.timedelta(minutes=1)))
+
+        # the lease slots of the same name are not touched
+        self.assertTrue(JobLogLockModel.acquire("test-lock-row", "owner", 60))
+        acquired = lock_manager.get(name="test-lock-row", slot=0).date_acquired
+        with transaction.atomic(using=db_alias()):
+            JobLogLockModel.lock("test-lock-row")
+        self.assertEqual(acquired, lock_manager.get(name="test-lock-row", slot=0).date_acquired)
+        self.assertFalse(JobLogLockModel.acquire("test-lock-row", "other-owner", 60))
+
+    @override_settings(JOBLOG_CONFIG=WAIT_CONFIG)
+    def test_coalesce(self):
+        manager().create(name="test-coalesce", count=1)
+        waiting = manager().create(name="test-coalesce", count=2, state=JobLogStates.waiting.name)
+
+        with self.assertRaises(JobCoalescedError):
+            with JobLogger("test-coalesce", wait=5, coalesce=True):
+                pass
+        # the coalesced entry is kept with it's count
+        self.assertEqual(
+            [(1, JobLogStates.running.name), (2, JobLogStates.waiting.name), (3, JobLogStates.blocked.name)],
+            list(manager().filter(name="test-coalesce").order_by("pk").values_list("count", "state"))
+        )
+        self.assertIsNotNone(manager().get(name="test-coalesce", count=3).date_ended)
+
+        # a waiter that stopped sending heartbeats is ignored
+        manager().filter(pk=waiting.pk).update(date_started=timezone.now() - datetime.timedelta(minutes=1))
+        with self.assertRaises(JobIsAlreadyRunningError) as e:
+            with JobLogger("test-coalesce", wait=.3, coalesce=True):
+                pass
+        self.assertNotIsInstance(e.exception, JobCoalescedError)
+        self.assertEqual(2, manager().filter(name="test-coalesce", state=JobLogStates.blocked.name).count())
+
+
+class JobLogWaitThreadsTestCase(TransactionTestCase):
+
+    databases = ("default", "joblog")
+
+    @override_settings(JOBLOG_CONFIG=WAIT_CONFIG)
+    def test_one_waiter_starts(self):
+        NUM_WAITERS = 3
+        running = manager().create(name="test-wait-threads")
+        lock = threading.Lock()
+        active = []
+        max_active = []
+        results = []
+
+        def _waiter():
+            try:
+                with JobLogger("test-wait-threads", wait=20):
+                    with lock:
+                        active.append(1)
+                        max_active.append(len(active))
+                    time.sleep(.3)
+                    with lock:
+                        active.pop()
+                results.append(True)
+            except JobIsAlreadyRunningError:
+                results.append(False)
+            finally:
+                connections.close_all()
+
+        is_job_running = JobLogModel.is_job_running
+
+        def _slow_is_job_running(*args, **kwargs):
+            result = is_job_running(*args, **kwargs)
+            # widen the gap between the check and the start
+            if not result:
+                time.sleep(.2)
+            return result
+
+        threads = [threading.Thread(target=_waiter) for i in range(NUM_WAITERS)]
+        with mock.patch.object(JobLogModel, "is_job_running", side_effect=_slow_is_job_running):
+            for thread in threads:
+                thread.start()
+            time.sleep(.5)
+            manager().filter(pk=running.pk).update(state=JobLogStates.finished.name)
+            for thread in threads:
+                thread.join()
+
+        # all waiters ran, one after another
+        self.assertEqual([True] * NUM_WAITERS, results)
+        self.assertEqual(1, max(max_active))
+        self.assertEqual(
+            NUM_WAITERS,
+            manager().filter(name="test-wait-threads", state=JobLogStates.finished.name).exclude(pk=running.pk).count()
+        )
@@ -0,0 +1,78 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from django_joblog.models import JobLogModel, JobLogLockModel, JobLogStates, db_alias
+from django_joblog import *
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+def lock_manager():
+    return JobLogLockModel.objects.using(db_alias())
+
+
+class JobLogMaxParallelTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog"})
+    def test_max_parallel(self):
+        jobs = [JobLogger("test-max-parallel", max_parallel=3) for i in range(3)]
+        for job in jobs:
+            job.__enter__()
+
+        self.assertEqual(
+            [0, 1, 2],
+            sorted(lock_manager().filter(name="test-max-parallel").exclude(owner="").values_list("slot", flat=True))
+        )
+        self.assertEqual(
+            sorted(job._model._model_pk for job in jobs),
+            sorted(lock_manager().filter(name="test-max-parallel").values_list("job_id", flat=True))
+        )
+
+        with self.assertRaises(JobIsAlreadyRunningError):
+            with JobLogger("test-max-parallel", max_parallel=3):
+                pass
+
+        jobs[1].__exit__(None, None, None)
+        with JobLogger("test-max-parallel", max_parallel=3) as job:
+            job.log("in the free slot")
+
+        for job in jobs[::2]:
+            job.__exit__(None, None, None)
+
+        self.assertEqual(3, lock_manager().filter(name="test-max-parallel", owner="").count())
+        self.assertEqual(
+            {JobLogStates.finished.name: 4, JobLogStates.blocked.name: 1},
+            {
+                state: manager().filter(name="test-max-parallel", state=state).count()
+                for state in (JobLogStates.finished.name, JobLogStates.blocked.name)
+            }
+        )
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog"})
+    def test_expired_slot(self):
+        jobs = [JobLogger("test-max-parallel-expired", max_parallel=2) for i in range(2)]
+        for job in jobs:
+            job.__enter__()
+            job._thread.stop()
+
+        # the holder of slot 0 died
+        dead = lock_manager().get(name="test-max-parallel-expired", slot=0)
+        lock_manager().filter(pk=dead.pk).update(date_expires=timezone.now() - datetime.timedelta(seconds=1))
+
+        with JobLogger("test-max-parallel-expired", max_parallel=2) as job:
+            self.assertEqual(0, lock_manager().get(name="test-max-parallel-expired", job_id=job._model._model_pk).slot)
+
+        self.assertEqual(JobLogStates.vanished.name, manager().get(pk=dead.job_id).state)
+
+        for job in jobs:
+            job.__exit__(None, None, None)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            JobLogger("test-max-parallel-invalid", max_parallel=0)
@@ -0,0 +1,54 @@
+import unittest
+import warnings
+
+from django.conf import settings
+from django.test import TransactionTestCase, override_settings
+from django.db import transaction, connections
+
+from django_joblog.models import JobLogModel, JobLogStates, db_alias
+from django_joblog import *
+
+
+ISOLATED_CONFIG = {"db_alias": "joblog", "isolated_writes": True, "live_updates": True}
+
+
+@unittest.skipUnless("joblog_isolated" in settings.DATABASES, "needs a 'joblog_isolated' database alias")
+@override_settings(JOBLOG_CONFIG=ISOLATED_CONFIG)
+class JobLogIsolatedWritesTestCase(TransactionTestCase):
+    """
+    Uses the `joblog_isolated` alias of django_joblog_project, an autocommit connection to the `joblog` database
+    """
+    databases = ("default", "joblog", "joblog_isolated")
+
+    def test_alias(self):
+        alias = db_alias()
+        self.assertEqual("joblog_isolated", alias)
+        self.assertTrue(connections.databases[alias]["AUTOCOMMIT"])
+        self.assertIsNot(connections["joblog"], connections[alias])
+
+        with override_settings(JOBLOG_CONFIG=dict(ISOLATED_CONFIG, isolated_writes="default")):
+            self.assertEqual("default", db_alias())
+
+        # aliases are not added on demand
+        databases = set(connections.databases)
+        with override_settings(JOBLOG_CONFIG=dict(ISOLATED_CONFIG, isolated_writes="unknown")):
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                self.assertEqual("joblog", db_alias())
+                self.assertEqual(1, len(w))
+        self.assertEqual(databases, set(connections.databases))
+
+    def test_job_transaction(self):
+        with transaction.atomic(using="joblog"):
+            with JobLogger("test-isolated-writes") as job:
+                job.log("inside the transaction")
+                pk = job._model._model_pk
+                # the live update is visible to other connections while the job's transaction is open
+                self.assertEqual(
+                    "inside the transaction",
+                    JobLogModel.objects.using("default").get(pk=pk).log_text
+                )
+            transaction.set_rollback(True, using="joblog")
+
+        # the job's rollback does not undo the job log
+        self.assertEqual(JobLogStates.finished.name, JobLogModel.objects.using("joblog").get(pk=pk).state)
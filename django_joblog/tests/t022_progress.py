@@ -0,0 +1,77 @@
+import io
+import time
+import contextlib
+
+from django.test import TestCase, override_settings
+from django.contrib import admin
+from django.core.management import call_command
+from django.utils import timezone
+
+from django_joblog.models import JobLogModel, db_alias
+from django_joblog.impl.progress import ProgressMeter, format_progress
+from django_joblog import *
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogProgressTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def test_meter(self):
+        meter = ProgressMeter()
+        meter.set(0, 100)
+        self.assertIsNone(meter.rate)
+        self.assertIsNone(meter.eta)
+        time.sleep(.05)
+        meter.set(50, 100)
+        self.assertGreater(meter.rate, 0)
+        self.assertGreater(meter.eta, timezone.now())
+
+        self.assertEqual("", format_progress(None))
+        self.assertEqual("5", format_progress(5))
+        self.assertEqual("[##  ] 5/10 (50.0%), 2.5/s", format_progress(5, 10, 2.5, bar_width=4))
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "ping_interval": 1000})
+    def test_throttled_writes(self):
+        with JobLogger("test-progress") as job:
+            pk = job._model._model_pk
+            with self.assertNumQueries(1, using=db_alias()):
+                job.progress(0, 100)
+            with self.assertNumQueries(0, using=db_alias()):
+                for i in range(1, 50):
+                    job.progress(i, 100)
+            self.assertEqual((0, 100), manager().filter(pk=pk).values_list("progress_done", "progress_total")[0])
+            self.assertEqual(49, job.get_progress()["done"])
+
+        model = manager().get(pk=pk)
+        self.assertEqual((49, 100), (model.progress_done, model.progress_total))
+        self.assertIsNotNone(model.progress_rate)
+        self.assertIsNone(model.progress_eta)
+        self.assertIsNone(model.log_text)
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            call_command("joblog_list", name=["test-progress"])
+        self.assertIn("[#####     ] 49/100 (49.0%)", out.getvalue())
+        self.assertIn("<progress", admin.site._registry[JobLogModel].progress_decorator(model))
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "ping_interval": 1000, "live_updates": True})
+    def test_live_update(self):
+        with JobLogger("test-progress-live") as job:
+            job.progress(1, 10)
+            job.progress(2, 10)
+            job.log("two")
+            self.assertEqual(2, manager().get(pk=job._model._model_pk).progress_done)
+
+    @override_settings(JOBLOG_CONFIG={"ping_interval": 1000})
+    def test_dummy(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            log = DummyJobLogger()
+            for i in range(4):
+                log.progress(i, 3)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].startswith("LOG: progress 0/3 (0.0%)"))
+        self.assertTrue(lines[1].startswith("LOG: progress 3/3 (100.0%)"))
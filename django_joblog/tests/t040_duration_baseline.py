@@ -0,0 +1,56 @@
+import time
+
+from django.test import TestCase
+
+from django_joblog.models import JobLogModel, JobLogStatsModel, db_alias
+from django_joblog.impl.DurationBaseline import DurationBaseline
+from django_joblog.signals import job_slow
+from django_joblog import *
+
+
+class JobLogDurationBaselineTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def test_baseline(self):
+        baseline = DurationBaseline()
+        for i in range(200):
+            baseline.add(10. + (i % 5), alpha=.1)
+
+        self.assertEqual(200, baseline.num_samples)
+        self.assertAlmostEqual(12., baseline.mean, delta=1.)
+        self.assertLess(baseline.quantiles[0], baseline.quantiles[2])
+        self.assertGreater(baseline.quantiles[2], 12.)
+
+        self.assertFalse(baseline.is_slow(13., factor=3., zscore=4.))
+        self.assertTrue(baseline.is_slow(40., factor=3.))
+        self.assertTrue(baseline.is_slow(20., zscore=4.))
+        self.assertFalse(baseline.is_slow(40., factor=3., min_samples=1000))
+
+    def test_slow_job(self):
+        JOB_NAME = "test-slow-job"
+        JobLogStatsModel.objects.using(db_alias()).create(
+            name=JOB_NAME, num_samples=100, duration_mean=.1, duration_variance=.0025,
+        )
+
+        received = []
+
+        def _receiver(sender, joblog, model, **kwargs):
+            received.append(model.pk)
+
+        job_slow.connect(_receiver)
+        try:
+            with JobLogger(JOB_NAME):
+                pass
+            with JobLogger(JOB_NAME):
+                time.sleep(1.)
+        finally:
+            job_slow.disconnect(_receiver)
+
+        qset = JobLogModel.objects.using(db_alias()).filter(name=JOB_NAME).order_by("count")
+        self.assertEqual([False, True], [m.is_slow for m in qset])
+        self.assertEqual([qset[1].pk], received)
+
+        stats = JobLogStatsModel.objects.using(db_alias()).get(name=JOB_NAME)
+        self.assertEqual(102, stats.num_samples)
+        self.assertGreaterEqual(stats.last_duration, 1.)
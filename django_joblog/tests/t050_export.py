@@ -0,0 +1,124 @@
+import os
+import csv
+import json
+import shutil
+import datetime
+import tempfile
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+
+from django_joblog.models import JobLogModel, JobLogStates, db_alias
+from django_joblog.impl.keyset import iter_keyset
+from django_joblog.impl.JobModelAbstraction import JobModelAbstraction
+from django_joblog import *
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogExportTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _export(self, *args):
+        filename = os.path.join(self.path, "export")
+        call_command("joblog_export", "-o", filename, *args)
+        with open(filename) as fp:
+            return fp.read()
+
+    def test_keyset(self):
+        now = timezone.now()
+        for i in range(7):
+            manager().create(name="test-keyset", count=i + 1, date_started=now)
+
+        rows = list(iter_keyset(manager().filter(name="test-keyset"), ["count"], chunk_size=3))
+        self.assertEqual(list(range(1, 8)), [r[0] for r in rows])
+
+        rows = list(iter_keyset(manager().filter(name="test-keyset"), ["count"], chunk_size=3, descending=True))
+        self.assertEqual(list(reversed(range(1, 8))), [r[0] for r in rows])
+
+    def test_jsonl(self):
+        for i in range(3):
+            with JobLogger("test-export") as job:
+                job.log("line %s" % i)
+
+        rows = [json.loads(line) for line in self._export("--chunk-size", "2", "-n", "test-export").splitlines()]
+        self.assertEqual([1, 2, 3], [r["count"] for r in rows])
+        self.assertEqual("line 2", rows[-1]["log_text"])
+        self.assertEqual(JobLogStates.finished.name, rows[-1]["state"])
+
+        rows = [json.loads(line) for line in self._export("--no-text", "-s", "error", "-n", "test-export").splitlines()]
+        self.assertEqual([], rows)
+
+    def test_csv(self):
+        with JobLogger("test-export-csv") as job:
+            job.log("a, b\nc")
+
+        rows = list(csv.reader(self._export("-f", "csv", "-n", "test-export-csv").splitlines(True)))
+        self.assertEqual("name", rows[0][1])
+        self.assertEqual(2, len(rows))
+        self.assertEqual("a, b\nc", rows[1][rows[0].index("log_text")])
+
+    def test_watermark(self):
+        watermark = os.path.join(self.path, "watermark")
+        with JobLogger("test-export-watermark"):
+            pass
+
+        self.assertEqual(1, len(self._export("-w", watermark, "-n", "test-export-watermark").splitlines()))
+        self.assertEqual(0, len(self._export("-w", watermark, "-n", "test-export-watermark").splitlines()))
+
+        with JobLogger("test-export-watermark"):
+            pass
+        with JobLogger("test-export-watermark"):
+            rows = [json.loads(line) for line in self._export("-w", watermark, "-n", "test-export-watermark").splitlines()]
+            # the running job is held back
+            self.assertEqual([2], [r["count"] for r in rows])
+
+        rows = [json.loads(line) for line in self._export("-w", watermark, "-n", "test-export-watermark").splitlines()]
+        self.assertEqual([3], [r["count"] for r in rows])
+
+    def test_watermark_waiting(self):
+        watermark = os.path.join(self.path, "watermark")
+        args = ("-w", watermark, "-n", "test-export-watermark-wait")
+        waiter = JobModelAbstraction(JobLogger("test-export-watermark-wait", wait=1))
+        waiter._create_model(state=JobLogStates.waiting.name)
+        with JobLogger("test-export-watermark-wait", parallel=True):
+            pass
+
+        # the waiting job holds back the watermark
+        self.assertEqual([], self._export(*args).splitlines())
+
+        # it gets a new date_started when it starts, later than the job that ran meanwhile
+        waiter._start()
+        exported = [json.loads(line)["count"] for line in self._export(*args).splitlines()]
+        self.assertEqual([2], exported)
+
+        waiter.finish()
+        exported += [json.loads(line)["count"] for line in self._export(*args).splitlines()]
+        self.assertEqual([2, 1], exported)
+
+    def test_watermark_state(self):
+        watermark = os.path.join(self.path, "watermark")
+        now = timezone.now()
+        first = manager().create(name="test-export-watermark-state", count=1, date_started=now)
+        manager().create(
+            name="test-export-watermark-state", count=2, date_started=now + datetime.timedelta(seconds=1),
+            state=JobLogStates.error.name,
+        )
+        args = ("-w", watermark, "-n", "test-export-watermark-state", "-s", "error")
+
+        # the running job does not match the state but still holds back the watermark
+        self.assertEqual([], self._export(*args).splitlines())
+
+        manager().filter(pk=first.pk).update(state=JobLogStates.error.name)
+        rows = [json.loads(line) for line in self._export(*args).splitlines()]
+        self.assertEqual([1, 2], [r["count"] for r in rows])
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+
+from django.utils import timezone
+
+from django.test import TestCase
+from django.core.management import call_command
+
+from django_joblog.models import JobLogModel, db_alias
+from django_joblog import *
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogImportTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.filename = os.path.join(self.path, "export.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_export_import(self):
+        for i in range(3):
+            with JobLogger("test-import") as job:
+                job.log("line %s" % i)
+        call_command("joblog_export", "-o", self.filename, "-n", "test-import")
+        qset = manager().filter(name="test-import").order_by("pk")
+        exported = list(qset.values_list("pk", "name", "count", "date_started", "log_text"))
+
+        qset.delete()
+        call_command("joblog_import", self.filename, "--batch-size", "2")
+        imported = list(qset.values_list("pk", "name", "count", "date_started", "log_text"))
+        self.assertEqual(exported, imported)
+
+        call_command("joblog_import", self.filename, "--skip-duplicates")
+        self.assertEqual(3, qset.count())
+
+        call_command("joblog_import", self.filename, "--new-pk", "--renumber")
+        self.assertEqual(
+            [1, 2, 3, 4, 5, 6],
+            list(manager().filter(name="test-import").order_by("pk").values_list("count", flat=True))
+        )
+
+    def test_export_import_fields(self):
+        with JobLogger("test-import-fields") as job:
+            with job.child("test-import-fields-step") as step:
+                pass
+        eta = timezone.now().replace(microsecond=0)
+        manager().filter(pk=step._model._model_pk).update(
+            progress_done=5, progress_total=10, progress_rate=2.5, progress_eta=eta,
+        )
+        fields = ("pk", "parent_id", "progress_done", "progress_total", "progress_rate", "progress_eta")
+        qset = manager().filter(name__startswith="test-import-fields").order_by("pk")
+        exported = list(qset.values_list(*fields))
+
+        call_command("joblog_export", "-o", self.filename, "-n", "test-import-fields", "test-import-fields-step")
+        qset.delete()
+        call_command("joblog_import", self.filename)
+        self.assertEqual(exported, list(qset.values_list(*fields)))
+        self.assertEqual(job._model._model_pk, exported[1][1])
+
+        # a parent that is not imported is dropped
+        call_command("joblog_export", "-o", self.filename, "-n", "test-import-fields-step")
+        qset.delete()
+        call_command("joblog_import", self.filename)
+        self.assertIsNone(manager().get(name="test-import-fields-step").parent_id)
+
+    def test_generate(self):
+        call_command("joblog_import", "--generate", "100", "--names", "3", "--seed", "23")
+        qset = manager().filter(name__startswith="synthetic-job-")
+        self.assertEqual(100, qset.count())
+        self.assertEqual(3, qset.values("name").distinct().count())
+        for name in qset.values_list("name", flat=True).distinct():
+            num = manager().filter(name=name).count()
+            self.assertEqual(
+                list(range(1, num + 1)),
+                list(manager().filter(name=name).order_by("date_started").values_list("count", flat=True))
+            )
@@ -0,0 +1,75 @@
+import socket
+
+from django.test import TestCase, override_settings
+
+from django_joblog import instrumentation
+from django_joblog.instrumentation import CounterSink, SignalSink, StatsdSink
+from django_joblog.signals import instrumentation_event
+from django_joblog import *
+
+
+class JobLogInstrumentationTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def tearDown(self):
+        instrumentation.set_sinks(None)
+
+    def test_disabled(self):
+        instrumentation.set_sinks(None)
+        self.assertEqual([], instrumentation.get_sinks())
+
+    def test_counter_sink(self):
+        sink = CounterSink()
+        instrumentation.set_sinks([sink])
+
+        with JobLogger("test-instrumentation") as job:
+            job.log("one")
+            job.log("two")
+            job.error("three")
+
+        counters = sink.snapshot()
+        self.assertEqual(2, counters["log"]["count"])
+        self.assertEqual(1, counters["error"]["count"])
+        self.assertEqual(1, counters["create_model"]["count"])
+        self.assertEqual(1, counters["finish"]["count"])
+        self.assertEqual(2, sum(counters["log"]["buckets"]))
+
+        text = sink.render_prometheus()
+        self.assertIn('joblog_operation_seconds_count{operation="log"} 2', text)
+        self.assertIn('joblog_operation_seconds_bucket{operation="log",le="+Inf"} 2', text)
+
+    def test_settings(self):
+        with override_settings(JOBLOG_CONFIG={
+            "db_alias": "joblog",
+            "instrumentation": ["django_joblog.instrumentation.SignalSink"],
+        }):
+            self.assertIsInstance(instrumentation.get_sink(SignalSink), SignalSink)
+
+            received = []
+
+            def _receiver(sender, operation, seconds, **kwargs):
+                received.append(operation)
+
+            instrumentation_event.connect(_receiver)
+            try:
+                with JobLogger("test-instrumentation-signal") as job:
+                    job.log("one")
+            finally:
+                instrumentation_event.disconnect(_receiver)
+
+            self.assertIn("log", received)
+            self.assertIn("finish", received)
+
+        self.assertIsNone(instrumentation.get_sink(SignalSink))
+
+    def test_statsd_sink(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(2)
+        try:
+            sink = StatsdSink(host="127.0.0.1", port=server.getsockname()[1], prefix="test")
+            sink.record("log", .0015)
+            self.assertEqual(b"test.log:1.500|ms", server.recv(1024))
+        finally:
+            server.close()
@@ -0,0 +1,54 @@
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from django_joblog.models import JobLogModel, JobLogStatsModel, db_alias
+from django_joblog import *
+
+
+class JobLogMetricsTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def setUp(self):
+        cache.clear()
+
+    def _get_metrics(self):
+        response = self.client.get(reverse("django_joblog:metrics"))
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode("utf-8")
+
+    def test_metrics(self):
+        with JobLogger("test-metrics"):
+            pass
+        with JobLogger("test-metrics"):
+            raise ValueError("Bad")
+        JobLogModel.objects.using(db_alias()).create(name='test-"metrics"-running')
+
+        text = self._get_metrics()
+        self.assertIn('joblog_running_jobs{name="test-metrics"} 0', text)
+        self.assertIn('joblog_running_jobs{name="test-\\"metrics\\"-running"} 1', text)
+        self.assertIn('joblog_finished_total{name="test-metrics"} 1', text)
+        self.assertIn('joblog_errors_total{name="test-metrics"} 1', text)
+        self.assertIn('joblog_vanished_total{name="test-metrics"} 0', text)
+
+        stats = JobLogStatsModel.objects.using(db_alias()).get(name="test-metrics")
+        self.assertIn('joblog_last_duration_seconds{name="test-metrics"} %s' % stats.last_duration, text)
+
+        # served from cache
+        with JobLogger("test-metrics"):
+            pass
+        self.assertEqual(text, self._get_metrics())
+
+        cache.clear()
+        self.assertIn('joblog_finished_total{name="test-metrics"} 2', self._get_metrics())
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "metrics_token": "secret"})
+    def test_token(self):
+        url = reverse("django_joblog:metrics")
+        self.assertEqual(403, self.client.get(url).status_code)
+        self.assertEqual(403, self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code)
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(200, response.status_code)
+        self.assertIn("joblog_running_jobs", response.content.decode("utf-8"))
@@ -0,0 +1,72 @@
+import io
+import json
+import contextlib
+
+from django.test import TestCase, RequestFactory
+from django.contrib.auth.models import User, AnonymousUser
+from django.core.management import call_command
+from django.urls import reverse
+
+from django_joblog.models import JobLogModel, JobLogStates, db_alias
+from django_joblog.impl.tail import get_tail
+from django_joblog import views
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogTailTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def _get(self, pk, user=None, **params):
+        request = RequestFactory().get(reverse("django_joblog:tail", args=(pk, )), params)
+        request.user = user or User(username="staff", is_staff=True, is_active=True)
+        return views.tail(request, pk=pk)
+
+    def test_get_tail(self):
+        job = manager().create(name="test-tail", log_text="a\nb")
+
+        tail = get_tail(job.pk)
+        self.assertEqual(["a", "b"], tail["log"]["lines"])
+        self.assertEqual(3, tail["log"]["offset"])
+        self.assertEqual([], tail["error"]["lines"])
+        self.assertEqual(0, tail["error"]["offset"])
+        self.assertTrue(tail["running"])
+
+        manager().filter(pk=job.pk).update(log_text="a\nb\nc\nd", error_text="x")
+        tail = get_tail(job.pk, 3, 0)
+        self.assertEqual(["c", "d"], tail["log"]["lines"])
+        self.assertEqual(["x"], tail["error"]["lines"])
+        self.assertEqual(7, tail["log"]["offset"])
+
+        tail = get_tail(job.pk, 7, 1)
+        self.assertEqual([], tail["log"]["lines"])
+        self.assertEqual([], tail["error"]["lines"])
+
+        # offset beyond the text starts from the beginning
+        self.assertEqual(["a", "b", "c", "d"], get_tail(job.pk, 100, 1)["log"]["lines"])
+
+        self.assertIsNone(get_tail(job.pk + 1000))
+
+    def test_view(self):
+        job = manager().create(name="test-tail-view", log_text="a\nb")
+
+        data = json.loads(self._get(job.pk).content.decode("utf-8"))
+        self.assertEqual(["a", "b"], data["log"]["lines"])
+
+        # long-polling returns after the timeout when nothing happens
+        data = json.loads(self._get(job.pk, log_offset=data["log"]["offset"], wait=.3).content.decode("utf-8"))
+        self.assertEqual([], data["log"]["lines"])
+
+        self.assertEqual(400, self._get(job.pk, wait="x").status_code)
+        self.assertEqual(302, self._get(job.pk, user=AnonymousUser()).status_code)
+
+    def test_command(self):
+        job = manager().create(
+            name="test-tail-command", log_text="a\nb", error_text="x", state=JobLogStates.finished.name,
+        )
+        with contextlib.redirect_stdout(io.StringIO()) as fp:
+            call_command("joblog_tail", job.pk, "--follow")
+        self.assertEqual("a\nb\nERR: x\n--- test-tail-command.%s finished\n" % job.pk, fp.getvalue())
@@ -0,0 +1,89 @@
+import json
+
+from django.test import TestCase, RequestFactory
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from django_joblog.models import JobLogModel, JobLogStates, db_alias
+from django_joblog.impl.rendering import render_lines, get_page, PAGE_LINES
+from django_joblog import admin as joblog_admin
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogRenderingTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def setUp(self):
+        cache.clear()
+        self.admin = admin.site._registry[JobLogModel]
+        self.request = RequestFactory().get("/")
+        self.request.user = User(username="admin", is_superuser=True, is_staff=True, is_active=True)
+
+    def test_render_lines(self):
+        self.assertEqual("-", render_lines(None))
+        self.assertEqual(
+            "a &lt;b&gt;<br>&nbsp;&nbsp;c<br>&nbsp;&nbsp;&nbsp;d e<br>  ",
+            render_lines("a <b>\n  c\n\t d e\n  ")
+        )
+        self.assertEqual(
+            '<span style="white-space: nowrap">a</span><br><span style="white-space: nowrap">&nbsp;b</span>',
+            render_lines("a\n b", False)
+        )
+
+    def test_page(self):
+        lines = ["line %s" % i for i in range(PAGE_LINES + 10)]
+        job = manager().create(name="test-page", log_text="\n".join(lines), state=JobLogStates.finished.name)
+
+        data = get_page(job.pk, "log_text", 1)
+        self.assertEqual(PAGE_LINES + 10, data["total"])
+        self.assertEqual(lines[PAGE_LINES:], data["lines"])
+        self.assertEqual([], get_page(job.pk, "error_text", 0)["lines"])
+        self.assertIsNone(get_page(job.pk + 1000, "log_text", 0))
+
+        # pages of ended jobs are cached, changed texts get a new key
+        manager().filter(pk=job.pk).update(log_text="<changed>")
+        self.assertEqual(["&lt;changed&gt;"], get_page(job.pk, "log_text", 0)["lines"])
+
+        response = self.admin.page_view(self.request, job.pk, "log")
+        self.assertEqual(["&lt;changed&gt;"], json.loads(response.content.decode("utf-8"))["lines"])
+
+    def test_page_cache(self):
+        job = manager().create(name="test-page-cache", log_text="a", state=JobLogStates.finished.name)
+        get_page(job.pk, "log_text", 0)
+        with self.assertNumQueries(1, using=db_alias()):
+            self.assertEqual(["a"], get_page(job.pk, "log_text", 0)["lines"])
+
+    def test_page_range(self):
+        lines = ["line %s %s" % (i, "x" * (i % 7)) for i in range(2 * PAGE_LINES + 3)]
+        job = manager().create(name="test-page-range", log_text="\n".join(lines), state=JobLogStates.finished.name)
+        self.assertEqual(lines[:PAGE_LINES], get_page(job.pk, "log_text", 0)["lines"])
+
+        # further pages read only their range of the text
+        for page in (1, 2):
+            with CaptureQueriesContext(connections[db_alias()]) as queries:
+                data = get_page(job.pk, "log_text", page)
+            self.assertEqual(lines[page * PAGE_LINES:(page + 1) * PAGE_LINES], data["lines"])
+            self.assertEqual(2 * PAGE_LINES + 3, data["total"])
+            self.assertEqual(2, len(queries))
+            self.assertIn("SUBSTR", queries[1]["sql"].upper())
+        self.assertEqual([], get_page(job.pk, "log_text", 3)["lines"])
+
+    def test_changelist_head(self):
+        job = manager().create(
+            name="test-changelist",
+            log_text="\n".join("line %s" % i for i in range(100)),
+            error_text="x" * (joblog_admin.LIST_TEXT_LENGTH + 10),
+        )
+        model = self.admin.get_queryset(self.request).using(db_alias()).get(pk=job.pk)
+        html = self.admin.log_decorator(model)
+        self.assertIn("line 9<", html)
+        self.assertNotIn("line 10<", html)
+        self.assertTrue(html.endswith('...</span>'))
+        self.assertTrue(self.admin.error_log_decorator(model).endswith("x<br>..."))
@@ -0,0 +1,137 @@
+import datetime
+
+from django.test import TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connections
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from django_joblog.models import JobLogModel, JobLogStates, db_alias, read_db_alias
+from django_joblog.impl.timeline import get_timeline
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogTimelineTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def setUp(self):
+        self.end = timezone.now().replace(microsecond=0)
+        self.start = self.end - datetime.timedelta(hours=10)
+
+    def _create(self, name, start_hours, end_hours, state=JobLogStates.finished.name):
+        date_started = self.start + datetime.timedelta(hours=start_hours)
+        date_ended = self.start + datetime.timedelta(hours=end_hours) if end_hours is not None else None
+        if date_ended:
+            duration = date_ended - date_started
+        elif state == JobLogStates.running.name:
+            # pinged just now
+            duration = timezone.now() - date_started
+        else:
+            duration = None
+        return manager().create(
+            name=name, state=state, date_started=date_started, date_ended=date_ended, duration=duration,
+        )
+
+    def test_bars(self):
+        before = self._create("test-timeline-a", -5, -1)
+        overlapping = self._create("test-timeline-a", -1, 1)
+        inside = self._create("test-timeline-a", 5, 6, state=JobLogStates.error.name)
+        running = self._create("test-timeline-b", 8, None, state=JobLogStates.running.name)
+        after = self._create("test-timeline-b", 11, 12)
+
+        # the scan bounds, the runs shorter than a bin counted per bin and the other runs
+        with self.assertNumQueries(4, using=read_db_alias()):
+            timeline = get_timeline(self.start, self.end, names=["test-timeline-a", "test-timeline-b"])
+
+        self.assertEqual(["test-timeline-a", "test-timeline-b"], [lane["name"] for lane in timeline["lanes"]])
+        bars_a, bars_b = [lane["bars"] for lane in timeline["lanes"]]
+
+        self.assertEqual([overlapping.pk, inside.pk], [bar["pk"] for bar in bars_a])
+        self.assertEqual((0., 10.), (bars_a[0]["left"], bars_a[0]["width"]))
+        self.assertEqual((50., 10., "error"), (bars_a[1]["left"], bars_a[1]["width"], bars_a[1]["state"]))
+
+        # running jobs extend to now
+        self.assertEqual([running.pk], [bar["pk"] for bar in bars_b])
+        self.assertEqual(80., bars_b[0]["left"])
+        self.assertAlmostEqual(20., bars_b[0]["width"], places=1)
+
+        self.assertTrue(timeline["ticks"])
+        self.assertTrue(all(0 <= left < 100 for left, date in timeline["ticks"]))
+
+    def test_binning(self):
+        for i in range(40):
+            self._create("test-timeline-binned", i * .25, i * .25 + .125)
+        self._create("test-timeline-binned", 9, 9.1, state=JobLogStates.error.name)
+        short = self._create("test-timeline-short", 2, 2.5)
+
+        timeline = get_timeline(
+            self.start, self.end, names=["test-timeline-binned", "test-timeline-short"], max_bars=10
+        )
+        lane, short_lane = timeline["lanes"]
+        self.assertFalse(short_lane["binned"])
+        self.assertEqual([(short.pk, 20., 5.)], [(bar["pk"], bar["left"], bar["width"]) for bar in short_lane["bars"]])
+        self.assertTrue(lane["binned"])
+        self.assertEqual(41, lane["count"])
+        self.assertEqual(41, sum(bar["count"] for bar in lane["bars"]))
+        self.assertEqual(10, len(lane["bars"]))
+        self.assertEqual((0., 10., 4, .5), (
+            lane["bars"][0]["left"], lane["bars"][0]["width"], lane["bars"][0]["count"], lane["bars"][0]["busy"]
+        ))
+        self.assertEqual("error", lane["bars"][9]["state"])
+        self.assertEqual("finished", lane["bars"][0]["state"])
+
+    def test_bounds(self):
+        self._create("test-timeline-bounds", -30, None, state=JobLogStates.blocked.name)
+        self._create("test-timeline-bounds", -30, -29)
+        running = self._create("test-timeline-bounds", -40, None, state=JobLogStates.running.name)
+        long_run = self._create("test-timeline-bounds", -3, 2)
+
+        timeline = get_timeline(self.start, self.end, names=["test-timeline-bounds"])
+        bars = timeline["lanes"][0]["bars"]
+        self.assertEqual([running.pk, long_run.pk], [bar["pk"] for bar in bars])
+        self.assertEqual((0., 20.), (bars[1]["left"], bars[1]["width"]))
+        self.assertAlmostEqual(100., bars[0]["width"], places=1)
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "ping": True, "ping_interval": 10})
+    def test_stale(self):
+        # a job that ended without notice, last updated 2 hours into the window
+        stale = self._create("test-timeline-stale", 1, None, state=JobLogStates.running.name)
+        manager().filter(pk=stale.pk).update(duration=datetime.timedelta(hours=1))
+        old_stale = self._create("test-timeline-stale", -100, None, state=JobLogStates.running.name)
+        manager().filter(pk=old_stale.pk).update(duration=datetime.timedelta(hours=1))
+        # a historic long run of another name does not widen the scan
+        self._create("test-timeline-other", -1000, 1)
+
+        with CaptureQueriesContext(connections[read_db_alias()]) as queries:
+            timeline = get_timeline(self.start, self.end, names=["test-timeline-stale"])
+        bars = timeline["lanes"][0]["bars"]
+        self.assertEqual([(stale.pk, "vanished", 10., 10.)], [
+            (bar["pk"], bar["state"], bar["left"], bar["width"]) for bar in bars
+        ])
+
+        # the scan starts at the window, there are no ended runs of the name before it
+        def _sql_date(date):
+            return timezone.make_naive(date, timezone.utc).isoformat(" ")
+        sql = "".join(query["sql"] for query in queries)
+        self.assertIn('"date_started" >= \'%s\'' % _sql_date(self.start), sql)
+        self.assertNotIn(_sql_date(self.start - datetime.timedelta(hours=1001)), sql)
+
+    def test_admin(self):
+        job = self._create("test-timeline-admin", 9, 9.5)
+        request = RequestFactory().get("/", {"hours": "24", "name": "test-timeline-admin"})
+        request.user = User(username="admin", is_superuser=True, is_staff=True, is_active=True)
+
+        response = admin.site._registry[JobLogModel].timeline_view(request)
+        response.render()
+        content = response.content.decode("utf-8")
+        self.assertIn("test-timeline-admin", content)
+        self.assertIn("/django_joblog/joblogmodel/%s/change/" % job.pk, content)
+
+        request = RequestFactory().get("/", {"hours": "x"})
+        request.user = User(username="admin", is_superuser=True, is_staff=True, is_active=True)
+        self.assertEqual(400, admin.site._registry[JobLogModel].timeline_view(request).status_code)
@@ -0,0 +1,114 @@
+import io
+import datetime
+import contextlib
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+
+from django_joblog.models import JobLogModel, JobLogStates, db_alias, read_db_alias
+from django_joblog.management.commands.joblog_list import ListWatcher
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogListTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def _create(self, name, minutes_ago, seconds=1., state=JobLogStates.finished.name):
+        date_started = timezone.now() - datetime.timedelta(minutes=minutes_ago)
+        return manager().create(
+            name=name, state=state, date_started=date_started,
+            duration=datetime.timedelta(seconds=seconds) if seconds is not None else None,
+        )
+
+    def _list(self, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            call_command("joblog_list", *args, **kwargs)
+        return out.getvalue().splitlines()
+
+    def _pks(self, lines):
+        return [int(line.split("|")[0].strip()) for line in lines[1:] if not line.startswith("more")]
+
+    def test_filters(self):
+        jobs = [
+            self._create("test-list-a", 30, seconds=1),
+            self._create("test-list-a", 20, seconds=10),
+            self._create("test-list-b", 10, seconds=100, state=JobLogStates.error.name),
+            self._create("test-list-c", 5, seconds=1000),
+        ]
+
+        self.assertEqual(
+            [jobs[2].pk, jobs[1].pk, jobs[0].pk], self._pks(self._list(name=["test-list-a", "test-list-b"]))
+        )
+        self.assertEqual([jobs[2].pk], self._pks(self._list(prefix="test-list-", state=["error"])))
+        self.assertEqual(
+            [jobs[2].pk, jobs[1].pk],
+            self._pks(self._list(prefix="test-list-", min_duration=5, max_duration=500))
+        )
+        since = (timezone.now() - datetime.timedelta(minutes=25)).isoformat()
+        until = (timezone.now() - datetime.timedelta(minutes=7)).isoformat()
+        self.assertEqual(
+            [jobs[2].pk, jobs[1].pk],
+            self._pks(self._list(prefix="test-list-", since=since, until=until))
+        )
+
+    def test_keyset_pages(self):
+        jobs = [self._create("test-list-pages", 10 - i) for i in range(5)]
+
+        lines = self._list(prefix="test-list-pages", limit=2)
+        self.assertEqual([jobs[4].pk, jobs[3].pk], self._pks(lines))
+        self.assertEqual("more: --before %s" % jobs[3].pk, lines[-1])
+
+        with self.assertNumQueries(2, using=read_db_alias()):
+            lines = self._list(prefix="test-list-pages", limit=2, before=jobs[3].pk)
+        self.assertEqual([jobs[2].pk, jobs[1].pk], self._pks(lines))
+
+        self.assertEqual([jobs[0].pk], self._pks(self._list(prefix="test-list-pages", limit=2, before=jobs[1].pk)))
+
+    def test_watch(self):
+        old = self._create("test-list-watch", 10)
+        running = self._create("test-list-watch", 5, seconds=None, state=JobLogStates.running.name)
+
+        watcher = ListWatcher(manager().filter(name="test-list-watch"), limit=10)
+        self.assertEqual([(True, old.pk), (True, running.pk)], [(is_new, row[-1]) for is_new, row in watcher.poll()])
+
+        # nothing changed, only the new rows and the listed running jobs are queried
+        with self.assertNumQueries(2, using=db_alias()):
+            self.assertEqual([], watcher.poll())
+
+        manager().filter(pk=running.pk).update(duration=datetime.timedelta(seconds=3))
+        self.assertEqual([], watcher.poll())
+
+        new = self._create("test-list-watch", 0)
+        manager().filter(pk=running.pk).update(state=JobLogStates.finished.name)
+        self.assertEqual(
+            [(False, running.pk, "finished"), (True, new.pk, "finished")],
+            [(is_new, row[-1], row[3]) for is_new, row in watcher.poll()]
+        )
+        with self.assertNumQueries(1, using=db_alias()):
+            self.assertEqual([], watcher.poll())
+
+    def test_watch_state(self):
+        first = self._create("test-list-watch-state", 5, seconds=None, state=JobLogStates.running.name)
+        watcher = ListWatcher(manager().filter(name="test-list-watch-state"), limit=10, states=["error"])
+        self.assertEqual([], watcher.poll())
+
+        # a later job fails first and moves the position past the running job
+        second = self._create("test-list-watch-state", 4, seconds=None, state=JobLogStates.running.name)
+        self.assertEqual([], watcher.poll())
+        manager().filter(pk=second.pk).update(state=JobLogStates.error.name)
+        self.assertEqual([(True, second.pk)], [(is_new, row[-1]) for is_new, row in watcher.poll()])
+
+        # the running job is reported when it enters the state filter
+        manager().filter(pk=first.pk).update(state=JobLogStates.error.name)
+        self.assertEqual([(True, first.pk)], [(is_new, row[-1]) for is_new, row in watcher.poll()])
+        self.assertEqual([], watcher.poll())
+        self.assertEqual({}, watcher.active)
+
+        # jobs of other states are not listed
+        self._create("test-list-watch-state", 0)
+        self.assertEqual([], watcher.poll())
@@ -0,0 +1,35 @@
+import warnings
+
+from django.test import TestCase, override_settings
+
+from django_joblog.models import db_alias
+from django_joblog import *
+
+
+class JobLogConfigTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def test_cached(self):
+        self.assertIs(get_config(), get_config())
+        self.assertIs(get_config(), JobLogger("test-config").config)
+
+    def test_invalidate(self):
+        config = get_config()
+        with override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "ping_interval": 23}):
+            self.assertIsNot(config, get_config())
+            self.assertEqual(23, get_config().ping_interval)
+        self.assertNotEqual(23, get_config().ping_interval)
+
+    def test_immutable(self):
+        with self.assertRaises(TypeError):
+            get_config()._config["ping"] = True
+
+    def test_db_alias_warning(self):
+        with override_settings(JOBLOG_CONFIG={"db_alias": "unknown"}):
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                self.assertEqual("default", db_alias())
+                self.assertEqual("default", db_alias())
+            self.assertEqual(1, len(w))
+        self.assertEqual("joblog", db_alias())
@@ -0,0 +1,95 @@
+import io
+import warnings
+import contextlib
+import unittest
+
+from django.conf import settings
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connections
+
+from django_joblog.models import JobLogModel, db_alias, read_db_alias
+from django_joblog.routers import JobLogRouter
+from django_joblog import *
+
+
+REPLICA_CONFIG = {"db_alias": "joblog", "read_db_alias": "default"}
+
+
+class JobLogRoutingTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog"})
+    def test_default(self):
+        self.assertEqual("joblog", read_db_alias())
+        self.assertEqual("joblog", JobLogRouter().db_for_read(JobLogModel))
+
+    @override_settings(JOBLOG_CONFIG=REPLICA_CONFIG)
+    def test_router(self):
+        router = JobLogRouter()
+        self.assertEqual("default", read_db_alias())
+        self.assertEqual("default", router.db_for_read(JobLogModel))
+        self.assertEqual("joblog", router.db_for_write(JobLogModel))
+        self.assertIsNone(router.db_for_read(User))
+        self.assertIsNone(router.db_for_write(User))
+
+    def test_unknown_alias(self):
+        with override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "read_db_alias": "unknown"}):
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                self.assertEqual("joblog", read_db_alias())
+                self.assertEqual(1, len(w))
+
+    @override_settings(JOBLOG_CONFIG=REPLICA_CONFIG)
+    def test_read_paths(self):
+        with CaptureQueriesContext(connections["default"]) as replica_queries:
+            with contextlib.redirect_stdout(io.StringIO()):
+                call_command("joblog_show", 10 ** 9)
+                call_command("joblog_list")
+        # joblog_show looks in the job log and the archive
+        self.assertEqual(3, len(replica_queries))
+
+        # jobs and their locking only use the primary
+        with CaptureQueriesContext(connections["default"]) as replica_queries:
+            with JobLogger("test-routing"):
+                pass
+            self.assertFalse(JobLogModel.is_job_running("test-routing"))
+        self.assertEqual(0, len(replica_queries))
+        self.assertEqual(db_alias(), "joblog")
+
+
+@unittest.skipUnless("joblog_replica" in settings.DATABASES, "needs a 'joblog_replica' database alias")
+class JobLogReplicaTestCase(TransactionTestCase):
+    """
+    Reads through the `joblog_replica` alias of django_joblog_project, which is an own connection
+    to the `joblog` database. Jobs have to be committed to be seen there.
+    """
+    databases = ("default", "joblog", "joblog_replica")
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "read_db_alias": "joblog_replica"})
+    def test_replica(self):
+        self.assertEqual("joblog_replica", read_db_alias())
+        self.assertEqual("joblog_replica", JobLogRouter().db_for_read(JobLogModel))
+
+        with JobLogger("test-replica") as job:
+            job.log("replicated")
+        pk = JobLogModel.objects.using("joblog").get(name="test-replica").pk
+
+        output = io.StringIO()
+        with CaptureQueriesContext(connections["joblog"]) as primary_queries:
+            with CaptureQueriesContext(connections["joblog_replica"]) as replica_queries:
+                with contextlib.redirect_stdout(output):
+                    call_command("joblog_list", "-n", "test-replica")
+                    call_command("joblog_show", pk)
+        self.assertIn("test-replica", output.getvalue())
+        self.assertIn("replicated", output.getvalue())
+        self.assertEqual(0, len(primary_queries))
+        self.assertLessEqual(2, len(replica_queries))
+
+        # the check for running jobs stays on the primary
+        with CaptureQueriesContext(connections["joblog_replica"]) as replica_queries:
+            self.assertFalse(JobLogModel.is_job_running("test-replica"))
+        self.assertEqual(0, len(replica_queries))
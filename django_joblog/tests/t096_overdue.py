@@ -0,0 +1,131 @@
+import io
+import datetime
+import contextlib
+
+from django.test import TestCase, RequestFactory, override_settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+from django_joblog.models import JobLogModel, JobLogStatsModel, JobLogStates, db_alias, read_db_alias
+from django_joblog.impl.schedule import Schedule
+from django_joblog.signals import job_overdue
+
+
+SCHEDULES = {
+    "test-overdue-interval": "1h",
+    "test-overdue-interval-ok": 3600,
+    "test-overdue-cron": "0 * * * *",
+    "test-overdue-cron-ok": "0 * * * *",
+    "test-overdue-never": "30 2 * * *",
+    "test-overdue-stuck": "1h",
+    "test-overdue-stuck-long": "1h",
+}
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+def local(*args):
+    return timezone.make_aware(datetime.datetime(*args))
+
+
+class JobLogOverdueTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def test_schedule(self):
+        self.assertEqual(datetime.timedelta(minutes=90), Schedule("1.5h").interval)
+        self.assertEqual(datetime.timedelta(seconds=10), Schedule(10).interval)
+        for spec in ("", "1w", "* * * *", "60 * * * *", "*/0 * * * *", 0, None):
+            with self.assertRaises(ValueError):
+                Schedule(spec)
+
+        now = local(2019, 11, 20, 12, 10)  # a wednesday
+        self.assertEqual(local(2019, 11, 20, 11, 9), Schedule("1h").get_deadline(now, datetime.timedelta(minutes=1)))
+        self.assertEqual(local(2019, 11, 20, 12, 0), Schedule("0 * * * *").get_deadline(now))
+        self.assertEqual(local(2019, 11, 20, 11, 0), Schedule("0 * * * *").get_deadline(now, datetime.timedelta(minutes=11)))
+        self.assertEqual(local(2019, 11, 20, 12, 10), Schedule("*/5 * * * *").get_previous(now))
+        self.assertEqual(local(2019, 11, 20, 2, 30), Schedule("30 2 * * *").get_previous(now))
+        self.assertEqual(local(2019, 11, 19, 14, 30), Schedule("30 14 * * *").get_previous(now))
+        self.assertEqual(local(2019, 11, 18, 18, 45), Schedule("45 8-18 * * 1").get_previous(now))
+        self.assertEqual(local(2019, 11, 17, 0, 0), Schedule("0 0 * * 7").get_previous(now))
+        # day of month or day of week
+        self.assertEqual(local(2019, 11, 18, 0, 0), Schedule("0 0 1 * 1").get_previous(now))
+        self.assertEqual(local(2019, 2, 28, 0, 0), Schedule("0 0 28 2 *").get_previous(now))
+        self.assertIsNone(Schedule("0 0 30 2 *").get_previous(now))
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "schedules": SCHEDULES, "schedule_grace": 60})
+    def test_overdue(self):
+        now = timezone.now()
+        # the check time must be in the past for the admin view, which checks at the current time
+        hour = now.replace(minute=0, second=0, microsecond=0) - datetime.timedelta(hours=1)
+        check_time = hour + datetime.timedelta(minutes=30)
+        for name, date_started in (
+                ("test-overdue-interval", check_time - datetime.timedelta(minutes=62)),
+                ("test-overdue-interval", check_time - datetime.timedelta(minutes=200)),
+                ("test-overdue-interval-ok", check_time - datetime.timedelta(minutes=59)),
+                ("test-overdue-cron", hour - datetime.timedelta(minutes=1)),
+                ("test-overdue-cron-ok", hour + datetime.timedelta(seconds=1)),
+        ):
+            manager().create(name=name, state=JobLogStates.finished.name, date_started=date_started)
+
+        for name, p99 in (("test-overdue-long", 10.), ("test-overdue-short", 1000.)):
+            manager().create(name=name, date_started=check_time - datetime.timedelta(seconds=100))
+            JobLogStatsModel.objects.using(db_alias()).create(name=name, duration_p99=p99, num_samples=10)
+        # a percentile of too few jobs is not used
+        manager().create(name="test-overdue-few", date_started=check_time - datetime.timedelta(seconds=100))
+        JobLogStatsModel.objects.using(db_alias()).create(name="test-overdue-few", duration_p99=10., num_samples=1)
+
+        # scheduled jobs hanging since three hours, with and without statistics
+        for name in ("test-overdue-stuck", "test-overdue-stuck-long"):
+            manager().create(name=name, date_started=check_time - datetime.timedelta(hours=3))
+        JobLogStatsModel.objects.using(db_alias()).create(name="test-overdue-stuck-long", duration_p99=60., num_samples=10)
+
+        received = []
+
+        def _receiver(sender, name, reason, **kwargs):
+            received.append((name, reason))
+        job_overdue.connect(_receiver)
+        try:
+            with self.assertNumQueries(2, using=read_db_alias()):
+                overdue = JobLogModel.get_overdue(now=check_time, send_signals=True)
+        finally:
+            job_overdue.disconnect(_receiver)
+
+        overdue = [(entry["name"], entry["reason"]) for entry in overdue if entry["name"].startswith("test-overdue")]
+        expected = [
+            ("test-overdue-cron", "missed"),
+            ("test-overdue-interval", "missed"),
+            ("test-overdue-long", "long_running"),
+            ("test-overdue-never", "missed"),
+            ("test-overdue-stuck", "missed"),
+            ("test-overdue-stuck-long", "missed"),
+            ("test-overdue-stuck-long", "long_running"),
+        ]
+        self.assertEqual(expected, overdue)
+        self.assertEqual(expected, [entry for entry in received if entry[0].startswith("test-overdue")])
+
+        overdue = [
+            (entry["name"], entry["reason"]) for entry in JobLogModel.get_overdue(now=check_time + datetime.timedelta(hours=2))
+            if entry["name"].startswith("test-overdue-interval")
+        ]
+        self.assertEqual([("test-overdue-interval", "missed"), ("test-overdue-interval-ok", "missed")], overdue)
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit):
+                call_command("joblog_overdue", no_signals=True, fail=True)
+        self.assertIn("test-overdue-never", out.getvalue())
+
+        request = RequestFactory().get("/")
+        request.user = User(username="admin", is_superuser=True, is_staff=True, is_active=True)
+        response = admin.site._registry[JobLogModel].overdue_view(request)
+        response.render()
+        self.assertIn("test-overdue-long", response.content.decode("utf-8"))
+
+    @override_settings(JOBLOG_CONFIG={"db_alias": "joblog", "schedules": {"test-overdue-invalid": "sometimes"}})
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            JobLogModel.get_overdue()
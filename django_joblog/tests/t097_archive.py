@@ -0,0 +1,99 @@
+import io
+import json
+import datetime
+import contextlib
+
+from django.test import TestCase, RequestFactory
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from django_joblog.models import JobLogModel, JobLogArchiveModel, JobLogStatsModel, JobLogStates, db_alias
+from django_joblog import *
+
+
+def manager():
+    return JobLogModel.objects.using(db_alias())
+
+
+class JobLogArchiveTestCase(TestCase):
+
+    databases = ("default", "joblog")
+
+    def _create(self, name, days_ago, state=JobLogStates.finished.name, parent=None):
+        date = timezone.now() - datetime.timedelta(days=days_ago)
+        return manager().create(
+            name=name, state=state, parent=parent, log_text="log of %s" % name,
+            date_started=date, date_ended=date if state != JobLogStates.running.name else None,
+        )
+
+    def test_archive_jobs(self):
+        old = self._create("test-archive-old", 40)
+        child = self._create("test-archive-old-child", 40, parent=old)
+        grandchild = self._create("test-archive-old-grandchild", 40, parent=child)
+        recent = self._create("test-archive-recent", 1)
+        active = self._create("test-archive-active", 40)
+        active_child = self._create("test-archive-active-child", 40, state=JobLogStates.running.name, parent=active)
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            call_command("joblog_archive", days=30, batch_size=1)
+        self.assertEqual("3 job(s) archived", out.getvalue().strip())
+
+        archived = JobLogArchiveModel.objects.using(db_alias())
+        self.assertEqual(
+            {old.pk, child.pk, grandchild.pk},
+            set(archived.filter(name__startswith="test-archive").values_list("pk", flat=True))
+        )
+        self.assertFalse(manager().filter(pk__in=(old.pk, child.pk, grandchild.pk)).exists())
+        self.assertEqual(3, manager().filter(pk__in=(recent.pk, active.pk, active_child.pk)).count())
+
+        archived_child = archived.get(pk=child.pk)
+        self.assertEqual(old.pk, archived_child.parent_id)
+        self.assertEqual("log of test-archive-old-child", archived_child.log_text)
+        self.assertEqual(
+            [(0, old.pk), (1, child.pk), (2, grandchild.pk)],
+            [(depth, node.pk) for depth, node in archived.get(pk=old.pk).get_run_tree()]
+        )
+
+    def test_get_job(self):
+        job = self._create("test-archive-get", 40)
+        JobLogArchiveModel.archive_jobs(timezone.now() - datetime.timedelta(days=30))
+
+        self.assertIsInstance(JobLogModel.get_job(job.pk, using=db_alias()), JobLogArchiveModel)
+        with self.assertRaises(JobLogModel.DoesNotExist):
+            JobLogModel.get_job(10 ** 9, using=db_alias())
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            call_command("joblog_show", job.pk)
+        self.assertIn("archived: True", out.getvalue())
+
+    def test_count_continues(self):
+        self._create("test-archive-count", 40)
+        self._create("test-archive-count", 40)
+        JobLogArchiveModel.archive_jobs(timezone.now() - datetime.timedelta(days=30))
+        self.assertEqual(2, JobLogStatsModel.get_num_archived("test-archive-count"))
+
+        # starting a job does not read the archive
+        with CaptureQueriesContext(connections[db_alias()]) as queries:
+            with JobLogger("test-archive-count") as job:
+                pass
+        self.assertEqual(3, manager().get(pk=job._model._model_pk).count)
+        archive_table = JobLogArchiveModel._meta.db_table
+        self.assertEqual([], [query["sql"] for query in queries if archive_table in query["sql"]])
+
+    def test_admin(self):
+        job = self._create("test-archive-admin", 40)
+        JobLogArchiveModel.archive_jobs(timezone.now() - datetime.timedelta(days=30))
+
+        request = RequestFactory().get("/")
+        request.user = User(username="admin", is_superuser=True, is_staff=True, is_active=True)
+
+        response = admin.site._registry[JobLogModel].change_view(request, str(job.pk))
+        self.assertEqual(302, response.status_code)
+        self.assertIn("/joblogarchivemodel/%s/" % job.pk, response["Location"])
+
+        response = admin.site._registry[JobLogArchiveModel].page_view(request, job.pk, "log")
+        self.assertEqual(["log of test-archive-admin"], json.loads(response.content.decode("utf-8"))["lines"])
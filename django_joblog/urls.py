@@ -0,0 +1,14 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+from django.urls import path
+
+from . import views
+
+
+app_name = "django_joblog"
+
+urlpatterns = [
+    path('metrics/', views.metrics, name="metrics"),
+    path('job/<int:pk>/tail/', views.tail, name="tail"),
+]
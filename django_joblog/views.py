@@ -0,0 +1,52 @@
+# encoding=utf-8
+from __future__ import unicode_literals
+
+import hmac
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, Http404
+
+from .impl.Config import get_config
+from .impl.metrics import get_metrics_text
+from .impl.tail import poll_tail
+
+
+# Longest time in seconds a tail request is held open
+MAX_TAIL_WAIT = 30.
+
+
+def metrics(request):
+    """
+    Job metrics in the Prometheus text exposition format.
+    If JOBLOG_CONFIG["metrics_token"] is set, the request needs the header
+    "Authorization: Bearer <token>"
+    """
+    token = get_config().metrics_token
+    if token:
+        authorization = request.META.get("HTTP_AUTHORIZATION", "")
+        if not hmac.compare_digest(authorization.encode("utf-8"), ("Bearer %s" % token).encode("utf-8")):
+            return HttpResponseForbidden("Invalid or missing metrics token")
+
+    return HttpResponse(get_metrics_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@staff_member_required
+def tail(request, pk):
+    """
+    New log and error lines of a job as JSON, long-polling while the job is running.
+
+    GET parameters:
+        log_offset, error_offset: int, the "offset" values of the previous response
+        wait: float, seconds to wait for new lines, at most MAX_TAIL_WAIT
+    """
+    try:
+        log_offset = max(0, int(request.GET.get("log_offset", 0)))
+        error_offset = max(0, int(request.GET.get("error_offset", 0)))
+        wait = min(MAX_TAIL_WAIT, max(0., float(request.GET.get("wait", 0))))
+    except ValueError:
+        return HttpResponseBadRequest("Invalid offset or wait parameter")
+
+    data = poll_tail(pk, log_offset, error_offset, timeout=wait)
+    if data is None:
+        raise Http404("Unknown job %s" % pk)
+    return JsonResponse(data)
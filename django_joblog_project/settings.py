@@ -31,6 +31,8 @@ ALLOWED_HOSTS = []
 JOBLOG_CONFIG = {
     # name of alternate database connection, to circumvent transactions on default connection
     "db_alias": "joblog",
+    # database connection for reads that do not need the latest data, e.g. a replica
+    # "read_db_alias": "joblog_replica",
     # enable .log and .error to write to database immediately
     "live_updates": True,
     # enable a constant update of job state - to check for jobs which went away without notice
@@ -129,9 +131,43 @@ DATABASES = {
         'TEST': {
             'NAME': 'django_logs_test_test',
         }
-    }
+    },
+    # autocommit connection to the 'joblog' database for "isolated_writes"
+    'joblog_isolated': {
+        'ENGINE': 'django.db.backends.mysql',
+        'NAME': 'django_logs_test',
+        'USER': 'django_logs_user',
+        'PASSWORD': 'django_logs_pwd',
+        'HOST': '127.0.0.1',
+        'OPTIONS': {
+            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
+        },
+        'AUTOCOMMIT': True,
+        'CONN_MAX_AGE': 0,
+        'TEST': {
+            'MIRROR': 'joblog',
+        }
+    },
+    # stands in for a read replica of 'joblog'
+    'joblog_replica': {
+        'ENGINE': 'django.db.backends.mysql',
+        'NAME': 'django_logs_test',
+        'USER': 'django_logs_user',
+        'PASSWORD': 'django_logs_pwd',
+        'HOST': '127.0.0.1',
+        'OPTIONS': {
+            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
+        },
+        'TEST': {
+            'MIRROR': 'joblog',
+        }
+    },
 }
 
+DATABASE_ROUTERS = [
+    "django_joblog.routers.JobLogRouter",
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators